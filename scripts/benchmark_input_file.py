@@ -0,0 +1,41 @@
+"""Benchmark the parallel formatting of the parts of a model.
+
+Run with ``python scripts/benchmark_input_file.py [n_parts] [n_nodes]``.
+"""
+
+import sys
+import time
+
+from compas_fea2.job import format_parts
+from compas_fea2.job import format_table
+from compas_fea2.model import Model
+from compas_fea2.model import Node
+from compas_fea2.model import Part
+
+
+def formatter(arrays):
+    lines = ["** Part {}\n*Node\n".format(arrays["name"])]
+    lines.append(format_table(arrays["nodes"], ["%d", "%.6f", "%.6f", "%.6f"]))
+    for (name, implementation, _), table in arrays["elements"].items():
+        lines.append("*Element, type={}\n".format(implementation or name))
+        lines.append(format_table(table, "%d"))
+    return "".join(lines)
+
+
+def build(n_parts, n_nodes):
+    model = Model()
+    for i in range(n_parts):
+        part = Part()
+        part.add_nodes([Node([j, i, 0]) for j in range(n_nodes)])
+        model.add_part(part)
+    return model
+
+
+if __name__ == "__main__":
+    n_parts = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    n_nodes = int(sys.argv[2]) if len(sys.argv) > 2 else 50000
+    parts = sorted(build(n_parts, n_nodes).parts, key=lambda p: p._key)
+    for processes in (1, 2, 4, 8):
+        start = time.perf_counter()
+        format_parts(parts, formatter, processes=processes)
+        print("{} processes: {:.2f} s".format(processes, time.perf_counter() - start))
@@ -1,6 +1,5 @@
 import os
 from collections import defaultdict
-from dotenv import load_dotenv
 from compas.tolerance import Tolerance  # noqa: F401
 
 
@@ -28,6 +27,8 @@ def init_fea2(verbose=False, point_overlap=True, global_tolerance=1, precision=3
     part_nodes_limit : int, optional
         Limit of nodes for a part, by default 100000.
     """
+    from dotenv import load_dotenv
+
     env_path = os.path.abspath(os.path.join(HERE, ".env"))
     if not os.path.exists(env_path):
         with open(env_path, "x") as f:
@@ -92,13 +93,26 @@ UMAT = os.path.abspath(os.path.join(DATA, "umat"))
 DOCS = os.path.abspath(os.path.join(HOME, "docs"))
 TEMP = os.path.abspath(os.path.join(HOME, "temp"))
 
-if not load_dotenv():
-    init_fea2()
 
-VERBOSE = os.getenv("VERBOSE").lower() == "true"
-POINT_OVERLAP = os.getenv("POINT_OVERLAP").lower() == "true"
-GLOBAL_TOLERANCE = float(os.getenv("GLOBAL_TOLERANCE"))
-PRECISION = int(os.getenv("PRECISION"))
+def _load_settings():
+    """Read the settings from the environment and from the ``.env`` file of the
+    package, if it exists. Missing settings take the defaults of :func:`init_fea2`.
+    Nothing is written to disk.
+    """
+    env_path = os.path.join(HERE, ".env")
+    if os.path.exists(env_path):
+        from dotenv import load_dotenv
+
+        load_dotenv(env_path)
+    defaults = {"VERBOSE": "False", "POINT_OVERLAP": "True", "GLOBAL_TOLERANCE": "1", "PRECISION": "3"}
+    return {key: os.getenv(key, value) for key, value in defaults.items()}
+
+
+_settings = _load_settings()
+VERBOSE = _settings["VERBOSE"].lower() == "true"
+POINT_OVERLAP = _settings["POINT_OVERLAP"].lower() == "true"
+GLOBAL_TOLERANCE = float(_settings["GLOBAL_TOLERANCE"])
+PRECISION = int(_settings["PRECISION"])
 BACKEND = None
 BACKENDS = defaultdict(dict)
 
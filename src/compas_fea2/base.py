@@ -1,11 +1,11 @@
 import importlib
 import json
 import uuid
+import weakref
 from abc import abstractmethod
 from copy import deepcopy
 from typing import Iterable
 
-import h5py
 import numpy as np
 from compas.data import Data
 
@@ -56,8 +56,18 @@ class FEAData(Data, metaclass=DimensionlessMeta):
     registration : compas_fea2 object
         The mother object where this object is registered to.
 
+    Notes
+    -----
+    Classes whose parent keeps a strong reference to them (e.g. nodes and
+    elements in a part) set ``_weak_registration = True`` so that the link
+    back to the parent is stored as a :class:`weakref.ref`. This avoids
+    reference cycles between parents and children, which keeps the garbage
+    collector cheap on large models.
+
     """
 
+    _weak_registration = False
+
     def __new__(cls, *args, **kwargs):
         """Try to get the backend plug-in implementation, otherwise use the base
         one.
@@ -78,6 +88,19 @@ class FEAData(Data, metaclass=DimensionlessMeta):
     def key(self):
         return self._key
 
+    @property
+    def _registration(self):
+        registration = self.__dict__.get("_registration")
+        if isinstance(registration, weakref.ref):
+            return registration()
+        return registration
+
+    @_registration.setter
+    def _registration(self, value):
+        if value is not None and self._weak_registration:
+            value = weakref.ref(value)
+        self.__dict__["_registration"] = value
+
     def __repr__(self):
         return "{0}({1})".format(self.__class__.__name__, id(self))
 
@@ -98,10 +121,15 @@ class FEAData(Data, metaclass=DimensionlessMeta):
         return """\n{}\n{}\n{}\n""".format(title, separator, "\n".join(data_extended))
 
     def __getstate__(self):
-        return self.__dict__
+        state = self.__dict__
+        if isinstance(state.get("_registration"), weakref.ref):
+            state = state.copy()
+            state["_registration"] = self._registration
+        return state
 
     def __setstate__(self, state):
         self.__dict__.update(state)
+        self._registration = state.get("_registration")
 
     @abstractmethod
     def jobdata(self, *args, **kwargs):
@@ -166,6 +194,8 @@ class FEAData(Data, metaclass=DimensionlessMeta):
         """
         Save the object to an HDF5 file using the __data__ property.
         """
+        import h5py
+
         with h5py.File(hdf5_path, mode) as hdf5_file:  # "a" mode to append data
             group = hdf5_file.require_group(f"{group_name}/{self.uid}")  # Create a group for this object
 
@@ -185,6 +215,8 @@ class FEAData(Data, metaclass=DimensionlessMeta):
         """
         Load an object from an HDF5 file using the __data__ property.
         """
+        import h5py
+
         with h5py.File(hdf5_path, "r") as hdf5_file:
             group = hdf5_file[f"{group_name}/{uid}"]
             data = {}
@@ -70,6 +70,70 @@ def change_setting(backend, setting, value):
     print(f"{setting.upper()} set to {value} for compas_fea2_{backend.lower()}")
 
 
+@main.command()
+@click.argument("path")
+@click.option("--workers", default=None, type=int, help="number of analyses running at the same time")
+@click.option("--cores", default=None, type=int, help="total number of cores used by the analyses")
+def run_queue(path, workers, cores):
+    """Run the pending analyses of a job queue.\n
+    path : txt\n
+        The folder of the queue (see compas_fea2.job.JobQueue).
+
+    Jobs interrupted by a crash are resumed, jobs already done are skipped.
+    """
+    from compas_fea2.job import JobQueue
+
+    queue = JobQueue(path)
+    scheduler = queue.run(workers=workers, cores=cores)
+    click.echo(scheduler.report())
+    summary = queue.summary()
+    click.echo(", ".join("{} {}".format(count, state) for state, count in sorted(summary.items())))
+    if summary.get(JobQueue.FAILED):
+        sys.exit(1)
+
+
+@main.command()
+@click.option("--spool", required=True, help="the spool directory shared with the coordinator")
+@click.option("--once", is_flag=True, help="stop when there are no pending jobs")
+@click.option("--poll", default=1.0, type=float, help="seconds between checks for new jobs")
+@click.option("--max-jobs", default=None, type=int, help="stop after this number of jobs")
+@click.option("--stale", default=None, type=float, help="requeue running jobs without heartbeat for this number of seconds")
+@click.option("--heartbeat", default=None, type=float, help="seconds between the updates of the heartbeat of the running job")
+def worker(spool, once, poll, max_jobs, stale, heartbeat):
+    """Run the analyses submitted to a spool directory.\n
+    Several workers, also on different machines, can share the same directory.
+    """
+    from compas_fea2.job import SpoolDirectory
+
+    count = SpoolDirectory(spool).work(once=once, poll=poll, max_jobs=max_jobs, stale_timeout=stale, heartbeat=heartbeat)
+    click.echo("{} jobs run".format(count))
+
+
+@main.command()
+@click.argument("path")
+@click.option("--query", default=None, help="also print the query plan of this SQL query")
+def optimize_db(path, query):
+    """Index and analyze a SQLite results database.\n
+    path : txt\n
+        The results database (<problem>-results.db).
+
+    Missing (step, part, key) indexes are created, the statistics of the query
+    planner are updated and the plan of the retrieval of one member is printed
+    for each table.
+    """
+    import compas_fea2.model  # noqa: F401 (the results import the model)
+    from compas_fea2.results.database import SQLiteResultsDatabase
+
+    if not os.path.exists(path):
+        raise click.BadParameter("{} does not exist".format(path), param_hint="path")
+    with SQLiteResultsDatabase.from_path(path) as database:
+        for table_name in database.create_indexes():
+            click.echo("{}: {}".format(table_name, "; ".join(database.member_query_plan(table_name))))
+        database.analyze()
+        if query:
+            click.echo("\n".join(database.query_plan(query)))
+
+
 # -------------------------------- DEBUG ----------------------------------#
 if __name__ == "__main__":
     sys.exit(main.init_backend())
@@ -1,4 +1,35 @@
 from .input_file import InputFile
 from .input_file import ParametersFile
+from .cache import ResultsCache
+from .blocks import BlockCache
+from .scheduler import AnalysisJob
+from .scheduler import Scheduler
+from .queue import JobQueue
+from .spool import SpoolDirectory
+from .sweep import Sweep
+from .monitor import LogParser
+from .monitor import SolverEvent
+from .monitor import SolverMonitor
+from .monitor import solver_monitor
+from .formatting import format_parts
+from .formatting import format_table
+from .formatting import part_arrays
 
-__all__ = ["InputFile", "ParametersFile"]
+__all__ = [
+    "InputFile",
+    "ParametersFile",
+    "ResultsCache",
+    "BlockCache",
+    "AnalysisJob",
+    "Scheduler",
+    "JobQueue",
+    "SpoolDirectory",
+    "Sweep",
+    "LogParser",
+    "SolverEvent",
+    "SolverMonitor",
+    "solver_monitor",
+    "format_parts",
+    "format_table",
+    "part_arrays",
+]
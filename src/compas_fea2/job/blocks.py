@@ -0,0 +1,89 @@
+import hashlib
+import os
+import uuid
+from pathlib import Path
+
+
+class BlockCache:
+    """On-disk cache of the text blocks of input files.
+
+    Each block is stored in a file named after a hash of the objects it was
+    generated from (see :meth:`compas_fea2.job.InputFile.cached_block`). When an
+    input file is written again, the blocks of the objects that did not change
+    are read from the cache instead of being generated.
+
+    Parameters
+    ----------
+    path : str | :class:`pathlib.Path`
+        Folder where the blocks are stored. It is created if it does not exist.
+        Problems that share a model can share the same folder.
+
+    """
+
+    def __init__(self, path):
+        self.path = Path(path).expanduser()
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+
+    def __repr__(self):
+        return "{}({!r})".format(self.__class__.__name__, str(self.path))
+
+    def block_path(self, key):
+        return self.path.joinpath("{}.txt".format(key))
+
+    def __contains__(self, key):
+        return self.block_path(key).exists()
+
+    @staticmethod
+    def key(*digests):
+        """Combine the digests of the objects a block depends on into a block key."""
+        hasher = hashlib.sha256()
+        for digest in digests:
+            hasher.update(digest if isinstance(digest, bytes) else str(digest).encode())
+        return hasher.hexdigest()
+
+    def get(self, key, func):
+        """Get a block from the cache, or generate and store it.
+
+        Parameters
+        ----------
+        key : str
+            The key of the block.
+        func : callable
+            Function without arguments generating the block, called if the block
+            is not in the cache.
+
+        Returns
+        -------
+        str
+            The block.
+
+        """
+        block_path = self.block_path(key)
+        try:
+            with open(block_path, "r", newline="") as f:
+                block = f.read()
+        except OSError:
+            pass
+        else:
+            self.hits += 1
+            return block
+
+        self.misses += 1
+        block = func()
+        tmp = self.path.joinpath(".{}.{}".format(key, uuid.uuid4().hex))
+        with open(tmp, "w", newline="") as f:
+            f.write(block)
+        os.replace(tmp, block_path)
+        return block
+
+    @property
+    def size(self):
+        """Total size of the cached blocks in bytes."""
+        return sum(f.stat().st_size for f in self.path.glob("*.txt"))
+
+    def clear(self):
+        """Remove all the blocks from the cache."""
+        for f in self.path.glob("*.txt"):
+            f.unlink()
@@ -0,0 +1,299 @@
+import json
+import os
+import shutil
+import sqlite3
+import time
+import uuid
+from pathlib import Path
+
+from compas_fea2 import VERBOSE
+from compas_fea2.utilities._fingerprint import Fingerprinter
+
+
+class ResultsCache:
+    """Local on-disk cache of analysis results keyed by the problem fingerprint.
+
+    Each entry is a folder named after the fingerprint of the problem (see
+    :meth:`compas_fea2.problem.Problem.fingerprint`), combined with the options
+    passed to the analysis if any (see :meth:`key`), and contains the input file,
+    the extracted SQLite results database and a ``metadata.json`` file.
+
+    Parameters
+    ----------
+    path : str | :class:`pathlib.Path`
+        Folder where the cache entries are stored. It is created if it does not
+        exist.
+    max_size : int, optional
+        Maximum size of the cache in bytes, by default ``None`` (no limit).
+        When the limit is exceeded, the least recently used entries are removed.
+
+    Notes
+    -----
+    Only the input file and the extracted results database are stored. Native
+    output files of the solver are not cached.
+
+    Examples
+    --------
+    >>> problem.cache = ResultsCache("~/.fea2_cache", max_size=10 * 1024**3)  # doctest: +SKIP
+    >>> problem.analyse_and_extract(path)  # doctest: +SKIP
+
+    """
+
+    METADATA = "metadata.json"
+    RESULTS = "results.db"
+
+    def __init__(self, path, max_size=None):
+        self.path = Path(path).expanduser()
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+
+    def __repr__(self):
+        return "{}({!r}, max_size={})".format(self.__class__.__name__, str(self.path), self.max_size)
+
+    # =========================================================================
+    #                           Entries
+    # =========================================================================
+
+    def entry_path(self, fingerprint):
+        return self.path.joinpath(fingerprint)
+
+    def __contains__(self, fingerprint):
+        return self.entry_path(fingerprint).joinpath(self.RESULTS).exists()
+
+    def key(self, problem, options=None, fingerprinter=None):
+        """Key of the cache entry of a problem.
+
+        Parameters
+        ----------
+        problem : :class:`compas_fea2.problem.Problem`
+            The problem.
+        options : dict, optional
+            Options passed to the analysis. Without options the key is the
+            fingerprint of the problem.
+        fingerprinter : :class:`compas_fea2.utilities._fingerprint.Fingerprinter`, optional
+            Fingerprinter already used for the problem, to reuse its digests.
+
+        Returns
+        -------
+        str
+            The hexadecimal key.
+
+        """
+        fingerprinter = fingerprinter or Fingerprinter()
+        if not options:
+            return fingerprinter.problem(problem).hex()
+        hasher = fingerprinter.new("Analysis")
+        hasher.update(fingerprinter.problem(problem))
+        hasher.update(fingerprinter.value(options))
+        return hasher.hexdigest()
+
+    @property
+    def entries(self):
+        """Metadata of the cache entries, sorted from the least to the most recently used."""
+        entries = []
+        for folder in self.path.iterdir():
+            metadata = self._read_metadata(folder)
+            if metadata:
+                entries.append(metadata)
+        return sorted(entries, key=lambda m: m["last_access"])
+
+    @property
+    def size(self):
+        """Total size of the cache in bytes."""
+        return sum(m["size"] for m in self.entries)
+
+    # =========================================================================
+    #                           Store and restore
+    # =========================================================================
+
+    def store(self, problem, fingerprinter=None, options=None):
+        """Store the input file and the results database of an analysed problem.
+
+        Parameters
+        ----------
+        problem : :class:`compas_fea2.problem.Problem`
+            The analysed problem.
+        fingerprinter : :class:`compas_fea2.utilities._fingerprint.Fingerprinter`, optional
+            Fingerprinter already used for the problem, to reuse its digests.
+        options : dict, optional
+            Options passed to the analysis, see :meth:`key`.
+
+        Returns
+        -------
+        str | None
+            The key of the stored entry, or ``None`` if the problem has no
+            results database.
+
+        """
+        if not problem.path_db or not os.path.exists(problem.path_db):
+            return None
+        fingerprinter = fingerprinter or Fingerprinter()
+        fingerprint = self.key(problem, options=options, fingerprinter=fingerprinter)
+
+        tmp = self.path.joinpath(".{}-{}".format(fingerprint, uuid.uuid4().hex))
+        tmp.mkdir()
+        shutil.copyfile(problem.path_db, tmp.joinpath(self.RESULTS))
+        input_file = problem.input_file
+        input_path = Path(problem.path).joinpath(input_file.file_name)
+        if input_file._extension and input_path.exists():
+            shutil.copyfile(input_path, tmp.joinpath("input.{}".format(input_file._extension)))
+
+        parts = {}
+        for part in problem.model.parts:
+            parts.setdefault(fingerprinter.part(part).hex(), []).append(part.name)
+        now = time.time()
+        metadata = {
+            "fingerprint": fingerprint,
+            "problem": problem.name,
+            "options": options or {},
+            "steps": [step.name for step in problem.steps_order],
+            "parts": {k: sorted(v) for k, v in parts.items()},
+            "input": input_file._extension,
+            "created": now,
+            "last_access": now,
+            "size": sum(f.stat().st_size for f in tmp.iterdir()),
+        }
+        self._write_metadata(tmp, metadata)
+
+        entry = self.entry_path(fingerprint)
+        if entry.exists():
+            shutil.rmtree(entry, ignore_errors=True)
+        os.replace(tmp, entry)
+        if VERBOSE:
+            print("Results of {!r} stored in the cache: {}".format(problem, entry))
+        self.evict()
+        return fingerprint
+
+    def restore(self, problem, path=None, erase_data=False, fingerprinter=None, options=None):
+        """Restore the cached results of a problem, if any.
+
+        The cached results database is copied in the analysis folder of the
+        problem and attached to ``problem.rdb``. Step and part names stored in
+        the database are renamed to match the ones of the problem.
+
+        Parameters
+        ----------
+        problem : :class:`compas_fea2.problem.Problem`
+            The problem to restore.
+        path : str | :class:`pathlib.Path`, optional
+            Path to the main analysis folder, as passed to ``analyse``.
+        erase_data : bool, optional
+            Passed to :meth:`compas_fea2.problem.Problem._check_analysis_path`.
+        fingerprinter : :class:`compas_fea2.utilities._fingerprint.Fingerprinter`, optional
+            Fingerprinter already used for the problem, to reuse its digests.
+        options : dict, optional
+            Options passed to the analysis, see :meth:`key`.
+
+        Returns
+        -------
+        bool
+            ``True`` if the results were found in the cache, ``False`` otherwise.
+
+        """
+        fingerprinter = fingerprinter or Fingerprinter()
+        fingerprint = self.key(problem, options=options, fingerprinter=fingerprinter)
+        entry = self.entry_path(fingerprint)
+        metadata = self._read_metadata(entry)
+        if not metadata or not entry.joinpath(self.RESULTS).exists():
+            self.misses += 1
+            return False
+
+        path = path or (problem.model.path.parent if problem.model.path else None)
+        if not path:
+            raise ValueError("A path to the folder for the analysis must be provided")
+        problem._check_analysis_path(path, erase_data)
+
+        shutil.copyfile(entry.joinpath(self.RESULTS), problem.path_db)
+        if metadata["input"] and entry.joinpath("input.{}".format(metadata["input"])).exists():
+            input_file = problem.input_file
+            shutil.copyfile(entry.joinpath("input.{}".format(metadata["input"])), Path(problem.path).joinpath(input_file.file_name))
+
+        names = dict(zip(metadata["steps"], [step.name for step in problem.steps_order]))
+        parts = {}
+        for part in problem.model.parts:
+            parts.setdefault(fingerprinter.part(part).hex(), []).append(part.name)
+        for digest, old_names in metadata["parts"].items():
+            names.update(zip(old_names, sorted(parts.get(digest, []))))
+        self._rename(problem.path_db, {k: v for k, v in names.items() if k != v})
+        problem._rdb = None
+
+        metadata["last_access"] = time.time()
+        self._write_metadata(entry, metadata)
+        self.hits += 1
+        if VERBOSE:
+            print("Results of {!r} restored from the cache: {}".format(problem, entry))
+        return True
+
+    # =========================================================================
+    #                           Eviction
+    # =========================================================================
+
+    def evict(self, max_size=None):
+        """Remove the least recently used entries until the cache fits in `max_size`.
+
+        Parameters
+        ----------
+        max_size : int, optional
+            Size limit in bytes, by default the `max_size` of the cache.
+
+        Returns
+        -------
+        list[str]
+            The fingerprints of the removed entries.
+
+        """
+        max_size = self.max_size if max_size is None else max_size
+        if max_size is None:
+            return []
+        entries = self.entries
+        size = sum(m["size"] for m in entries)
+        removed = []
+        while entries and size > max_size:
+            metadata = entries.pop(0)
+            shutil.rmtree(self.entry_path(metadata["fingerprint"]), ignore_errors=True)
+            size -= metadata["size"]
+            removed.append(metadata["fingerprint"])
+        return removed
+
+    def clear(self):
+        """Remove all the entries of the cache."""
+        return self.evict(max_size=0)
+
+    # =========================================================================
+    #                           Helpers
+    # =========================================================================
+
+    def _read_metadata(self, folder):
+        try:
+            with open(Path(folder).joinpath(self.METADATA), "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_metadata(self, folder, metadata):
+        tmp = Path(folder).joinpath(".{}.{}".format(self.METADATA, uuid.uuid4().hex))
+        with open(tmp, "w") as f:
+            json.dump(metadata, f, indent=4)
+        os.replace(tmp, Path(folder).joinpath(self.METADATA))
+
+    @staticmethod
+    def _rename(db_path, names):
+        """Rename steps and parts in all the tables of a results database."""
+        if not names:
+            return
+        connection = sqlite3.connect(db_path)
+        try:
+            cursor = connection.cursor()
+            tables = [row[0] for row in cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")]
+            for table in tables:
+                columns = [row[1] for row in cursor.execute(f"PRAGMA table_info({table})")]
+                for column in ("step", "part"):
+                    if column in columns:
+                        cases = " ".join(["WHEN ? THEN ?"] * len(names))
+                        params = [item for pair in names.items() for item in pair]
+                        cursor.execute(f"UPDATE {table} SET {column} = CASE {column} {cases} ELSE {column} END", params)
+            connection.commit()
+        finally:
+            connection.close()
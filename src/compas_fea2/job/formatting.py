@@ -0,0 +1,119 @@
+import os
+
+import numpy as np
+
+
+def part_arrays(part):
+    """Collect the nodes and elements of a part in NumPy arrays.
+
+    The arrays are cheap to send to other processes and can be formatted
+    with :func:`format_table` without accessing the model objects.
+
+    Parameters
+    ----------
+    part : :class:`compas_fea2.model._Part`
+        The part.
+
+    Returns
+    -------
+    dict
+        ``"name"``: the name of the part.
+        ``"nodes"``: array of shape (n, 4) with the key and the coordinates of
+        each node, sorted by key in the part.
+        ``"elements"``: dictionary mapping ``(element type, implementation,
+        number of nodes)`` to an integer array with the key of each element
+        followed by the keys of its nodes.
+
+    Notes
+    -----
+    The keys of the model are used if they have been assigned (see
+    :meth:`compas_fea2.model.Model.assign_keys`), otherwise the keys in the part.
+
+    """
+    nodes = sorted(part._nodes, key=lambda n: n._part_key)
+    node_array = np.array([[n._part_key if n._key is None else n._key, *n.xyz] for n in nodes], dtype=float).reshape(-1, 4)
+
+    groups = {}
+    for element in sorted(part._elements, key=lambda e: e._part_key):
+        group = (type(element).__name__, element.implementation, len(element.nodes))
+        key = element._part_key if element._key is None else element._key
+        groups.setdefault(group, []).append([key] + [n._part_key if n._key is None else n._key for n in element.nodes])
+    elements = {group: np.array(rows, dtype=np.int64) for group, rows in groups.items()}
+
+    return {"name": part.name, "nodes": node_array, "elements": elements}
+
+
+def format_table(array, fmt, delimiter=", ", chunk_size=100000):
+    """Format the rows of an array as text lines.
+
+    The rows are formatted with a single ``%`` operation per chunk of rows,
+    which is much faster than formatting each row separately.
+
+    Parameters
+    ----------
+    array : :class:`numpy.ndarray`
+        Two-dimensional array.
+    fmt : str | list[str]
+        Format of the columns, as in :func:`numpy.savetxt` (e.g. ``"%d"`` or
+        ``["%d", "%.6f", "%.6f", "%.6f"]``). If a single format is given, it
+        is used for all the columns.
+    delimiter : str, optional
+        String separating the columns, by default ``", "``.
+    chunk_size : int, optional
+        Number of rows formatted at once, by default 100000.
+
+    Returns
+    -------
+    str
+        One line per row, each ending with a newline.
+
+    """
+    array = np.asarray(array)
+    if not array.size:
+        return ""
+    if array.ndim == 1:
+        array = array.reshape(-1, 1)
+    if isinstance(fmt, str):
+        fmt = [fmt] * array.shape[1]
+    row = delimiter.join(fmt) + "\n"
+    chunks = []
+    for start in range(0, len(array), chunk_size):
+        chunk = array[start : start + chunk_size]
+        chunks.append((row * len(chunk)) % tuple(chunk.ravel().tolist()))
+    return "".join(chunks)
+
+
+def format_parts(parts, formatter, processes=None):
+    """Format the input file blocks of several parts in parallel.
+
+    The arrays of each part are collected with :func:`part_arrays` and passed to
+    `formatter` in a pool of processes. The blocks are returned in the same
+    order as `parts`, regardless of the order in which they are completed.
+
+    Parameters
+    ----------
+    parts : list[:class:`compas_fea2.model._Part`]
+        The parts to format.
+    formatter : callable
+        Function taking the output of :func:`part_arrays` and returning the text
+        block of the part. It must be defined at module level, so that it can
+        be sent to other processes.
+    processes : int, optional
+        Number of processes, by default the number of CPUs. If ``1``, or if
+        there is a single part, the blocks are formatted in the current process.
+
+    Returns
+    -------
+    list[str]
+        The text blocks of the parts.
+
+    """
+    arrays = [part_arrays(part) for part in parts]
+    processes = processes or os.cpu_count() or 1
+    if processes == 1 or len(arrays) < 2:
+        return [formatter(data) for data in arrays]
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=min(processes, len(arrays))) as pool:
+        return list(pool.map(formatter, arrays))
@@ -1,7 +1,12 @@
+import gzip
 import os
+from pathlib import Path
 
 from compas_fea2 import VERBOSE
 from compas_fea2.base import FEAData
+from compas_fea2.job.blocks import BlockCache
+from compas_fea2.job.formatting import format_parts
+from compas_fea2.utilities._fingerprint import Fingerprinter
 
 
 class InputFile(FEAData):
@@ -23,14 +28,35 @@ class InputFile(FEAData):
         The model associated with the problem.
     path : str
         Complete path to the input file.
+    processes : int
+        Number of processes used by :meth:`format_parts`, by default ``None``
+        (the number of CPUs).
+
+    Notes
+    -----
+    Plugins can either implement :meth:`jobdata`, returning the whole input
+    file as a string, or :meth:`iter_jobdata`, yielding it in blocks (e.g. one
+    per part, section, element type and step). The second option is preferred
+    for large models, because :meth:`write_to_file` streams the blocks to disk
+    without building the whole file in memory.
+
+    Blocks generated through :meth:`cached_block` are reused from the
+    :class:`compas_fea2.job.BlockCache` of the problem (see
+    ``Problem.block_cache``) when the objects they depend on did not change.
 
     """
 
+    BUFFER_SIZE = 1 << 20
+    BLOCK_CACHE = ".fea2_blocks"
+
     def __init__(self, problem, **kwargs):
         super().__init__(**kwargs)
         self._registration = problem
         self._extension = None
         self.path = None
+        self.processes = None
+        self._block_cache = None
+        self._fingerprinter = None
 
     @property
     def file_name(self):
@@ -48,29 +74,146 @@ class InputFile(FEAData):
     # General methods
     # ==============================================================================
 
-    def write_to_file(self, path=None):
+    def jobdata(self):
+        """Generate the whole input file as a string.
+
+        Returns
+        -------
+        str
+
+        """
+        if type(self).iter_jobdata is InputFile.iter_jobdata:
+            raise NotImplementedError("This function is not available in the selected plugin.")
+        return "".join(self.iter_jobdata())
+
+    def iter_jobdata(self):
+        """Generate the input file as a sequence of text blocks.
+
+        By default, the output of :meth:`jobdata` is yielded as a single block.
+
+        Yields
+        ------
+        str
+            The next block of the input file.
+
+        """
+        if type(self).jobdata is InputFile.jobdata:
+            raise NotImplementedError("This function is not available in the selected plugin.")
+        data = self.jobdata()
+        if isinstance(data, str):
+            yield data
+        else:
+            yield from data
+
+    def format_parts(self, formatter):
+        """Format the nodes and elements of the parts of the model in parallel.
+
+        Parameters
+        ----------
+        formatter : callable
+            Module level function taking the arrays of a part (see
+            :func:`compas_fea2.job.part_arrays`) and returning its text block.
+
+        Returns
+        -------
+        list[str]
+            The text blocks of the parts, in the order the parts were added to
+            the model.
+
+        """
+        parts = sorted(self.model.parts, key=lambda p: p._key)
+        return format_parts(parts, formatter, processes=self.processes)
+
+    def cached_block(self, func, *objects):
+        """Generate a block of the input file, or reuse it from the block cache.
+
+        Parameters
+        ----------
+        func : callable
+            Function without arguments generating the block.
+        *objects
+            The objects and values the block depends on, for example a tag
+            naming the block, a part and the key offset of its nodes. They are
+            hashed with :class:`compas_fea2.utilities._fingerprint.Fingerprinter`
+            and must include everything that changes the text of the block.
+
+        Returns
+        -------
+        str
+            The block.
+
+        Notes
+        -----
+        When the problem has no block cache, or outside :meth:`write_to_file`,
+        `func` is always called.
+
+        """
+        if self._block_cache is None:
+            return func()
+        if self._fingerprinter is None:
+            self._fingerprinter = Fingerprinter()
+        digests = [type(self).__module__, type(self).__qualname__, getattr(func, "__qualname__", "")]
+        digests.extend(self._fingerprinter.value(obj) for obj in objects)
+        return self._block_cache.get(BlockCache.key(*digests), func)
+
+    def _get_block_cache(self, path):
+        block_cache = self.problem.block_cache
+        if not block_cache:
+            return None
+        if block_cache is True:
+            # next to the folders of the problems, so that problems sharing a model share the blocks
+            return BlockCache(Path(path).parent.joinpath(self.BLOCK_CACHE))
+        return block_cache
+
+    def write_to_file(self, path=None, compress=False, progress=None):
         """Writes the InputFile to a file in a specified location.
 
+        The blocks generated by :meth:`iter_jobdata` are written as soon as they
+        are produced through a buffered writer.
+
         Parameters
         ----------
         path : str, optional
             Path to the folder where the input file will be saved, by default
             ``None``. If not provided, the Problem path attributed is used.
+        compress : bool, optional
+            If ``True``, write a gzip compressed file with the additional
+            ``.gz`` extension, by default ``False``.
+        progress : callable, optional
+            Function called after each block with the number of blocks and of
+            characters written so far.
 
         Returns
         -------
         str
-            Information about the results of the writing process.
+            The path to the input file.
 
         """
         path = path or self.problem.path
         if not path:
             raise ValueError("A path to the folder for the input file must be provided")
         file_path = os.path.join(path, self.file_name)
-        with open(file_path, "w") as f:
-            f.writelines(self.jobdata())
+        if compress:
+            file_path += ".gz"
+            f = gzip.open(file_path, "wt")
+        else:
+            f = open(file_path, "w", buffering=self.BUFFER_SIZE)
+        written = 0
+        self._block_cache = self._get_block_cache(path)
+        try:
+            with f:
+                for i, block in enumerate(self.iter_jobdata(), 1):
+                    f.write(block)
+                    written += len(block)
+                    if progress:
+                        progress(i, written)
+        finally:
+            self._block_cache = None
+            self._fingerprinter = None
+        self.path = file_path
         if VERBOSE:
             print("Input file generated in the following location: {}".format(file_path))
+        return file_path
 
 
 class ParametersFile(InputFile):
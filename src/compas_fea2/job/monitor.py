@@ -0,0 +1,339 @@
+import contextvars
+import json
+import re
+import threading
+import time
+from contextlib import contextmanager
+
+
+class SolverEvent:
+    """Event parsed from the output of a solver.
+
+    Parameters
+    ----------
+    kind : str
+        Kind of event. The summary of :class:`SolverMonitor` understands
+        ``"increment"``, ``"iteration"``, ``"residual"``, ``"wall_time"`` and
+        ``"memory"``; other kinds (e.g. ``"warning"``) are only counted.
+    value : object, optional
+        Main value of the event (e.g. the residual).
+    data : dict, optional
+        Other values of the event.
+    stream : str, optional
+        ``"stdout"`` or ``"stderr"``.
+    line : str, optional
+        The line of output the event was parsed from.
+
+    Attributes
+    ----------
+    time : float
+        Time of the event, as returned by :func:`time.time`.
+
+    """
+
+    def __init__(self, kind, value=None, data=None, stream="stdout", line=None):
+        self.kind = kind
+        self.value = value
+        self.data = data or {}
+        self.stream = stream
+        self.line = line
+        self.time = time.time()
+
+    def __repr__(self):
+        return "{}({!r}, {!r})".format(self.__class__.__name__, self.kind, self.value)
+
+    def to_dict(self):
+        return {"time": self.time, "kind": self.kind, "value": self.value, "data": self.data, "stream": self.stream, "line": self.line}
+
+
+class LogParser:
+    """Rules turning lines of output of a solver into :class:`SolverEvent`.
+
+    Backends set an instance as the ``log_parser`` of their
+    :class:`compas_fea2.problem.Problem`, with the patterns of their solver.
+
+    Examples
+    --------
+    >>> parser = LogParser()
+    >>> parser = parser.add_pattern("increment", r"^\\s*INCREMENT\\s+(\\d+)", convert=int)
+    >>> parser = parser.add_pattern("residual", r"residual\\s*=\\s*(?P<value>\\S+)\\s+dof\\s*=\\s*(?P<dof>\\d+)")
+    >>> parser.parse("residual = 1.5e-03 dof = 12")
+    [SolverEvent('residual', 0.0015)]
+
+    """
+
+    def __init__(self):
+        self._patterns = []
+        self._handlers = []
+
+    def add_pattern(self, kind, pattern, convert=float, flags=0):
+        """Add a regular expression producing an event for each matching line.
+
+        Parameters
+        ----------
+        kind : str
+            Kind of the events.
+        pattern : str
+            Regular expression. The value of the event is the group named
+            ``value``, or the first group. The other named groups are stored in
+            the data of the event.
+        convert : callable, optional
+            Conversion of the value, by default :class:`float`.
+        flags : int, optional
+            Flags of :func:`re.compile`.
+
+        Returns
+        -------
+        :class:`LogParser`
+            The parser itself, to chain the calls.
+
+        """
+        self._patterns.append((kind, re.compile(pattern, flags), convert))
+        return self
+
+    def add_handler(self, handler):
+        """Add a function parsing lines that a regular expression cannot.
+
+        Parameters
+        ----------
+        handler : callable
+            Function called with each line and the name of the stream. It
+            returns ``None``, a :class:`SolverEvent` or a list of them.
+
+        Returns
+        -------
+        :class:`LogParser`
+            The parser itself, to chain the calls.
+
+        """
+        self._handlers.append(handler)
+        return self
+
+    def parse(self, line, stream="stdout"):
+        """Parse a line of output.
+
+        Parameters
+        ----------
+        line : str
+            The line, without the line ending.
+        stream : str, optional
+            ``"stdout"`` (default) or ``"stderr"``.
+
+        Returns
+        -------
+        list[:class:`SolverEvent`]
+
+        """
+        events = []
+        for kind, regex, convert in self._patterns:
+            match = regex.search(line)
+            if not match:
+                continue
+            data = {name: _number(value) for name, value in match.groupdict().items() if value is not None}
+            if "value" in data:
+                value = match.group("value")
+                del data["value"]
+            else:
+                value = match.group(1) if regex.groups else None
+            if value is not None and convert:
+                try:
+                    value = convert(value)
+                except ValueError:
+                    pass
+            events.append(SolverEvent(kind, value, data, stream, line))
+        for handler in self._handlers:
+            result = handler(line, stream)
+            if isinstance(result, SolverEvent):
+                events.append(result)
+            elif result:
+                events.extend(result)
+        return events
+
+
+class SolverMonitor:
+    """Structured stream of the events of an analysis.
+
+    The monitor is a parser for :func:`compas_fea2.utilities._utils.launch_process`
+    and :func:`compas_fea2.utilities._launcher.launch_process_async`: both feed
+    the output of the solver to the monitor of the current context (see
+    :func:`solver_monitor`). Each event is passed to the callbacks and written
+    to the JSON-lines log, if any.
+
+    Parameters
+    ----------
+    parser : :class:`LogParser`, optional
+        The rules of the solver. Without a parser, events can only be added
+        with :meth:`emit`.
+    callbacks : list[callable], optional
+        Functions called with each :class:`SolverEvent`.
+    log_path : str | :class:`pathlib.Path`, optional
+        JSON-lines file where the events are written as they happen.
+
+    Attributes
+    ----------
+    events : list[:class:`SolverEvent`]
+        The events, in order.
+    start, end : float
+        Start and end time of the monitoring, as returned by :func:`time.time`.
+
+    """
+
+    def __init__(self, parser=None, callbacks=None, log_path=None):
+        self.parser = parser
+        self.callbacks = list(callbacks or [])
+        self.events = []
+        self.start = time.time()
+        self.end = None
+        self.log_path = None
+        self._log = None
+        self._lock = threading.Lock()
+        if log_path:
+            self.open_log(log_path)
+
+    def __call__(self, line, stream="stdout"):
+        if self.parser:
+            for event in self.parser.parse(line, stream):
+                self.emit(event)
+
+    def emit(self, event):
+        """Add an event to the stream."""
+        with self._lock:
+            self.events.append(event)
+            if self._log:
+                self._log.write(json.dumps(event.to_dict(), default=str) + "\n")
+                self._log.flush()
+        for callback in self.callbacks:
+            callback(event)
+
+    def open_log(self, path):
+        """Write the events to a JSON-lines file, starting from the ones already emitted."""
+        with self._lock:
+            if self._log:
+                self._log.close()
+            self.log_path = str(path)
+            self._log = open(path, "w")
+            for event in self.events:
+                self._log.write(json.dumps(event.to_dict(), default=str) + "\n")
+            self._log.flush()
+
+    def close(self):
+        """Stop the monitoring and close the log."""
+        self.end = self.end or time.time()
+        with self._lock:
+            if self._log:
+                self._log.close()
+                self._log = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    # =========================================================================
+    #                           Summary
+    # =========================================================================
+
+    def increments(self):
+        """Duration, number of iterations and last residual of each increment.
+
+        Returns
+        -------
+        list[dict]
+
+        """
+        increments = []
+        for event in self.events:
+            if event.kind == "increment":
+                if increments:
+                    increments[-1]["duration"] = event.time - increments[-1]["start"]
+                increments.append({"increment": event.value, "start": event.time, "duration": None, "iterations": 0, "residual": None})
+            elif increments and event.kind == "iteration":
+                increments[-1]["iterations"] += 1
+            elif increments and event.kind == "residual":
+                increments[-1]["residual"] = event.value
+        if increments:
+            increments[-1]["duration"] = (self.end or time.time()) - increments[-1]["start"]
+        return increments
+
+    def summary(self, slowest=5):
+        """Summary of the analysis.
+
+        Parameters
+        ----------
+        slowest : int, optional
+            Number of slowest increments reported, by default 5.
+
+        Returns
+        -------
+        dict
+            The duration of the monitoring, the number of events of each kind,
+            the number of increments and iterations, the maximum number of
+            iterations of an increment, the last residual and wall time, the
+            peak memory and the slowest increments.
+
+        """
+        counts = {}
+        last = {}
+        peak_memory = None
+        for event in self.events:
+            counts[event.kind] = counts.get(event.kind, 0) + 1
+            last[event.kind] = event.value
+            if event.kind == "memory" and isinstance(event.value, (int, float)):
+                peak_memory = event.value if peak_memory is None else max(peak_memory, event.value)
+        increments = self.increments()
+        return {
+            "duration": (self.end or time.time()) - self.start,
+            "events": counts,
+            "increments": len(increments),
+            "iterations": counts.get("iteration", 0),
+            "max_iterations": max((i["iterations"] for i in increments), default=0),
+            "residual": last.get("residual"),
+            "wall_time": last.get("wall_time"),
+            "memory": peak_memory,
+            "slowest_increments": sorted(increments, key=lambda i: -i["duration"])[:slowest],
+        }
+
+    def status(self):
+        """Short description of the progress of the analysis, e.g. for a spinner."""
+        parts = []
+        for kind in ("increment", "iteration", "residual"):
+            for event in reversed(self.events):
+                if event.kind == kind:
+                    parts.append("{} {}".format(kind, event.value))
+                    break
+        return ", ".join(parts)
+
+
+_monitor = contextvars.ContextVar("compas_fea2_solver_monitor", default=None)
+
+
+def current_monitor():
+    """The :class:`SolverMonitor` of the current analysis, if any."""
+    return _monitor.get()
+
+
+@contextmanager
+def solver_monitor(monitor):
+    """Feed the output of the processes launched in the context to a monitor.
+
+    Parameters
+    ----------
+    monitor : :class:`SolverMonitor`
+        The monitor.
+
+    """
+    token = _monitor.set(monitor)
+    try:
+        yield monitor
+    finally:
+        _monitor.reset(token)
+
+
+def _number(value):
+    for convert in (int, float):
+        try:
+            return convert(value)
+        except ValueError:
+            pass
+    return value
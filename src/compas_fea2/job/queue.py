@@ -0,0 +1,311 @@
+import os
+import socket
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+import compas_fea2
+from compas_fea2 import VERBOSE
+from compas_fea2.job.scheduler import Scheduler
+from compas_fea2.job.scheduler import SkipJob
+from compas_fea2.utilities._fingerprint import Fingerprinter
+
+
+class JobQueue:
+    """Persistent queue of analyses stored in a SQLite database.
+
+    The queue records, for each problem, its fingerprint, the model file it is
+    loaded from, the folder of the analysis, the path of the input file, its
+    state and its timings. When the process running the analyses dies, the
+    remaining jobs can be resumed with :meth:`run` or with the
+    ``fea2 run-queue`` command.
+
+    Parameters
+    ----------
+    path : str | :class:`pathlib.Path`
+        Folder of the queue, usually the path of the model. The database is
+        stored in ``fea2-queue.db`` in this folder.
+
+    Examples
+    --------
+    >>> queue = JobQueue(path)  # doctest: +SKIP
+    >>> queue.add_model(model, problems=model.problems)  # doctest: +SKIP
+
+    And then, also after a crash::
+
+        fea2 run-queue path --workers 4
+
+    """
+
+    FILE = "fea2-queue.db"
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+    def __init__(self, path):
+        self.path = Path(path).expanduser().absolute()
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.path.joinpath(self.FILE)
+        self.worker = "{}:{}".format(socket.gethostname(), os.getpid())
+        with self._connect() as connection:
+            connection.execute(
+                """CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                problem TEXT NOT NULL,
+                model TEXT NOT NULL,
+                backend TEXT,
+                method TEXT NOT NULL,
+                fingerprint TEXT,
+                path TEXT NOT NULL,
+                input TEXT,
+                results TEXT,
+                state TEXT NOT NULL,
+                worker TEXT,
+                attempts INTEGER DEFAULT 0,
+                created REAL,
+                started REAL,
+                finished REAL,
+                error TEXT,
+                UNIQUE (model, problem))"""
+            )
+
+    def __repr__(self):
+        return "{}({!r})".format(self.__class__.__name__, str(self.path))
+
+    def _connect(self):
+        connection = sqlite3.connect(self.db_path, timeout=60, isolation_level=None)
+        connection.row_factory = sqlite3.Row
+        return _Connection(connection)
+
+    # =========================================================================
+    #                           Jobs
+    # =========================================================================
+
+    def add_model(self, model, problems=None, method="analyse_and_extract"):
+        """Add the problems of a model to the queue.
+
+        The model is saved in the folder of the queue, so that the analyses
+        can be run by another process.
+
+        Parameters
+        ----------
+        model : :class:`compas_fea2.model.Model`
+            The model.
+        problems : list[:class:`compas_fea2.problem.Problem`], optional
+            The problems to analyse, by default all the problems of the model.
+        method : str, optional
+            Name of the method of the problems to run, by default
+            ``"analyse_and_extract"``.
+
+        Returns
+        -------
+        list[int]
+            The ids of the jobs.
+
+        """
+        problems = list(problems or model.problems)
+        # same layout as the analysis folders, so that the model finds the results of its problems
+        model_file = self.path.joinpath(model.name, "{}.cfm".format(model.name))
+        model.to_cfm(model_file)
+        # a single fingerprinter hashes the model once for all the problems
+        fingerprinter = Fingerprinter()
+        fingerprints = [fingerprinter.problem(problem).hex() for problem in problems]
+        now = time.time()
+        ids = []
+        upsert = """INSERT INTO jobs (problem, model, backend, method, fingerprint, path, state, created)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (model, problem) DO UPDATE SET
+            backend = excluded.backend, method = excluded.method, fingerprint = excluded.fingerprint,
+            state = excluded.state, created = excluded.created, error = NULL
+            WHERE jobs.fingerprint IS NOT excluded.fingerprint OR jobs.state = 'failed'"""
+        returning = sqlite3.sqlite_version_info >= (3, 35, 0)
+        with self._connect() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                for problem, fingerprint in zip(problems, fingerprints):
+                    params = (problem.name, str(model_file), compas_fea2.BACKEND, method, fingerprint, str(self.path), self.PENDING, now)
+                    if returning:
+                        row = connection.execute(upsert + " RETURNING id", params).fetchone()
+                    else:
+                        # RETURNING needs SQLite 3.35, read the id of the job in the same transaction
+                        row = None
+                        if connection.execute(upsert, params).rowcount:
+                            row = connection.execute("SELECT id FROM jobs WHERE model = ? AND problem = ?", (str(model_file), problem.name)).fetchone()
+                    if row:
+                        ids.append(row["id"])
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+        return ids
+
+    def jobs(self, state=None):
+        """The jobs in the queue.
+
+        Parameters
+        ----------
+        state : str, optional
+            Only return the jobs in this state.
+
+        Returns
+        -------
+        list[dict]
+
+        """
+        with self._connect() as connection:
+            if state:
+                rows = connection.execute("SELECT * FROM jobs WHERE state = ? ORDER BY id", (state,))
+            else:
+                rows = connection.execute("SELECT * FROM jobs ORDER BY id")
+            return [dict(row) for row in rows]
+
+    def summary(self):
+        """Number of jobs per state.
+
+        Returns
+        -------
+        dict[str, int]
+
+        """
+        with self._connect() as connection:
+            return {row["state"]: row["n"] for row in connection.execute("SELECT state, COUNT(*) AS n FROM jobs GROUP BY state")}
+
+    def recover(self):
+        """Put back in the queue the jobs interrupted by a crash.
+
+        Running jobs are reset to pending if the process running them does not
+        exist anymore (only the processes of this machine are checked). Done
+        jobs of ``analyse_and_extract`` whose results database is missing are
+        reset as well.
+
+        Returns
+        -------
+        int
+            The number of recovered jobs.
+
+        """
+        host = socket.gethostname()
+        recovered = []
+        for job in self.jobs(self.RUNNING):
+            worker_host, _, pid = (job["worker"] or "").rpartition(":")
+            if worker_host == host and not _is_alive(int(pid)):
+                recovered.append(job["id"])
+        for job in self.jobs(self.DONE):
+            if job["method"] == "analyse_and_extract" and not (job["results"] and os.path.exists(job["results"])):
+                recovered.append(job["id"])
+        with self._connect() as connection:
+            connection.executemany("UPDATE jobs SET state = ?, worker = NULL WHERE id = ?", [(self.PENDING, i) for i in recovered])
+        return len(recovered)
+
+    def claim(self, job_id):
+        """Mark a pending job as running, if it is still pending.
+
+        Returns
+        -------
+        bool
+            ``True`` if the job was claimed by this process.
+
+        """
+        with self._connect() as connection:
+            cursor = connection.execute(
+                "UPDATE jobs SET state = ?, worker = ?, started = ?, finished = NULL, attempts = attempts + 1 WHERE id = ? AND state = ?",
+                (self.RUNNING, self.worker, time.time(), job_id, self.PENDING),
+            )
+            return cursor.rowcount == 1
+
+    def finish(self, job_id, error=None, input_path=None, results_path=None):
+        """Mark a running job as done, or as failed if an error is given."""
+        state = self.FAILED if error else self.DONE
+        with self._connect() as connection:
+            connection.execute(
+                "UPDATE jobs SET state = ?, finished = ?, error = ?, input = ?, results = ? WHERE id = ?",
+                (state, time.time(), str(error) if error else None, input_path, results_path, job_id),
+            )
+
+    # =========================================================================
+    #                           Run
+    # =========================================================================
+
+    def run(self, workers=None, cores=None, **kwargs):
+        """Run the pending jobs of the queue.
+
+        Parameters
+        ----------
+        workers : int, optional
+            Number of analyses running at the same time, see
+            :class:`compas_fea2.job.Scheduler`.
+        cores : int, optional
+            Total number of cores, see :class:`compas_fea2.job.Scheduler`.
+        kwargs
+            Other arguments passed to the method of the problems.
+
+        Returns
+        -------
+        :class:`compas_fea2.job.Scheduler`
+            The scheduler that ran the jobs, with their status.
+
+        """
+        from compas_fea2.model import Model
+
+        self.recover()
+        jobs = self.jobs(self.PENDING)
+        models = {}
+        problems = []
+        for job in jobs:
+            if job["model"] not in models:
+                if job["backend"] and job["backend"] != compas_fea2.BACKEND:
+                    compas_fea2.set_backend(job["backend"])
+                models[job["model"]] = Model.from_cfm(job["model"])
+            problems.append(models[job["model"]].find_problem_by_name(job["problem"]))
+
+        kwargs.setdefault("erase_data", True)
+        with Scheduler(workers=workers, cores=cores) as scheduler:
+            for job, problem in zip(jobs, problems):
+                scheduler.submit(problem, self._run_job, job, **kwargs)
+            scheduler.wait()
+        if VERBOSE:
+            print(scheduler.report())
+        return scheduler
+
+    def _run_job(self, problem, job, **kwargs):
+        if not self.claim(job["id"]):
+            raise SkipJob("Job {} was claimed by another worker".format(job["id"]))
+        try:
+            result = getattr(problem, job["method"])(path=job["path"], **kwargs)
+        except Exception as e:
+            self.finish(job["id"], error="{}: {}".format(type(e).__name__, e))
+            raise
+        try:
+            input_path = os.path.join(problem.path, problem.input_file.file_name)
+        except Exception:
+            input_path = None
+        self.finish(job["id"], input_path=input_path, results_path=problem.path_db)
+        return result
+
+
+class _Connection:
+    """Context manager closing a SQLite connection."""
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __enter__(self):
+        return self.connection
+
+    def __exit__(self, *args):
+        self.connection.close()
+
+
+def _is_alive(pid):
+    if sys.platform == "win32":
+        # os.kill would terminate the process
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except (PermissionError, OSError):
+        return True
+    return True
@@ -0,0 +1,363 @@
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+
+from compas_fea2 import VERBOSE
+from compas_fea2.utilities._launcher import ProcessResources
+from compas_fea2.utilities._launcher import available_cpus
+from compas_fea2.utilities._launcher import process_resources
+
+
+class SkipJob(Exception):
+    """Raised by the method of an :class:`AnalysisJob` that has nothing to do,
+    e.g. because another worker is already running it."""
+
+
+class AnalysisJob:
+    """Analysis of one problem run by a :class:`Scheduler`.
+
+    Parameters
+    ----------
+    problem : :class:`compas_fea2.problem.Problem`
+        The problem to analyse.
+    method : str | callable
+        Name of the method of the problem to run (e.g. ``"analyse_and_extract"``),
+        or function called with the problem as first argument.
+    args, kwargs
+        Arguments passed to the method.
+
+    Attributes
+    ----------
+    status : str
+        One of ``"pending"``, ``"running"``, ``"done"``, ``"failed"``,
+        ``"cancelled"`` and ``"skipped"`` (the method raised :class:`SkipJob`).
+    result : object
+        Value returned by the method, if the job is done.
+    error : Exception
+        Exception raised by the method, if the job failed.
+    traceback : str
+        Formatted traceback of the error, if the job failed.
+    start, end : float
+        Start and end time of the job, as returned by :func:`time.time`.
+    resources : :class:`compas_fea2.utilities._launcher.ProcessResources`
+        Threads and CPUs assigned to the solver, while the job is running.
+
+    """
+
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+    SKIPPED = "skipped"
+
+    def __init__(self, problem, method, args=(), kwargs=None):
+        self.problem = problem
+        self.method = method
+        self.args = args
+        self.kwargs = kwargs or {}
+        self.status = self.PENDING
+        self.result = None
+        self.error = None
+        self.traceback = None
+        self.start = None
+        self.end = None
+        self.resources = None
+
+    def __repr__(self):
+        return "{}({}, {})".format(self.__class__.__name__, self.problem.name, self.status)
+
+    @property
+    def duration(self):
+        """Duration of the job in seconds, or ``None`` if it did not run."""
+        if self.start is None:
+            return None
+        return (self.end or time.time()) - self.start
+
+    def run(self):
+        self.status = self.RUNNING
+        self.start = time.time()
+        try:
+            with process_resources(self.resources):
+                if callable(self.method):
+                    self.result = self.method(self.problem, *self.args, **self.kwargs)
+                else:
+                    self.result = getattr(self.problem, self.method)(*self.args, **self.kwargs)
+        except SkipJob:
+            self.status = self.SKIPPED
+        except Exception as e:
+            self.error = e
+            self.traceback = traceback.format_exc()
+            self.status = self.FAILED
+        else:
+            self.status = self.DONE
+        finally:
+            self.end = time.time()
+        return self
+
+
+class Scheduler:
+    """Run the analyses of several problems concurrently.
+
+    Each problem is analysed in a worker thread, in its own folder (see
+    :meth:`compas_fea2.problem.Problem._check_analysis_path`). An error in one
+    analysis does not stop the others: it is stored in the corresponding
+    :class:`AnalysisJob`.
+
+    Parameters
+    ----------
+    workers : int, optional
+        Maximum number of analyses running at the same time, by default
+        ``cores // threads``.
+    cores : int, optional
+        Total number of cores used by the analyses, by default the number of
+        CPUs available to the current process.
+    threads : int, optional
+        Number of threads of the solver of each analysis, by default
+        ``cores // workers``, or 1 if `workers` is not given.
+    pin : bool, optional
+        If ``True``, pin each solver to its own CPUs (Linux only), by default
+        ``False``. Requires ``workers * threads`` available cores.
+    order : str, optional
+        Admission order of the problems passed to :meth:`run`. ``"size"``
+        (default) starts the largest problems first, based on
+        :meth:`estimate_dofs`, which shortens the total time. ``None`` keeps
+        the given order.
+
+    Notes
+    -----
+    The solvers run in separate processes, so threads are enough to run them
+    in parallel. The problems share the model, which must not be modified
+    while the analyses are running.
+
+    The number of threads of each solver is set through the environment
+    variables in :data:`compas_fea2.utilities._launcher.THREAD_VARIABLES`
+    (``OMP_NUM_THREADS``, ``MKL_NUM_THREADS``...) when the backend launches
+    it with :func:`compas_fea2.utilities._utils.launch_process` or
+    :func:`compas_fea2.utilities._launcher.launch_process_async`. Backends
+    can also read it from
+    :func:`compas_fea2.utilities._launcher.current_resources`.
+
+    Examples
+    --------
+    >>> scheduler = Scheduler(cores=16, threads=4)  # doctest: +SKIP
+    >>> scheduler.run(model.problems, "analyse_and_extract", path=path, erase_data=True)  # doctest: +SKIP
+    >>> print(scheduler.report())  # doctest: +SKIP
+
+    """
+
+    def __init__(self, workers=None, cores=None, threads=None, pin=False, order="size"):
+        cpus = available_cpus()
+        self.cores = cores or len(cpus)
+        if threads is None:
+            threads = max(1, self.cores // workers) if workers else 1
+        self.threads = threads
+        self.workers = workers or max(1, self.cores // threads)
+        self.pin = pin
+        self.order = order
+        self.jobs = []
+        self._futures = []
+        self._executor = None
+        self._cancelled = threading.Event()
+        self._lock = threading.Lock()
+        self._free_cpus = cpus[: self.cores]
+        if pin and self.workers * self.threads > len(self._free_cpus):
+            raise ValueError("Cannot pin {} workers with {} threads each to {} CPUs".format(self.workers, self.threads, len(self._free_cpus)))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.shutdown()
+
+    # =========================================================================
+    #                           Submission
+    # =========================================================================
+
+    def submit(self, problem, method="analyse_and_extract", *args, **kwargs):
+        """Schedule the analysis of a problem.
+
+        Parameters
+        ----------
+        problem : :class:`compas_fea2.problem.Problem`
+            The problem to analyse.
+        method : str | callable, optional
+            Name of the method of the problem to run, by default
+            ``"analyse_and_extract"``, or function called with the problem as
+            first argument.
+        args, kwargs
+            Arguments passed to the method.
+
+        Returns
+        -------
+        :class:`AnalysisJob`
+
+        """
+        job = AnalysisJob(problem, method, args, kwargs)
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="fea2")
+            self.jobs.append(job)
+            self._futures.append(self._executor.submit(self._run, job))
+        return job
+
+    def run(self, problems, method="analyse_and_extract", *args, **kwargs):
+        """Analyse the problems and wait for all the analyses to finish.
+
+        Parameters
+        ----------
+        problems : list[:class:`compas_fea2.problem.Problem`]
+            The problems to analyse.
+        method : str, optional
+            Name of the method of the problems to run, by default
+            ``"analyse_and_extract"``.
+        args, kwargs
+            Arguments passed to the method.
+
+        Returns
+        -------
+        list[:class:`AnalysisJob`]
+            The jobs of the problems, in the same order as `problems`.
+
+        """
+        problems = list(problems)
+        jobs = [None] * len(problems)
+        indices = range(len(problems))
+        if self.order == "size":
+            sizes = [self.estimate_dofs(problem) for problem in problems]
+            indices = sorted(indices, key=lambda i: -sizes[i])
+        for i in indices:
+            jobs[i] = self.submit(problems[i], method, *args, **kwargs)
+        self.wait()
+        if VERBOSE:
+            print(self.report())
+        return jobs
+
+    def _run(self, job):
+        if self._cancelled.is_set():
+            job.status = job.CANCELLED
+            return job
+        cpus = None
+        if self.pin:
+            with self._lock:
+                cpus, self._free_cpus = self._free_cpus[: self.threads], self._free_cpus[self.threads :]
+        job.resources = ProcessResources(threads=self.threads, cpus=cpus)
+        try:
+            return job.run()
+        finally:
+            if cpus:
+                with self._lock:
+                    self._free_cpus.extend(cpus)
+
+    @staticmethod
+    def estimate_dofs(problem):
+        """Estimate the size of the analysis of a problem.
+
+        Parameters
+        ----------
+        problem : :class:`compas_fea2.problem.Problem`
+            The problem.
+
+        Returns
+        -------
+        int
+            Six degrees of freedom per node of the model, times the number of
+            steps of the problem.
+
+        """
+        model = problem.model
+        nodes = sum(len(part._nodes) for part in model.parts) if model else 0
+        return 6 * nodes * max(1, len(problem.steps))
+
+    # =========================================================================
+    #                           Control
+    # =========================================================================
+
+    def wait(self, timeout=None):
+        """Wait for the scheduled jobs to finish.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            Maximum time to wait in seconds, by default no limit.
+
+        Returns
+        -------
+        bool
+            ``True`` if all the jobs are finished.
+
+        """
+        with self._lock:
+            futures = list(self._futures)
+        _, not_done = wait(futures, timeout=timeout)
+        return not not_done
+
+    def cancel(self):
+        """Cancel the jobs that did not start yet.
+
+        Running jobs are not interrupted. Jobs submitted afterwards are
+        cancelled as well.
+
+        Returns
+        -------
+        list[:class:`AnalysisJob`]
+            The cancelled jobs.
+
+        """
+        self._cancelled.set()
+        with self._lock:
+            for job, future in zip(self.jobs, self._futures):
+                if future.cancel():
+                    job.status = job.CANCELLED
+        return [job for job in self.jobs if job.status == job.CANCELLED]
+
+    def shutdown(self, wait=True):
+        """Release the worker threads."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor:
+            executor.shutdown(wait=wait)
+
+    # =========================================================================
+    #                           Report
+    # =========================================================================
+
+    @property
+    def failed(self):
+        """The jobs that failed."""
+        return [job for job in self.jobs if job.status == job.FAILED]
+
+    def summary(self):
+        """Number of jobs per status.
+
+        Returns
+        -------
+        dict[str, int]
+
+        """
+        summary = {}
+        for job in self.jobs:
+            summary[job.status] = summary.get(job.status, 0) + 1
+        return summary
+
+    def report(self):
+        """Consolidated status report of the jobs.
+
+        Returns
+        -------
+        str
+
+        """
+        title = "Analysis of {} problems".format(len(self.jobs))
+        lines = [title, "-" * len(title)]
+        for job in self.jobs:
+            duration = "{:.1f} s".format(job.duration) if job.duration is not None else "-"
+            threads = job.resources.threads if job.resources else "-"
+            line = "{:<30} {:<10} {:>10} {:>4} threads".format(job.problem.name, job.status, duration, threads)
+            if job.error is not None:
+                line += "  {}: {}".format(type(job.error).__name__, job.error)
+            lines.append(line)
+        lines.append(", ".join("{} {}".format(count, status) for status, count in sorted(self.summary().items())))
+        return "\n".join(lines)
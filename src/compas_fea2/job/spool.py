@@ -0,0 +1,396 @@
+import json
+import os
+import shutil
+import socket
+import threading
+import time
+import traceback
+import uuid
+from pathlib import Path
+
+import compas_fea2
+from compas_fea2 import VERBOSE
+
+
+class SpoolDirectory:
+    """Distribute analyses to workers through a shared directory.
+
+    The protocol only relies on the atomicity of :func:`os.rename` within one
+    filesystem, so the spool directory can be shared between several machines
+    (e.g. on NFS) without any network service. Each job is a folder moving
+    between the sub-folders ``pending``, ``running``, ``done`` and ``failed``:
+
+    * the coordinator saves the model in ``models`` and writes the job in
+      ``pending`` (see :meth:`submit`);
+    * a worker claims a job by renaming it to ``running/<job id>.<token>``,
+      with a token unique to the claim, runs it in the job folder, rewrites a
+      ``heartbeat`` file while running, copies the results database to
+      ``results.db`` and renames the job to ``done`` or ``failed`` (see
+      :meth:`work` and the ``fea2 worker`` command). If the job was requeued
+      in the meantime, the folder of the claim does not exist anymore and the
+      results of the worker are discarded;
+    * the coordinator waits for the jobs and copies the results database to
+      the analysis folder of each problem (see :meth:`run`).
+
+    Parameters
+    ----------
+    path : str | :class:`pathlib.Path`
+        The spool directory. It is created if it does not exist.
+
+    """
+
+    STATES = ("pending", "running", "done", "failed")
+    HEARTBEAT = "heartbeat"
+    HEARTBEAT_INTERVAL = 10.0
+    RESULTS = "results.db"
+
+    def __init__(self, path):
+        self.path = Path(path).expanduser().absolute()
+        for folder in self.STATES + ("models",):
+            self.path.joinpath(folder).mkdir(parents=True, exist_ok=True)
+        # last heartbeat seen for each claim, and when it was seen, see requeue_stale
+        self._heartbeats = {}
+
+    def __repr__(self):
+        return "{}({!r})".format(self.__class__.__name__, str(self.path))
+
+    def job_path(self, job_id, state):
+        """Folder of a job in a state. Running jobs are in the folder of their
+        claim, see :meth:`claim`."""
+        return self.path.joinpath(state, job_id)
+
+    def jobs(self, state):
+        """Ids of the jobs in a state, oldest first."""
+        return sorted(name.partition(".")[0] for name in self._folders(state))
+
+    def state(self, job_id):
+        """State of a job, or ``None`` if it does not exist."""
+        for state in self.STATES:
+            if state == "running":
+                if job_id in self.jobs(state):
+                    return state
+            elif self.job_path(job_id, state).exists():
+                return state
+        return None
+
+    def _folders(self, state):
+        return [p.name for p in self.path.joinpath(state).iterdir() if not p.name.startswith(".")]
+
+    # =========================================================================
+    #                           Coordinator
+    # =========================================================================
+
+    def submit(self, problems, method="analyse_and_extract", **kwargs):
+        """Submit the analysis of problems of the same model.
+
+        Parameters
+        ----------
+        problems : list[:class:`compas_fea2.problem.Problem`]
+            The problems.
+        method : str, optional
+            Name of the method of the problems to run, by default
+            ``"analyse_and_extract"``.
+        kwargs
+            Other arguments passed to the method. They must be JSON serializable.
+
+        Returns
+        -------
+        list[str]
+            The ids of the jobs.
+
+        """
+        problems = list(problems)
+        if not problems:
+            return []
+        model = problems[0].model
+        model_name = "{}-{}".format(model.name, uuid.uuid4().hex)
+        model_file = self.path.joinpath("models", model_name, "{}.cfm".format(model.name))
+        model.to_cfm(model_file)
+
+        ids = []
+        for problem in problems:
+            job_id = "{:020d}-{}".format(time.time_ns(), uuid.uuid4().hex[:8])
+            job = {
+                "id": job_id,
+                "model": str(model_file.relative_to(self.path)),
+                "problem": problem.name,
+                "backend": compas_fea2.BACKEND,
+                "method": method,
+                "kwargs": kwargs,
+                "submitted": time.time(),
+            }
+            # write the job in a hidden folder and move it in place, so that workers never see a partial job
+            tmp = self.path.joinpath("pending", ".{}".format(job_id))
+            tmp.mkdir()
+            with open(tmp.joinpath("job.json"), "w") as f:
+                json.dump(job, f, indent=4)
+            os.rename(tmp, self.job_path(job_id, "pending"))
+            ids.append(job_id)
+        return ids
+
+    def wait(self, job_ids, timeout=None, poll=1.0):
+        """Wait for jobs to be done or failed.
+
+        Parameters
+        ----------
+        job_ids : list[str]
+            The ids of the jobs.
+        timeout : float, optional
+            Maximum time to wait in seconds, by default no limit.
+        poll : float, optional
+            Interval between checks in seconds, by default 1.
+
+        Returns
+        -------
+        dict[str, str]
+            The state of each job.
+
+        """
+        start = time.time()
+        while True:
+            states = {job_id: self.state(job_id) for job_id in job_ids}
+            if all(state in ("done", "failed") for state in states.values()):
+                return states
+            if timeout is not None and time.time() - start > timeout:
+                return states
+            time.sleep(poll)
+
+    def run(self, problems, method="analyse_and_extract", path=None, erase_data=False, timeout=None, poll=1.0, **kwargs):
+        """Submit the problems, wait for the workers and collect the results.
+
+        Parameters
+        ----------
+        problems : list[:class:`compas_fea2.problem.Problem`]
+            The problems, all of the same model.
+        method : str, optional
+            Name of the method of the problems to run, by default
+            ``"analyse_and_extract"``.
+        path : str | :class:`pathlib.Path`, optional
+            Folder of the analyses, where the results are copied.
+        erase_data : bool, optional
+            Passed to :meth:`compas_fea2.problem.Problem._check_analysis_path`.
+        timeout : float, optional
+            Maximum time to wait in seconds, by default no limit.
+        poll : float, optional
+            Interval between checks in seconds, by default 1.
+        kwargs
+            Other arguments passed to the method.
+
+        Returns
+        -------
+        dict[str, str]
+            The state of the job of each problem, by problem name.
+
+        Raises
+        ------
+        RuntimeError
+            If some jobs failed or did not complete in time. The results of the
+            other jobs are collected anyway.
+
+        """
+        problems = list(problems)
+        if not path:
+            model = problems[0].model if problems else None
+            path = model.path.parent if model and model.path else None
+        if not path:
+            raise ValueError("A path to the folder for the analysis must be provided")
+        job_ids = self.submit(problems, method=method, **kwargs)
+        states = self.wait(job_ids, timeout=timeout, poll=poll)
+
+        errors = []
+        for problem, job_id in zip(problems, job_ids):
+            state = states[job_id]
+            if state == "done":
+                job_path = self.job_path(job_id, state)
+                if job_path.joinpath(self.RESULTS).exists():
+                    problem._check_analysis_path(path, erase_data)
+                    shutil.copyfile(job_path.joinpath(self.RESULTS), problem.path_db)
+                    problem._rdb = None
+            elif state == "failed":
+                with open(self.job_path(job_id, state).joinpath("error.txt")) as f:
+                    errors.append("{}: {}".format(problem.name, f.read().strip().splitlines()[-1]))
+            else:
+                errors.append("{}: {} after the timeout".format(problem.name, state))
+        if errors:
+            raise RuntimeError("Some analyses did not complete:\n" + "\n".join(errors))
+        return {problem.name: states[job_id] for problem, job_id in zip(problems, job_ids)}
+
+    # =========================================================================
+    #                           Worker
+    # =========================================================================
+
+    def claim(self):
+        """Claim the oldest pending job.
+
+        The job is moved to ``running/<job id>.<token>``, with a token unique
+        to the claim, so that a worker whose job was requeued and claimed again
+        cannot write in the folder of the new claim.
+
+        Returns
+        -------
+        str | None
+            The claim, i.e. the name of the folder of the job in ``running``,
+            or ``None`` if there are no pending jobs.
+
+        """
+        for job_id in self.jobs("pending"):
+            claim = "{}.{}".format(job_id, uuid.uuid4().hex[:12])
+            try:
+                os.rename(self.job_path(job_id, "pending"), self.job_path(claim, "running"))
+            except OSError:
+                # claimed by another worker
+                continue
+            self._write_heartbeat(claim)
+            return claim
+        return None
+
+    def requeue_stale(self, timeout):
+        """Move back to pending the running jobs without a recent heartbeat.
+
+        The heartbeat file contains the time written by the worker. A job is
+        stale when its heartbeat did not change for `timeout` seconds, measured
+        with the clock of this process, so the clocks of the machines sharing
+        the spool directory do not need to agree. The jobs are therefore only
+        requeued once this method has seen them for `timeout` seconds.
+
+        Parameters
+        ----------
+        timeout : float
+            Time in seconds after which a job without heartbeat is considered
+            abandoned by its worker.
+
+        Returns
+        -------
+        list[str]
+            The ids of the requeued jobs.
+
+        """
+        requeued = []
+        now = time.monotonic()
+        claims = self._folders("running")
+        for claim in claims:
+            try:
+                with open(self.job_path(claim, "running").joinpath(self.HEARTBEAT)) as f:
+                    beat = f.read()
+            except OSError:
+                # not written yet, or the worker died before writing it
+                beat = None
+            last = self._heartbeats.get(claim)
+            if last is None or last[0] != beat:
+                self._heartbeats[claim] = (beat, now)
+                continue
+            if now - last[1] > timeout:
+                job_id = claim.partition(".")[0]
+                try:
+                    os.rename(self.job_path(claim, "running"), self.job_path(job_id, "pending"))
+                except OSError:
+                    continue
+                requeued.append(job_id)
+        for claim in set(self._heartbeats) - set(claims):
+            del self._heartbeats[claim]
+        return requeued
+
+    def work(self, once=False, poll=1.0, max_jobs=None, stale_timeout=None, heartbeat=None):
+        """Run the pending jobs of the spool directory.
+
+        Parameters
+        ----------
+        once : bool, optional
+            If ``True``, stop when there are no pending jobs, by default ``False``.
+        poll : float, optional
+            Interval between checks for new jobs in seconds, by default 1.
+        max_jobs : int, optional
+            Stop after this number of jobs, by default no limit.
+        stale_timeout : float, optional
+            If given, requeue the running jobs whose worker did not update the
+            heartbeat for this time in seconds (see :meth:`requeue_stale`). It
+            must be longer than the heartbeat interval of all the workers.
+        heartbeat : float, optional
+            Interval between the updates of the heartbeat of the running job in
+            seconds, by default :attr:`HEARTBEAT_INTERVAL`, or a quarter of
+            `stale_timeout` if shorter.
+
+        Returns
+        -------
+        int
+            The number of jobs run. The jobs requeued by another worker while
+            they were running are not counted.
+
+        Raises
+        ------
+        ValueError
+            If `stale_timeout` is not longer than twice the heartbeat interval.
+
+        """
+        if heartbeat is None:
+            heartbeat = min(self.HEARTBEAT_INTERVAL, stale_timeout / 4) if stale_timeout else self.HEARTBEAT_INTERVAL
+        if stale_timeout and stale_timeout <= 2 * heartbeat:
+            raise ValueError("The stale timeout ({}s) must be longer than twice the heartbeat interval ({}s)".format(stale_timeout, heartbeat))
+        count = 0
+        models = {}
+        while max_jobs is None or count < max_jobs:
+            if stale_timeout:
+                self.requeue_stale(stale_timeout)
+            claim = self.claim()
+            if claim is None:
+                if once:
+                    break
+                time.sleep(poll)
+                continue
+            if self._run_job(claim, models, heartbeat):
+                count += 1
+        return count
+
+    def _run_job(self, claim, models, interval):
+        from compas_fea2.model import Model
+
+        job_id = claim.partition(".")[0]
+        job_path = self.job_path(claim, "running")
+        stop = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(claim, stop, interval), daemon=True)
+        heartbeat.start()
+        try:
+            with open(job_path.joinpath("job.json")) as f:
+                job = json.load(f)
+            if job["backend"] and job["backend"] != compas_fea2.BACKEND:
+                compas_fea2.set_backend(job["backend"])
+            if job["model"] not in models:
+                models[job["model"]] = Model.from_cfm(self.path.joinpath(job["model"]))
+            problem = models[job["model"]].find_problem_by_name(job["problem"])
+            kwargs = dict(job["kwargs"], erase_data=True)
+            getattr(problem, job["method"])(path=job_path.joinpath("work"), **kwargs)
+            if problem.path_db and os.path.exists(problem.path_db):
+                shutil.copyfile(problem.path_db, job_path.joinpath(self.RESULTS))
+            state = "done"
+        except Exception:
+            error = traceback.format_exc()
+            state = "failed"
+        finally:
+            stop.set()
+            heartbeat.join()
+        try:
+            if state == "failed":
+                with open(job_path.joinpath("error.txt"), "w") as f:
+                    f.write(error)
+            os.rename(job_path, self.job_path(job_id, state))
+        except OSError:
+            # the job was requeued by requeue_stale while running, the folder of
+            # the claim is gone and the job is run again by another worker
+            if VERBOSE:
+                print("Job {} lost to a requeue".format(job_id))
+            return None
+        if VERBOSE:
+            print("Job {} {}".format(job_id, state))
+        return state
+
+    def _write_heartbeat(self, claim):
+        # the time written makes each heartbeat different from the previous one
+        with open(self.job_path(claim, "running").joinpath(self.HEARTBEAT), "w") as f:
+            f.write("{}:{} {}".format(socket.gethostname(), os.getpid(), time.time()))
+
+    def _heartbeat(self, claim, stop, interval):
+        while not stop.wait(interval):
+            try:
+                self._write_heartbeat(claim)
+            except OSError:
+                break
@@ -0,0 +1,211 @@
+import csv
+import math
+import pickle
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import as_completed
+from pathlib import Path
+
+import numpy as np
+
+from compas_fea2 import VERBOSE
+from compas_fea2.job.blocks import BlockCache
+from compas_fea2.utilities._launcher import ProcessResources
+from compas_fea2.utilities._launcher import process_resources
+
+
+class Sweep:
+    """Parametric study of a problem on the same meshed model.
+
+    Each variant is defined by a row of the parameter table. The values of a
+    row are applied to a copy of the model with `apply`, the problem is
+    analysed and the `outputs` are evaluated on the results. The model is
+    pickled once and each variant gets a fresh copy, so the changes made by
+    `apply` never leak into other variants. All the variants share the same
+    :class:`compas_fea2.job.BlockCache`, so the blocks of the input files that
+    do not depend on the parameters (e.g. the mesh) are generated only once.
+
+    The copy includes the mesh, because `apply` may change any object the
+    elements refer to (e.g. their sections). It costs one unpickling per
+    variant, which is much cheaper than meshing or analysing the model, and
+    about :attr:`COPY_FACTOR` times the size of the pickled model in memory
+    for each variant running. Use `max_memory` in :meth:`run` to bound it.
+
+    Parameters
+    ----------
+    problem : :class:`compas_fea2.problem.Problem`
+        The base problem. Its model is the base model of the variants.
+    parameters : dict[str, list] | list[dict]
+        The parameter table, either as columns of the same length or as rows.
+    apply : callable
+        Function ``apply(model, problem, **values)`` modifying the copy of the
+        model and of the problem of a variant for its values (e.g.
+        changing the Young's modulus of a material or the magnitude of a load).
+    outputs : dict[str, callable]
+        Scalar outputs, as functions of the analysed problem.
+    method : str, optional
+        Name of the method of the problem to run, by default
+        ``"analyse_and_extract"``.
+
+    Attributes
+    ----------
+    rows : dict[int, dict]
+        The parameters, the outputs and the ``error`` of each completed
+        variant, by variant index.
+    copy_size : int
+        Size in bytes of the pickled model copied for each variant, once
+        :meth:`run` was called.
+
+    Examples
+    --------
+    >>> def apply(model, problem, E):  # doctest: +SKIP
+    ...     model.find_material_by_name("steel").E = E
+    >>> sweep = Sweep(problem, {"E": [190e3, 200e3, 210e3]}, apply, {"u_max": lambda p: p.displacement_field.get_max_result(...).magnitude})  # doctest: +SKIP
+    >>> sweep.run(path, workers=4, csv_path="sweep.csv")  # doctest: +SKIP
+    >>> sweep.to_numpy()  # doctest: +SKIP
+
+    """
+
+    # memory of an unpickled model over the size of its pickle, measured on meshes of beams and shells
+    COPY_FACTOR = 4
+
+    def __init__(self, problem, parameters, apply, outputs, method="analyse_and_extract"):
+        self.problem = problem
+        self.parameters = self._rows(parameters)
+        self.apply = apply
+        self.outputs = outputs
+        self.method = method
+        self.rows = {}
+        self.copy_size = None
+
+    @staticmethod
+    def _rows(parameters):
+        if isinstance(parameters, dict):
+            names = list(parameters)
+            columns = [list(parameters[name]) for name in names]
+            if len(set(len(column) for column in columns)) > 1:
+                raise ValueError("All the columns of the parameter table must have the same length")
+            return [dict(zip(names, values)) for values in zip(*columns)]
+        return [dict(row) for row in parameters]
+
+    @property
+    def columns(self):
+        """Names of the parameters and of the outputs."""
+        names = list(self.parameters[0]) if self.parameters else []
+        return names + list(self.outputs)
+
+    # =========================================================================
+    #                           Run
+    # =========================================================================
+
+    def run(self, path, workers=None, cores=None, csv_path=None, callback=None, max_memory=None, **kwargs):
+        """Run the variants.
+
+        Parameters
+        ----------
+        path : str | :class:`pathlib.Path`
+            Folder of the analyses. Each variant is analysed in its own
+            sub-folder ``variant_<index>``.
+        workers : int, optional
+            Number of variants analysed at the same time, by default 1.
+        cores : int, optional
+            Total number of cores. Each solver gets ``cores // workers`` threads.
+        csv_path : str | :class:`pathlib.Path`, optional
+            CSV file where a row is appended as soon as each variant is done.
+        callback : callable, optional
+            Function called with the row of each variant as soon as it is done.
+        max_memory : int, optional
+            Memory in bytes for the copies of the model of the variants running
+            at the same time, estimated as :attr:`COPY_FACTOR` times
+            :attr:`copy_size` per copy. The number of workers is reduced to
+            fit, down to 1. By default there is no limit.
+        kwargs
+            Other arguments passed to the method of the problem.
+
+        Returns
+        -------
+        list[dict]
+            The rows of the variants, in the order of the parameter table.
+
+        """
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        data = pickle.dumps(self.problem.model)
+        self.copy_size = len(data)
+        workers = workers or 1
+        if max_memory is not None:
+            workers = max(1, min(workers, int(max_memory // (self.COPY_FACTOR * self.copy_size))))
+        resources = ProcessResources(threads=max(1, cores // workers)) if cores else None
+        block_cache = BlockCache(path.joinpath(".fea2_blocks"))
+
+        kwargs.setdefault("erase_data", True)
+        f = open(csv_path, "w", newline="") if csv_path else None
+        try:
+            writer = None
+            if f:
+                writer = csv.DictWriter(f, fieldnames=["variant"] + self.columns + ["error"])
+                writer.writeheader()
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="fea2-sweep") as executor:
+                futures = [executor.submit(self._run_variant, i, values, data, path, block_cache, resources, kwargs) for i, values in enumerate(self.parameters)]
+                for future in as_completed(futures):
+                    row = future.result()
+                    self.rows[row["variant"]] = row
+                    if writer:
+                        writer.writerow(row)
+                        f.flush()
+                    if callback:
+                        callback(row)
+                    if VERBOSE:
+                        print("Variant {} {}".format(row["variant"], "failed" if row["error"] else "done"))
+        finally:
+            if f:
+                f.close()
+        return [self.rows[i] for i in range(len(self.parameters))]
+
+    def _copy(self, data):
+        model = pickle.loads(data)
+        return model, model.find_problem_by_name(self.problem.name)
+
+    def _run_variant(self, index, values, data, path, block_cache, resources, kwargs):
+        row = dict(values, variant=index, error=None)
+        try:
+            model, problem = self._copy(data)
+            self.apply(model, problem, **values)
+            problem.block_cache = block_cache
+            with process_resources(resources):
+                getattr(problem, self.method)(path.joinpath("variant_{:04d}".format(index)), **kwargs)
+            for name, output in self.outputs.items():
+                row[name] = output(problem)
+        except Exception as e:
+            row["error"] = "{}: {}".format(type(e).__name__, e)
+            if VERBOSE:
+                traceback.print_exc()
+        return row
+
+    # =========================================================================
+    #                           Results
+    # =========================================================================
+
+    def to_numpy(self):
+        """Parameters and outputs of the variants as an array.
+
+        Returns
+        -------
+        :class:`numpy.ndarray`
+            Array of shape (number of variants, number of columns), see
+            :attr:`columns`. Missing or non numeric values are ``nan``.
+
+        """
+        table = np.full((len(self.parameters), len(self.columns)), np.nan)
+        for i, row in self.rows.items():
+            for j, name in enumerate(self.columns):
+                table[i, j] = _to_float(row.get(name))
+        return table
+
+
+def _to_float(value):
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return math.nan
+    return value
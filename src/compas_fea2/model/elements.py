@@ -21,6 +21,7 @@ from compas_fea2.base import FEAData
 from compas_fea2.results import Result
 from compas_fea2.results import ShellStressResult
 from compas_fea2.results import SolidStressResult
+from compas_fea2.utilities._fingerprint import invalidate_fingerprint
 
 if TYPE_CHECKING:
     from compas_fea2.problem import Step
@@ -85,6 +86,8 @@ class _Element(FEAData):
 
     """
 
+    _weak_registration = True
+
     def __init__(self, nodes: List["Node"], section: "_Section", implementation: Optional[str] = None, rigid: bool = False, **kwargs):
         super().__init__(**kwargs)
         self._part_key = None
@@ -136,6 +139,7 @@ class _Element(FEAData):
     @nodes.setter
     def nodes(self, value: List["Node"]):
         self._nodes = self._check_nodes(value)
+        invalidate_fingerprint(self)
 
     @property
     def nodes_key(self) -> str:
@@ -156,6 +160,7 @@ class _Element(FEAData):
     @section.setter
     def section(self, value: "_Section"):
         self._section = value
+        invalidate_fingerprint(self)
 
     @property
     def frame(self) -> Optional[Frame]:
@@ -497,6 +502,8 @@ class Face(FEAData):
 
     """
 
+    _weak_registration = True
+
     def __init__(self, nodes: List["Node"], tag: str, element: Optional["_Element"] = None, **kwargs):
         super().__init__(**kwargs)
         self._nodes = nodes
@@ -618,6 +625,7 @@ class _Element2D(_Element):
     @nodes.setter
     def nodes(self, value: List["Node"]):
         self._nodes = self._check_nodes(value)
+        invalidate_fingerprint(self)
         self._faces = self._construct_faces(self._face_indices)
 
     @property
@@ -751,6 +759,7 @@ class _Element3D(_Element):
     @nodes.setter
     def nodes(self, value: List["Node"]):
         self._nodes = value
+        invalidate_fingerprint(self)
         self._faces = self._construct_faces(self._face_indices)
 
     @property
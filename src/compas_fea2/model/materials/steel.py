@@ -1,6 +1,3 @@
-from compas_fea2.units import UnitRegistry
-from compas_fea2.units import units as u
-
 from .material import ElasticIsotropic
 
 
@@ -133,6 +130,9 @@ ep : {:.2f}
         :class:`compas_fea2.model.material.Steel`
             The precompiled steel material.
         """
+        from compas_fea2.units import UnitRegistry
+        from compas_fea2.units import units as u
+
         if not units:
             units = u(system="SI_mm")
         elif not isinstance(units, UnitRegistry):
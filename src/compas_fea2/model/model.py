@@ -20,7 +20,6 @@ from compas.geometry import Transformation
 from compas.geometry import bounding_box
 from compas.geometry import centroid_points
 from compas.geometry import centroid_points_weighted
-from pint import UnitRegistry
 
 import compas_fea2
 from compas_fea2.base import FEAData
@@ -41,6 +40,7 @@ from compas_fea2.model.parts import RigidPart
 from compas_fea2.model.parts import _Part
 from compas_fea2.model.sections import _Section
 from compas_fea2.problem import Problem
+from compas_fea2.utilities._fingerprint import Fingerprinter
 from compas_fea2.utilities._utils import get_docstring
 from compas_fea2.utilities._utils import part_method
 from compas_fea2.utilities._utils import problem_method
@@ -351,11 +351,13 @@ class Model(FEAData):
         return sum(p.volume for p in self.parts)
 
     @property
-    def units(self) -> UnitRegistry:
+    def units(self) -> "UnitRegistry":  # noqa: F821
         return self._units
 
     @units.setter
-    def units(self, value: UnitRegistry):
+    def units(self, value: "UnitRegistry"):  # noqa: F821
+        from pint import UnitRegistry
+
         if not isinstance(value, UnitRegistry):
             return ValueError("Pint UnitRegistry required")
         self._units = value
@@ -397,6 +399,22 @@ class Model(FEAData):
                 for i, element in enumerate(part.elements):
                     element._key = i + start
 
+    def fingerprint(self) -> str:
+        """Compute a content hash of the model.
+
+        The hash depends only on the data that affects the analysis (geometry,
+        connectivity, sections, materials, boundary and initial conditions,
+        constraints, connectors and interfaces). Names, keys and the order in
+        which the objects are stored do not change it.
+
+        Returns
+        -------
+        str
+            The hexadecimal digest.
+
+        """
+        return Fingerprinter().model(self).hex()
+
     # =========================================================================
     #                       Constructor methods
     # =========================================================================
@@ -417,15 +435,15 @@ class Model(FEAData):
 
         """
         with open(path, "rb") as f:
+            # disable the garbage collector while unpickling: the many objects
+            # created would trigger collections that find (almost) nothing
+            gc.disable()
             try:
-                # disable garbage collector
-                gc.disable()
                 model = pickle.load(f)
-                # enable garbage collector again
-                gc.enable()
             except Exception:
-                gc.enable()
                 raise RuntimeError("Model not created!")
+            finally:
+                gc.enable()
         model.path = os.sep.join(os.path.split(path)[0].split(os.sep)[:-1])
         # check if the problems' results are stored in the same location
         for problem in model.problems:
@@ -8,6 +8,7 @@ from compas.tolerance import TOL
 
 import compas_fea2
 from compas_fea2.base import FEAData
+from compas_fea2.utilities._fingerprint import invalidate_fingerprint
 
 
 class Node(FEAData):
@@ -75,6 +76,8 @@ class Node(FEAData):
 
     """
 
+    _weak_registration = True
+
     def __init__(self, xyz: List[float], mass: Optional[float] = None, temperature: Optional[float] = None, **kwargs):
         super().__init__(**kwargs)
         self._key = None
@@ -181,6 +184,7 @@ class Node(FEAData):
         self._x = value[0]
         self._y = value[1]
         self._z = value[2]
+        invalidate_fingerprint(self)
 
     @property
     def x(self) -> float:
@@ -189,6 +193,7 @@ class Node(FEAData):
     @x.setter
     def x(self, value: float):
         self._x = float(value)
+        invalidate_fingerprint(self)
 
     @property
     def y(self) -> float:
@@ -197,6 +202,7 @@ class Node(FEAData):
     @y.setter
     def y(self, value: float):
         self._y = float(value)
+        invalidate_fingerprint(self)
 
     @property
     def z(self) -> float:
@@ -205,6 +211,7 @@ class Node(FEAData):
     @z.setter
     def z(self, value: float):
         self._z = float(value)
+        invalidate_fingerprint(self)
 
     @property
     def mass(self) -> List[float]:
@@ -213,6 +220,7 @@ class Node(FEAData):
     @mass.setter
     def mass(self, value: float):
         self._mass = value if isinstance(value, list) else list([value] * 6)
+        invalidate_fingerprint(self)
 
     @property
     def temperature(self) -> float:
@@ -221,6 +229,7 @@ class Node(FEAData):
     @temperature.setter
     def temperature(self, value: float):
         self._temperature = value
+        invalidate_fingerprint(self)
 
     @property
     def gkey(self) -> str:
@@ -255,8 +264,21 @@ class Node(FEAData):
 
     @property
     def connected_elements(self) -> List:
+        if self._connected_elements is None:
+            # not pickled, see __getstate__
+            if self.part is not None:
+                self.part._connect_nodes()
+            else:
+                self._connected_elements = set()
         return self._connected_elements
 
+    def __getstate__(self):
+        # the connected elements are rebuilt from the part when needed: pickling
+        # them would walk the whole mesh recursively, from node to element to node
+        state = dict(super().__getstate__())
+        state["_connected_elements"] = None
+        return state
+
     # @property
     # def loads(self) -> Dict:
     #     problems = self.model.problems
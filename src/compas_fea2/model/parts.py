@@ -10,8 +10,6 @@ from typing import Tuple
 from typing import Union
 
 import compas
-import matplotlib.pyplot as plt
-import networkx as nx
 import numpy as np
 from compas.datastructures import Mesh
 from compas.geometry import Box
@@ -28,10 +26,11 @@ from compas.geometry import is_point_in_polygon_xy
 from compas.geometry import is_point_on_plane
 from compas.tolerance import TOL
 from compas.topology import connected_components
-from scipy.spatial import KDTree
 
 import compas_fea2
 from compas_fea2.base import FEAData
+from compas_fea2.utilities._fingerprint import Fingerprinter
+from compas_fea2.utilities._fingerprint import invalidate_fingerprint
 
 from .elements import BeamElement
 from .elements import HexahedronElement
@@ -98,11 +97,13 @@ class _Part(FEAData):
 
     """
 
+    _weak_registration = True
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self._ndm = None
         self._ndf = None
-        self._graph = nx.DiGraph()
+        self._graph = None
         self._nodes: Set[Node] = set()
         self._gkey_node: Dict[str, Node] = {}
         self._sections: Set[_Section] = set()
@@ -225,8 +226,29 @@ class _Part(FEAData):
 
     @property
     def graph(self):
+        """Element-node graph of the part, built on first access."""
+        if self._graph is None:
+            import networkx as nx
+
+            self._graph = nx.DiGraph()
+            for element in sorted(self._elements, key=lambda e: e._part_key):
+                self._add_to_graph(element)
         return self._graph
 
+    def _connect_nodes(self):
+        # rebuild the connected elements of the nodes, see Node.connected_elements
+        for node in self._nodes:
+            node._connected_elements = set()
+        for element in self._elements:
+            for node in element.nodes:
+                node._connected_elements.add(element)
+
+    def _add_to_graph(self, element):
+        self._graph.add_node(element, type="element")
+        for node in element.nodes:
+            self._graph.add_node(node, type="node")
+            self._graph.add_edge(element, node, relation="connects")
+
     @property
     def nodes(self) -> NodesGroup:
         return NodesGroup(self._nodes)
@@ -610,6 +632,18 @@ class _Part(FEAData):
     def groups(self) -> Set[_Group]:
         return self._groups
 
+    def fingerprint(self) -> str:
+        """Compute a content hash of the nodes, elements, sections and materials
+        of the part.
+
+        Returns
+        -------
+        str
+            The hexadecimal digest.
+
+        """
+        return Fingerprinter().part(self).hex()
+
     def transform(self, transformation: Transformation) -> None:
         """Transform the part.
 
@@ -1340,6 +1374,8 @@ class _Part(FEAData):
             A list of the closest nodes, or a dictionary with nodes
             and distances if report=True.
         """
+        from scipy.spatial import KDTree
+
         if number_of_nodes > len(self.nodes):
             if compas_fea2.VERBOSE:
                 print(f"The number of nodes to find exceeds the available nodes. Capped to {len(self.nodes)}")
@@ -1475,6 +1511,7 @@ class _Part(FEAData):
             self._nodes.add(node)
             self._gkey_node[node.gkey] = node
             node._registration = self
+            invalidate_fingerprint(self)
             if compas_fea2.VERBOSE:
                 print("Node {!r} registered to {!r}.".format(node, self))
         return node
@@ -1519,6 +1556,7 @@ class _Part(FEAData):
             self.nodes.remove(node)
             self._gkey_node.pop(node.gkey)
             node._registration = None
+            invalidate_fingerprint(self)
             if compas_fea2.VERBOSE:
                 print(f"Node {node!r} removed from {self!r}.")
 
@@ -1588,6 +1626,9 @@ class _Part(FEAData):
 
     def visualize_node_connectivity(self):
         """Visualizes nodes with color coding based on connectivity."""
+        import matplotlib.pyplot as plt
+        import networkx as nx
+
         degrees = {node: self.graph.degree(node) for node in self.graph.nodes}
         pos = nx.spring_layout(self.graph)
 
@@ -1732,11 +1773,10 @@ class _Part(FEAData):
         element._part_key = len(self.elements)
         self._elements.add(element)
         element._registration = self
+        invalidate_fingerprint(self)
 
-        self.graph.add_node(element, type="element")
-        for node in element.nodes:
-            self.graph.add_node(node, type="node")
-            self.graph.add_edge(element, node, relation="connects")
+        if self._graph is not None:
+            self._add_to_graph(element)
 
         if compas_fea2.VERBOSE:
             print(f"Element {element!r} registered to {self!r}.")
@@ -1771,6 +1811,7 @@ class _Part(FEAData):
         if self.contains_element(element):
             self.elements.remove(element)
             element._registration = None
+            invalidate_fingerprint(self)
             for node in element.nodes:
                 node.connected_elements.remove(element)
             if compas_fea2.VERBOSE:
@@ -1,12 +1,8 @@
 from math import pi
 from math import sqrt
 
-import matplotlib.pyplot as plt
 import numpy as np
-from matplotlib.patches import Polygon as mplPolygon
-from matplotlib.path import Path
 
-from compas_fea2 import units
 from compas_fea2.base import FEAData
 from compas_fea2.model.shapes import Circle
 from compas_fea2.model.shapes import IShape
@@ -345,6 +341,8 @@ class BeamSection(_Section):
         return section(**data)
 
     def __str__(self) -> str:
+        from compas_fea2 import units
+
         return f"""
 {self.__class__.__name__}
 {"-" * len(self.__class__.__name__)}
@@ -432,6 +430,8 @@ gw  : {self.gw}
         tuple
             Grid of x-coordinates, grid of y-coordinates, grid of normal stresses, grid of shear stresses in x-direction, grid of shear stresses in y-direction.
         """
+        from matplotlib.path import Path
+
         verts = [(p.x, p.y) for p in self.shape.points]
         polygon_path = Path(verts)
         xs = [p[0] for p in verts]
@@ -531,6 +531,8 @@ gw  : {self.gw}
         show_tau : bool, optional
             Whether to display separate plots for shear stresses (\u03c4_x, \u03c4_y) (default is True).
         """
+        import matplotlib.pyplot as plt
+
         grid_x, grid_y, grid_sigma, grid_tau_x, grid_tau_y = self.compute_stress_distribution(N=N, Mx=Mx, My=My, Vx=Vx, Vy=Vy, nx=nx, ny=ny)
 
         # Plot normal stress (\u03c3)
@@ -658,6 +660,9 @@ gw  : {self.gw}
         ValueError
             If the specified line does not pass through the section.
         """
+        import matplotlib.pyplot as plt
+        from matplotlib.patches import Polygon as mplPolygon
+        from matplotlib.path import Path
 
         # Normalize the direction vector
         dx, dy = direction
@@ -8,7 +8,6 @@ from typing import List
 from typing import Optional
 from typing import Tuple
 
-import matplotlib.pyplot as plt
 import numpy as np
 from compas.datastructures import Mesh
 from compas.geometry import Frame
@@ -17,8 +16,6 @@ from compas.geometry import Polygon
 from compas.geometry import Rotation
 from compas.geometry import Transformation
 from compas.geometry import Translation
-from matplotlib.lines import Line2D
-from matplotlib.patches import Polygon as MplPolygon
 
 from compas_fea2.base import FEAData
 
@@ -354,6 +351,10 @@ class Shape(Polygon, FEAData):
         alpha: float = 0.6,
         figsize=(8, 6),
     ):
+        import matplotlib.pyplot as plt
+        from matplotlib.lines import Line2D
+        from matplotlib.patches import Polygon as MplPolygon
+
         # Use a clean style (white background, subtle grid)
         with plt.style.context("seaborn-v0_8-whitegrid"):
             fig, ax = plt.subplots(figsize=figsize)
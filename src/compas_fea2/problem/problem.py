@@ -1,15 +1,99 @@
 import os
 import shutil
+from functools import wraps
 from pathlib import Path
+from typing import Callable
 from typing import List
 from typing import Optional
 from typing import Union
 
 from compas_fea2.base import FEAData
+from compas_fea2.job.blocks import BlockCache
+from compas_fea2.job.cache import ResultsCache
 from compas_fea2.job.input_file import InputFile
+from compas_fea2.job.monitor import SolverMonitor
+from compas_fea2.job.monitor import current_monitor
+from compas_fea2.job.monitor import solver_monitor
 from compas_fea2.problem.steps import StaticStep
 from compas_fea2.problem.steps import Step
+from compas_fea2.results.cache import FieldResultsCache
 from compas_fea2.results.database import ResultsDatabase
+from compas_fea2.utilities._fingerprint import Fingerprinter
+
+
+def _analysis_options(args, kwargs):
+    """Options passed to the analysis, as part of the key of the results cache.
+
+    Returns ``None`` if an option is not a plain value (number, string, path or
+    a list or dict of them), in which case the cache is bypassed.
+    """
+
+    def plain(value):
+        if value is None or isinstance(value, (bool, int, float, str)):
+            return value
+        if isinstance(value, os.PathLike):
+            return os.fspath(value)
+        if isinstance(value, (list, tuple)):
+            return [plain(v) for v in value]
+        if isinstance(value, dict) and all(isinstance(k, str) for k in value):
+            return {k: plain(v) for k, v in value.items()}
+        raise TypeError(type(value).__name__)
+
+    try:
+        options = {name: plain(value) for name, value in kwargs.items()}
+        if args:
+            options["*args"] = plain(args)
+    except TypeError:
+        return None
+    return options
+
+
+def _cached_analysis(func):
+    """Skip the analysis if the results of the problem are in its cache.
+
+    The options passed to the analysis are part of the key of the cache entry.
+    """
+
+    @wraps(func)
+    def wrapper(self, path=None, erase_data=False, *args, **kwargs):
+        options = _analysis_options(args, kwargs)
+        if not self.cache or self._cache_running or options is None:
+            return func(self, path, erase_data, *args, **kwargs)
+        fingerprinter = Fingerprinter()
+        if self.cache.restore(self, path=path, erase_data=erase_data, fingerprinter=fingerprinter, options=options):
+            return None
+        self._cache_running = True
+        try:
+            result = func(self, path, erase_data, *args, **kwargs)
+        finally:
+            self._cache_running = False
+        self.cache.store(self, fingerprinter=fingerprinter, options=options)
+        return result
+
+    return wrapper
+
+
+def _monitored_analysis(func):
+    """Feed the output of the solver to a :class:`compas_fea2.job.SolverMonitor`."""
+
+    @wraps(func)
+    def wrapper(self, path=None, erase_data=False, *args, **kwargs):
+        outer = current_monitor()
+        parser = self.log_parser or (outer.parser if outer else None)
+        # nested analyses (e.g. analyse called by analyse_and_extract) share the monitor
+        if self._monitor is not None or (parser is None and outer is None):
+            return func(self, path, erase_data, *args, **kwargs)
+        monitor = SolverMonitor(parser, callbacks=[outer.emit] if outer else None)
+        self._monitor = monitor
+        try:
+            with solver_monitor(monitor):
+                return func(self, path, erase_data, *args, **kwargs)
+        finally:
+            monitor.close()
+            self._monitor = None
+            self.solver_summary = monitor.summary()
+
+    return wrapper
 
 
 class Problem(FEAData):
@@ -43,6 +127,25 @@ class Problem(FEAData):
         Path to the SQLite database where the results are stored.
     results : :class:`compas_fea2.results.Results`
         Results object with the analyisis results.
+    cache : :class:`compas_fea2.job.ResultsCache`
+        Optional cache of the analysis results, by default ``None``. When set,
+        ``analyse`` and ``analyse_and_extract`` restore the results of a previous
+        analysis of an identical problem instead of running the solver.
+    block_cache : bool | :class:`compas_fea2.job.BlockCache`
+        Optional cache of the blocks of the input file, by default ``None``. If
+        ``True``, the blocks are stored next to the folder of the problem, so
+        that the problems of the same model share them.
+    results_cache : :class:`compas_fea2.results.FieldResultsCache`
+        In-memory cache of the field results, with a memory budget of 256 MiB
+        by default. It can be set to a :class:`compas_fea2.results.FieldResultsCache`,
+        to a memory budget in bytes, or to ``None`` to disable it.
+    log_parser : :class:`compas_fea2.job.LogParser`
+        Rules turning the output of the solver into events, usually set by the
+        backend. When set, the events of each analysis are written to
+        ``<name>-events.jsonl`` in the folder of the problem.
+    solver_summary : dict
+        Summary of the events of the last analysis, see
+        :meth:`compas_fea2.job.SolverMonitor.summary`.
 
     Notes
     -----
@@ -64,6 +167,16 @@ class Problem(FEAData):
 
     """
 
+    _weak_registration = True
+    log_parser = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # backend implementations of the analysis go through the results cache and the solver monitor
+        for name in ("analyse", "analyse_and_extract"):
+            if name in cls.__dict__:
+                setattr(cls, name, _cached_analysis(_monitored_analysis(cls.__dict__[name])))
+
     def __init__(self, description: Optional[str] = None, **kwargs):
         super(Problem, self).__init__(**kwargs)
         self.description = description
@@ -72,6 +185,12 @@ class Problem(FEAData):
         self._steps = set()
         self._steps_order = []  # TODO make steps a list
         self._rdb = None
+        self._results_cache = FieldResultsCache()
+        self._cache = None
+        self._block_cache = None
+        self._cache_running = False
+        self._monitor = None
+        self.solver_summary = None
 
     @property
     def model(self) -> "Model":  # noqa: F821
@@ -96,13 +215,50 @@ class Problem(FEAData):
 
     @property
     def rdb(self) -> ResultsDatabase:
-        return self._rdb or ResultsDatabase.sqlite(self)
+        if self._rdb is None:
+            self._rdb = ResultsDatabase.sqlite(self)
+        return self._rdb
 
     @rdb.setter
     def rdb(self, value: str):
         if not hasattr(ResultsDatabase, value):
             raise ValueError("Invalid ResultsDatabase option")
+        if self._rdb is not None:
+            self._rdb.close()
         self._rdb = getattr(ResultsDatabase, value)(self)
+        if self._results_cache is not None:
+            self._results_cache.clear()
+
+    @property
+    def results_cache(self) -> Optional[FieldResultsCache]:
+        """In-memory cache of the field results queried from the results database."""
+        return self._results_cache
+
+    @results_cache.setter
+    def results_cache(self, value: Optional[Union[FieldResultsCache, int]]):
+        if isinstance(value, int):
+            value = FieldResultsCache(max_bytes=value)
+        self._results_cache = value
+
+    @property
+    def cache(self) -> Optional[ResultsCache]:
+        return self._cache
+
+    @cache.setter
+    def cache(self, value: Optional[Union[ResultsCache, str, Path]]):
+        if value is not None and not isinstance(value, ResultsCache):
+            value = ResultsCache(value)
+        self._cache = value
+
+    @property
+    def block_cache(self) -> Optional[Union[BlockCache, bool]]:
+        return self._block_cache
+
+    @block_cache.setter
+    def block_cache(self, value: Optional[Union[BlockCache, bool, str, Path]]):
+        if isinstance(value, (str, Path)):
+            value = BlockCache(value)
+        self._block_cache = value
 
     @property
     def steps_order(self) -> List[Step]:
@@ -314,10 +470,25 @@ Analysis folder path : {self.path or "N/A"}
         print(summary)
         return summary
 
+    def fingerprint(self) -> str:
+        """Compute a content hash of the problem and of its model.
+
+        The hash combines the fingerprint of the model with the fingerprint of
+        each step, in order of application. It can be used as a cache key for
+        input files and results.
+
+        Returns
+        -------
+        str
+            The hexadecimal digest.
+
+        """
+        return Fingerprinter().problem(self).hex()
+
     # =========================================================================
     #                         Analysis methods
     # =========================================================================
-    def write_input_file(self, path: Optional[Union[Path, str]] = None) -> InputFile:
+    def write_input_file(self, path: Optional[Union[Path, str]] = None, compress: bool = False, progress: Optional[Callable] = None) -> str:
         """Writes the input file.
 
         Parameters
@@ -325,18 +496,23 @@ Analysis folder path : {self.path or "N/A"}
         path : :class:`pathlib.Path`
             Path to the folder where the input file is saved. In case the folder
             does not exist, one is created.
+        compress : bool, optional
+            If ``True``, write a gzip compressed input file, by default ``False``.
+        progress : callable, optional
+            Function called after each block of the input file is written, see
+            :meth:`compas_fea2.job.InputFile.write_to_file`.
 
         Returns
         -------
-        :class:`compas_fea2.job.InputFile`
-            The InputFile objects that generates the input file.
+        str
+            The path to the input file.
         """
         path = path or self.path
         if not isinstance(path, Path):
             path = Path(path)
         if not path.exists():
             path.mkdir(parents=True)
-        return self.input_file.write_to_file(path)
+        return self.input_file.write_to_file(path, compress=compress, progress=progress)
 
     def _check_analysis_path(self, path: Path, erase_data: bool = False) -> Path:
         """Check and prepare the analysis path, ensuring the correct folder structure.
@@ -370,6 +546,10 @@ Analysis folder path : {self.path or "N/A"}
         if not isinstance(path, Path):
             path = Path(path)
 
+        # the results database may be deleted or replaced
+        if self._rdb is not None:
+            self._rdb.close()
+
         # Prepare the main and analysis paths
         self.model.path = path
         self.path = self.model.path.joinpath(self.name)
@@ -407,6 +587,8 @@ Analysis folder path : {self.path or "N/A"}
             # Create the directory if it does not exist
             self.path.mkdir(parents=True, exist_ok=True)
 
+        if self._monitor is not None:
+            self._monitor.open_log(self.path.joinpath("{}-events.jsonl".format(self.name)))
         return self.path
 
     def analyse(self, path: Optional[Union[Path, str]] = None, erase_data: bool = False, *args, **kwargs):
@@ -72,9 +72,8 @@ class ModalAnalysis(_Perturbation):
 
         # Get the eiginvectors
         all_columns = ["step", "part", "key", "x", "y", "z", "xx", "yy", "zz"]
-        results_set = self.rdb.get_rows("eigenvectors", ["step", "part", "key", "x", "y", "z", "xx", "yy", "zz"], filters)
-        results_set = [{k: v for k, v in zip(all_columns, row)} for row in results_set]
-        eigenvector = self.rdb.to_result(results_set, "find_node_by_key", "u")[self]
+        results_set = self.rdb.get_rows("eigenvectors", all_columns, filters)
+        eigenvector = self.rdb.to_result(results_set, "find_node_by_key", "u", columns=all_columns)[self]
 
         return eigenvalue, eigenvector
 
@@ -14,6 +14,7 @@ from compas_fea2.results import DisplacementFieldResults
 from compas_fea2.results import ReactionFieldResults
 from compas_fea2.results import SectionForcesFieldResults
 from compas_fea2.results import StressFieldResults
+from compas_fea2.utilities._fingerprint import Fingerprinter
 
 # ==============================================================================
 #                                Base Steps
@@ -53,6 +54,8 @@ class Step(FEAData):
     Developer-only class.
     """
 
+    _weak_registration = True
+
     def __init__(self, replace=False, **kwargs):
         super(Step, self).__init__(**kwargs)
         self.replace = replace
@@ -174,6 +177,17 @@ class Step(FEAData):
         for output in outputs:
             self.add_output(output)
 
+    def fingerprint(self):
+        """Compute a content hash of the step settings, loads and outputs.
+
+        Returns
+        -------
+        str
+            The hexadecimal digest.
+
+        """
+        return Fingerprinter().step(self).hex()
+
     # ==========================================================================
     #                             Results methods
     # ==========================================================================
@@ -20,6 +20,12 @@ from .fields import (
     ContactForcesFieldResults,
 )
 
+from .cache import FieldResultsCache
+from .federation import (
+    ResultsFederation,
+    FederatedFieldResults,
+)
+
 from .modal import (
     ModalAnalysisResult,
     ModalShape,
@@ -43,6 +49,9 @@ __all__ = [
     "StressFieldResults",
     "ContactForcesFieldResults",
     "SectionForcesFieldResults",
+    "FieldResultsCache",
+    "ResultsFederation",
+    "FederatedFieldResults",
     "ModalAnalysisResult",
     "ModalShape",
 ]
@@ -0,0 +1,189 @@
+import os
+import threading
+from collections import OrderedDict
+
+
+class FieldResultsCache:
+    """In-memory LRU cache of the field results of a problem.
+
+    The entries are the arrays and the result objects queried by
+    :class:`compas_fea2.results.FieldResults`, keyed by step, field, columns
+    and filters, so that the properties and methods of a field (e.g.
+    ``locations``, ``vectors`` and ``compute_resultant``) query the database
+    only once. When the total size of the entries exceeds the memory budget,
+    the least recently used entries are evicted.
+
+    The cache is cleared when the results database changes on disk (size,
+    modification time or inode of the database file and of its write-ahead
+    log, or of the headers of a folder store), e.g. after a new analysis.
+
+    Parameters
+    ----------
+    max_bytes : int, optional
+        Memory budget in bytes, by default 256 MiB. Entries larger than the
+        budget are not stored.
+
+    Attributes
+    ----------
+    hits, misses, evictions : int
+        Counters of the cache, see :meth:`info`.
+
+    Examples
+    --------
+    >>> problem.results_cache = FieldResultsCache(max_bytes=1024**3)  # doctest: +SKIP
+    >>> problem.results_cache.info()  # doctest: +SKIP
+    {'entries': 3, 'size': 4800, 'max_bytes': 1073741824, 'hits': 7, 'misses': 3, 'evictions': 0}
+
+    """
+
+    # approximate memory of a Result object with its attributes
+    RESULT_SIZE = 512
+
+    def __init__(self, max_bytes=256 * 1024**2):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._size = 0
+        self._signature = None
+        self._lock = threading.RLock()
+
+    def __repr__(self):
+        return "{}(max_bytes={})".format(self.__class__.__name__, self.max_bytes)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __getstate__(self):
+        # the entries are not copied with the problem
+        return {"max_bytes": self.max_bytes}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    @property
+    def size(self):
+        """Estimated size of the entries in bytes."""
+        return self._size
+
+    def info(self):
+        """Number of entries, size, budget and counters of the cache.
+
+        Returns
+        -------
+        dict
+
+        """
+        return {"entries": len(self._entries), "size": self._size, "max_bytes": self.max_bytes, "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+    # =========================================================================
+    #                           Entries
+    # =========================================================================
+
+    def validate(self, path):
+        """Clear the cache if the results database changed since the last call.
+
+        Parameters
+        ----------
+        path : str | :class:`pathlib.Path`
+            The results database.
+
+        """
+        signature = _signature(path)
+        with self._lock:
+            if signature != self._signature:
+                self._clear()
+                self._signature = signature
+
+    def get(self, key, default=None):
+        """Get an entry and mark it as the most recently used."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value, nbytes):
+        """Add an entry, evicting the least recently used ones if needed.
+
+        Parameters
+        ----------
+        key : hashable
+            The key of the entry.
+        value : object
+            The entry.
+        nbytes : int
+            Estimated size of the entry in bytes.
+
+        """
+        with self._lock:
+            if key in self._entries:
+                self._size -= self._entries.pop(key)[1]
+            if self.max_bytes is not None and nbytes > self.max_bytes:
+                return
+            self._entries[key] = (value, nbytes)
+            self._size += nbytes
+            while self.max_bytes is not None and self._size > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._size -= evicted
+                self.evictions += 1
+
+    def get_or_compute(self, path, key, compute, nbytes):
+        """Get an entry, computing and storing it if it is missing or if the
+        results database changed.
+
+        Parameters
+        ----------
+        path : str | :class:`pathlib.Path`
+            The results database.
+        key : hashable
+            The key of the entry.
+        compute : callable
+            Function without arguments computing the entry.
+        nbytes : callable
+            Function returning the estimated size in bytes of an entry.
+
+        Returns
+        -------
+        object
+
+        """
+        self.validate(path)
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value, nbytes(value))
+        return value
+
+    def clear(self):
+        """Remove all the entries. The counters are not reset."""
+        with self._lock:
+            self._clear()
+            self._signature = None
+
+    def _clear(self):
+        self._entries.clear()
+        self._size = 0
+
+
+def _signature(path):
+    signature = []
+    files = [str(path), "{}-wal".format(path)]
+    if path and os.path.isdir(path):
+        # the headers of the fields of a MemmapResultsDatabase are replaced after each write
+        files = sorted(os.path.join(root, name) for root, _, names in os.walk(path) for name in names if name.endswith(".json"))
+    for file in files:
+        try:
+            stat = os.stat(file)
+        except (OSError, TypeError):
+            signature.append(None)
+        else:
+            signature.append((stat.st_ino, stat.st_size, stat.st_mtime_ns))
+    return tuple(signature)
@@ -1,7 +1,15 @@
+import ast
 import json
+import math
+import os
+import shutil
 import sqlite3
+import threading
+import uuid
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
 
-import h5py
 import numpy as np
 
 from compas_fea2.base import FEAData
@@ -20,6 +28,115 @@ class ResultsDatabase(FEAData):
     def model(self):
         return self.problem.model
 
+    def close(self):
+        """Release the resources held by the database, if any."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    # members found by the results functions, see `to_result`
+    MEMBERS = {"find_node_by_key": "nodes", "find_element_by_key": "elements"}
+
+    def to_result(self, results_set, results_func, field_name, columns=None):
+        """
+        Convert a set of results in the database to the appropriate
+        result object.
+
+        The steps are resolved once per name and the members through a
+        key-to-member map of each part, built once per call, instead of
+        searching the whole model for each row.
+
+        Parameters
+        ----------
+        results_set : list of dict | list of tuples
+            The set of results retrieved from the database, as dictionaries,
+            or as rows if `columns` is given.
+        results_func : str
+            The function to call on the model to get the member.
+        field_name : str
+            The name of the field, used to get the result class of the member.
+        columns : list of str, optional
+            The names of the columns of the rows. They must include ``"step"``
+            and ``"key"``.
+
+        Returns
+        -------
+        dict
+            Dictionary grouping the results per Step.
+        """
+        if columns is None:
+            rows = ((r.pop("step"), r.pop("part", None), r.pop("key"), r) for r in results_set)
+        else:
+            columns = list(columns)
+            i_step, i_key = columns.index("step"), columns.index("key")
+            i_part = columns.index("part") if "part" in columns else None
+            value_columns = [(i, c) for i, c in enumerate(columns) if c not in ("step", "part", "key")]
+            rows = ((row[i_step], row[i_part] if i_part is not None else None, row[i_key], {c: row[i] for i, c in value_columns}) for row in results_set)
+
+        results = {}
+        steps = {}
+        lookups = {}
+        classes = {}
+        attr = self.MEMBERS.get(results_func)
+        parts = {part.name: part for part in self.model.parts} if attr else {}
+        for step_name, part_name, key, values in rows:
+            step = steps.get(step_name)
+            if step is None:
+                step = steps[step_name] = self.problem.find_step_by_name(step_name)
+                results.setdefault(step, [])
+
+            m = None
+            if attr:
+                lookup = lookups.get(part_name)
+                if lookup is None:
+                    lookup = lookups[part_name] = self._members_lookup(parts.get(part_name), attr)
+                m = lookup.get(key)
+            else:
+                found = getattr(self.model, results_func)(key)
+                m = found[0] if found else None
+            if not m:
+                raise ValueError(f"Member not in {self.model}")
+
+            cls = classes.get(type(m))
+            if cls is None:
+                cls = classes[type(m)] = m.results_cls[field_name]
+            results[step].append(cls(m, **values))
+        return results
+
+    def _members_lookup(self, part, attr):
+        # without a known part, the keys are searched in all the parts, in order
+        parts = [part] if part is not None else self.model.parts
+        lookup = {}
+        for p in parts:
+            for member in getattr(p, attr):
+                lookup.setdefault(member.key, member)
+        return lookup
+
+    def part_key_column(self, parts, table=None):
+        """Column of the keys of the parts of the results, for the queries of
+        :meth:`get_rows`, :meth:`iter_rows` and :meth:`aggregate`.
+
+        Parameters
+        ----------
+        parts : list[:class:`compas_fea2.model.Part`]
+            The parts of the model.
+        table : str, optional
+            Name or alias of the table of the ``part`` column, for queries
+            joining several tables.
+
+        Returns
+        -------
+        str
+            An expression with the key of the part of each result, or -1 for
+            the parts not in `parts`.
+        """
+        column = "{}.part".format(table) if table else "part"
+        cases = " ".join("WHEN '{}' THEN {}".format(part.name.replace("'", "''"), part.key) for part in parts)
+        return "CASE {} {} ELSE -1 END".format(column, cases) if cases else "-1"
+
     @classmethod
     def sqlite(cls, problem, **kwargs):
         return SQLiteResultsDatabase(problem, **kwargs)
@@ -28,6 +145,10 @@ class ResultsDatabase(FEAData):
     def hdf5(cls, problem, **kwargs):
         return HDF5ResultsDatabase(problem, **kwargs)
 
+    @classmethod
+    def memmap(cls, problem, **kwargs):
+        return MemmapResultsDatabase(problem, **kwargs)
+
     @classmethod
     def json(cls, problem, **kwargs):
         return JSONResultsDatabase(problem, **kwargs)
@@ -44,92 +165,843 @@ class JSONResultsDatabase(ResultsDatabase):
         return data[field]
 
 
-class HDF5ResultsDatabase(ResultsDatabase):
-    """HDF5 wrapper class to store and access FEA results."""
+class _ColumnarResultsDatabase(ResultsDatabase):
+    """Base class of the results databases storing each field of each step as
+    arrays, with the query interface of :class:`SQLiteResultsDatabase`.
+
+    The results of a step are three arrays: the components, of shape (number
+    of results, number of components), the key of the member and the index
+    of the part of each result. Subclasses implement the storage with
+    :meth:`_field` and :meth:`_writer`.
+
+    The queries accept the columns ``key``, ``step`` and ``part``, the
+    components, the column of :meth:`part_key_column` and arithmetic
+    expressions of the components with ``sqrt`` and ``abs`` (e.g. the
+    :attr:`compas_fea2.results.FieldResults.sql_expressions`), which are
+    evaluated with NumPy. The expressions may only contain numbers,
+    components, ``+ - * / **``, unary signs and calls to ``sqrt`` and
+    ``abs``: any other expression raises a ``ValueError``.
+
+    Attributes
+    ----------
+    CHUNK_SIZE : int
+        Default number of rows read or written at once.
+    AGGREGATES : tuple
+        The aggregations of :meth:`aggregate`.
+
+    """
+
+    CHUNK_SIZE = 65536
+    AGGREGATES = ("max", "min", "sum", "mean", "count")
+    PART_KEY = "part_key"
+    EXTENSION = None
 
     def __init__(self, problem, **kwargs):
         super().__init__(problem, **kwargs)
+        self._db_path = None
+        self._part_keys = {}
 
-    def save_to_hdf5(self, key, data):
-        """Save data to the HDF5 database."""
-        with h5py.File(self.db_path, "a") as hdf5_file:
-            group = hdf5_file.require_group(key)
-            for k, v in data.items():
-                if isinstance(v, (int, float, np.ndarray)):
-                    group.create_dataset(k, data=np.array(v))
-                elif isinstance(v, list) and all(isinstance(i, (int, float)) for i in v):
-                    group.create_dataset(k, data=np.array(v, dtype="f8"))
-                elif isinstance(v, list) and all(isinstance(i, FEAData) for i in v):
-                    # sub_group = group.require_group(k)
-                    for i, obj in enumerate(v):
-                        obj.save_to_hdf5(self.db_path, f"{key}/{k}/element_{i}")
-                elif isinstance(v, dict):
-                    group.attrs[k] = json.dumps(v)
-                elif isinstance(v, str):
-                    group.attrs[k] = v
-                else:
-                    print(f"Warning: Skipping {k} (Unsupported type {type(v)})")
-
-    def load_from_hdf5(self, key):
-        """Load data from the HDF5 database."""
-        data = {}
-        with h5py.File(self.db_path, "r") as hdf5_file:
-            if key not in hdf5_file:
-                raise KeyError(f"Key '{key}' not found in HDF5 database.")
-            group = hdf5_file[key]
-            for k in group.keys():
-                if k.startswith("element_"):
-                    data.setdefault("elements", {})[int(k.split("_")[-1])] = self.load_from_hdf5(f"{key}/{k}")
-                else:
-                    dataset = group[k][:]
-                    data[k] = dataset.tolist() if dataset.shape != () else dataset.item()
-            for k, v in group.attrs.items():
-                if isinstance(v, str) and (v.startswith("[") or v.startswith("{")):
-                    try:
-                        data[k] = json.loads(v)
-                    except json.JSONDecodeError:
-                        data[k] = v
+    @classmethod
+    def from_path(cls, path):
+        """Open a results database without its problem (e.g. for maintenance).
+
+        Parameters
+        ----------
+        path : str | :class:`pathlib.Path`
+            Path to the database.
+
+        Returns
+        -------
+        :class:`_ColumnarResultsDatabase`
+        """
+        database = cls(None)
+        database._db_path = str(path)
+        return database
+
+    @property
+    def db_uri(self):
+        if self._db_path:
+            return self._db_path
+        return os.path.splitext(self.problem.path_db)[0] + self.EXTENSION if self.problem.path_db else None
+
+    def part_key_column(self, parts, table=None):
+        self._part_keys = {part.name: part.key for part in parts}
+        return self.PART_KEY
+
+    def _field(self, table_name):
+        """Context manager giving the :class:`_FieldArrays` of a field."""
+        raise NotImplementedError
+
+    def _writer(self, table_name, components, parts, steps):
+        """Context manager giving a function ``append(step, keys, parts, values)``
+        storing a batch of results of a step."""
+        raise NotImplementedError
+
+    # =========================================================================
+    #                       Query methods
+    # =========================================================================
+
+    @property
+    def fields(self):
+        return self.table_names
+
+    def column_names(self, table_name):
+        """
+        Get the names of all columns in a given field.
+
+        Parameters
+        ----------
+        table_name : str
+            The name of the field.
+
+        Returns
+        -------
+        list
+            ``key``, ``step``, ``part`` and the names of the components.
+        """
+        with self._field(table_name) as field:
+            return ["key", "step", "part"] + field.components
+
+    def _blocks(self, table_name, filters=None, size=None):
+        # slices of the arrays of the steps, with the rows matching the filters
+        filters = dict(filters or {})
+        steps = filters.pop("step", None)
+        size = size or self.CHUNK_SIZE
+        with self._field(table_name) as field:
+            part_filter = None
+            if "part" in filters:
+                names = set(filters.pop("part"))
+                part_filter = [i for i, name in enumerate(field.parts) if name in names]
+            for step in field.steps:
+                if steps is not None and step.name not in steps:
+                    continue
+                for start, stop in step.ranges(part_filter):
+                    for begin in range(start, stop, size):
+                        end = min(begin + size, stop)
+                        block = _ColumnsBlock(step.name, step.keys[begin:end], step.codes[begin:end], step.values[begin:end], field.components, field.parts, self._part_keys)
+                        mask = np.ones(len(block), dtype=bool)
+                        if part_filter is not None:
+                            mask &= np.isin(block.codes, part_filter)
+                        for column, values in filters.items():
+                            mask &= np.isin(block.column(column), list(values))
+                        if mask.any():
+                            yield block.take(mask)
+
+    def get_table(self, table_name):
+        """
+        Get a field from the database.
+
+        Parameters
+        ----------
+        table_name : str
+            The name of the field.
+
+        Returns
+        -------
+        list of tuples
+            The key, step, part and components of each result.
+        """
+        return self.get_rows(table_name, self.column_names(table_name), {})
+
+    def iter_table(self, table_name, size=None):
+        """
+        Iterate over a field in chunks, as structured arrays.
+
+        Parameters
+        ----------
+        table_name : str
+            The name of the field.
+        size : int, optional
+            The maximum number of rows of each chunk, by default :attr:`CHUNK_SIZE`.
+
+        Yields
+        ------
+        :class:`numpy.ndarray`
+            Structured array with the fields ``key`` (``int64``), ``step`` and
+            ``part`` (objects) and a ``float64`` field per component.
+        """
+        columns = self.column_names(table_name)
+        dtype = [("key", np.int64), ("step", object), ("part", object)] + [(c, np.float64) for c in columns[3:]]
+        for block in self._blocks(table_name, size=size):
+            array = np.empty(len(block), dtype=dtype)
+            for c in columns:
+                array[c] = block.column(c)
+            yield array
+
+    def iter_rows(self, table_name, columns_names, filters=None, size=None, dtype=float):
+        """
+        Iterate over the results of a field that match the filtering
+        criteria, in chunks, as arrays.
+
+        Parameters
+        ----------
+        table_name : str
+            The name of the field.
+        columns_names : list
+            Name of each column to retrieve, or expressions of the components.
+        filters : dict, optional
+            Filtering criteria as {"column_name":[admissible values]}.
+        size : int, optional
+            The maximum number of rows of each chunk, by default :attr:`CHUNK_SIZE`.
+        dtype : data-type, optional
+            The type of the arrays, by default ``float``.
+
+        Yields
+        ------
+        :class:`numpy.ndarray`
+            Array of shape (n, len(columns_names)) for each chunk.
+        """
+        for block in self._blocks(table_name, filters, size):
+            yield np.column_stack([block.column(c).astype(dtype) for c in columns_names]) if columns_names else np.empty((len(block), 0), dtype=dtype)
+
+    def get_rows(self, table_name, columns_names, filters, func=None):
+        """
+        Get all the rows in a given field that match the filtering criteria
+        and return the values for each column.
+
+        Parameters
+        ----------
+        table_name : str
+            The name of the field.
+        columns_names : list
+            Name of each column to retrieve. The results are output in the same
+            order.
+        filters : dict
+            Filtering criteria as {"column_name":[admissible values]}
+        func : list, optional
+            ``["DESC", column]`` or ``["ASC", column]`` to get only the row
+            with the maximum or minimum value of a column or expression.
+
+        Returns
+        -------
+        list of tuples
+            List with each row as a tuple.
+        """
+        rows = []
+        best = None
+        for block in self._blocks(table_name, filters):
+            if func:
+                values = block.column(func[1]).astype(float)
+                if np.isnan(values).all():
+                    continue
+                i = int(np.nanargmax(values) if func[0].upper() == "DESC" else np.nanargmin(values))
+                if best is None or (values[i] > best[0] if func[0].upper() == "DESC" else values[i] < best[0]):
+                    best = (values[i], block.take(np.arange(len(block)) == i))
+                continue
+            rows.extend(zip(*[block.column(c).tolist() for c in columns_names]))
+        if best is not None:
+            rows = list(zip(*[best[1].column(c).tolist() for c in columns_names]))
+        return rows
+
+    def get_column_values(self, table_name, column_name):
+        """
+        Get all the values in a given column from a field.
+
+        Parameters
+        ----------
+        table_name : str
+            The name of the field.
+        column_name : str
+            The name of the column.
+
+        Returns
+        -------
+        list
+            A list of values from the specified column.
+        """
+        return self.get_rows(table_name, [column_name], {})
+
+    def get_column_unique_values(self, table_name, column_name):
+        """
+        Get all the unique values in a given column from a field.
+
+        Parameters
+        ----------
+        table_name : str
+            The name of the field.
+        column_name : str
+            The name of the column.
+
+        Returns
+        -------
+        set
+            The unique column values.
+        """
+        return set(self.get_column_values(table_name, column_name))
+
+    def aggregate(self, table_name, expression, functions=("max", "min", "sum", "mean"), filters=None, group_by=None, groups=None):
+        """
+        Aggregate a column, or an expression of the components, of a field.
+
+        See :meth:`SQLiteResultsDatabase.aggregate`. The aggregations are
+        computed with NumPy while the blocks of rows are read: only the count,
+        sum, maximum and minimum of each group in each block are kept, and
+        they are combined at the end.
+        """
+        unknown = [f for f in functions if f not in self.AGGREGATES]
+        if unknown:
+            raise ValueError("Unknown aggregations {}. Choose from {}.".format(unknown, list(self.AGGREGATES)))
+        group_by = list(group_by or [])
+        members = None
+        if groups is not None:
+            # the (part, key) pairs of the members are encoded as a single integer
+            with self._field(table_name) as field:
+                codes = {name: i for i, name in enumerate(field.parts)}
+            members = [np.array([codes[part] << 32 | key for part, key in group if part in codes], dtype=np.int64) for group in groups]
+            group_by = [None] + group_by
+
+        # the parts and steps are grouped by index and decoded at the end
+        labels = {"part": [], "step": {}}
+        blocks_labels, blocks_partials = [], []
+        for block in self._blocks(table_name, filters):
+            labels["part"] = block.parts
+            values = block.column(expression).astype(float)
+            columns = []
+            for c in group_by:
+                if c == "part":
+                    columns.append(block.codes.astype(np.int64))
+                elif c == "step":
+                    columns.append(np.full(len(block), labels["step"].setdefault(block.step, len(labels["step"]))))
+                elif c is not None:
+                    columns.append(block.column(c))
+            if members is not None:
+                ids = block.codes.astype(np.int64) << 32 | block.keys
+                rows = [np.flatnonzero(np.isin(ids, group)) for group in members]
+                selected = _concatenate(rows, np.int64)
+                values = values[selected]
+                columns = [_concatenate([np.full(len(r), i) for i, r in enumerate(rows)], np.int64)] + [column[selected] for column in columns]
+            if not len(values):
+                continue
+            unique, codes = _group(columns, len(values))
+            valid = ~np.isnan(values)
+            values, codes = values[valid], codes[valid]
+            blocks_labels.append(unique)
+            blocks_partials.append(_combine(codes, len(unique[0]) if unique else 1, np.ones(len(values)), values, values, values))
+
+        if not blocks_partials:
+            return [tuple(0 if f == "count" else None for f in functions)] if not group_by else []
+        partials = np.concatenate(blocks_partials, axis=1)
+        unique, codes = _group([_concatenate([block[j] for block in blocks_labels], object) for j in range(len(group_by))], partials.shape[1])
+        count, total, maximum, minimum = _combine(codes, len(unique[0]) if unique else 1, *partials)
+        results = {"count": count, "sum": total, "mean": total / np.maximum(count, 1), "max": maximum, "min": minimum}
+        valid = (count > 0).tolist()
+        aggregations = [[int(v) for v in count.tolist()] if f == "count" else [v if ok else None for v, ok in zip(results[f].tolist(), valid)] for f in functions]
+        steps = {i: name for name, i in labels["step"].items()}
+        decode = {"part": labels["part"], "step": steps}
+        groups_columns = [[decode[column][v] for v in values.tolist()] if column in decode else values.tolist() for column, values in zip(group_by, unique)]
+        return list(zip(*groups_columns, *aggregations))
+
+    # =========================================================================
+    #                       FEA2 Methods
+    # =========================================================================
+
+    @staticmethod
+    def _components(schema):
+        return [name for name, definition in schema["columns"] if "PRIMARY KEY" not in definition.upper() and name not in ("key", "step", "part")]
+
+    def create_table_for_output_class(self, output_cls, results):
+        """
+        Reads the schema from `output_cls.sqltable_schema` and stores the
+        results in the arrays of the field of each step of the problem.
+
+        The results are stored in batches of :attr:`CHUNK_SIZE` rows, and
+        each batch is visible to the readers once stored.
+
+        Parameters
+        ----------
+        output_cls : _Output subclass
+            A class like NodeOutput that implements `sqltable_schema`.
+        results : iterable of tuples
+            Data to be inserted, in the order of the columns of the schema. It
+            can be a generator.
+
+        Raises
+        ------
+        ValueError
+            If a result belongs to a step of another problem or to a part of
+            another model.
+        """
+        schema = output_cls.sqltable_schema
+        names = [name for name, definition in schema["columns"] if "PRIMARY KEY" not in definition.upper()]
+        i_key, i_step, i_part = names.index("key"), names.index("step"), names.index("part")
+        components = self._components(schema)
+        i_values = [names.index(c) for c in components]
+        parts = [part.name for part in self.model.parts]
+        part_codes = {name: i for i, name in enumerate(parts)}
+        steps = [step.name for step in self.problem.steps_order]
+
+        def append_batch(append, batch):
+            try:
+                codes = np.array([part_codes[row[i_part]] for row in batch], dtype=np.int32)
+            except KeyError as e:
+                raise ValueError("Part {} not in {}".format(e, self.model)) from e
+            keys = np.array([row[i_key] for row in batch], dtype=np.int64)
+            values = np.array([[row[i] for i in i_values] for row in batch], dtype=float).reshape(len(batch), len(i_values))
+            batch_steps = np.array([row[i_step] for row in batch], dtype=object)
+            for step in set(batch_steps.tolist()):
+                if step not in steps:
+                    raise ValueError("Step {!r} not in {}".format(step, self.problem))
+                mask = batch_steps == step
+                append(step, keys[mask], codes[mask], values[mask])
+
+        with self._writer(schema["table_name"], components, parts, steps) as append:
+            batch = []
+            for row in results:
+                batch.append(row)
+                if len(batch) == self.CHUNK_SIZE:
+                    append_batch(append, batch)
+                    batch = []
+            if batch:
+                append_batch(append, batch)
+
+
+class HDF5ResultsDatabase(_ColumnarResultsDatabase):
+    """HDF5 store of the results, with the query interface of
+    :class:`SQLiteResultsDatabase`.
+
+    Each field of each step is stored in the group ``/<field>/<step>`` of
+    ``<problem>-results.h5`` as chunked and compressed datasets:
+
+    * ``values``: the components, of shape (number of results, number of components);
+    * ``key``: the key of the member of each result;
+    * ``part``: the index of the part of each result in the ``/<field>/parts``
+      dataset.
+
+    The names of the components are in the ``columns`` attribute of the field
+    group. The results are written in SWMR (single writer, multiple readers)
+    mode, so that they can be read while they are being written: the queries
+    see the results flushed so far.
+
+    The datasets cannot be created in SWMR mode: the ones of all the fields
+    requested in the steps of the problem (see
+    :attr:`compas_fea2.problem._Step.field_outputs`) are created when the first
+    field is written, and the file is kept open by the writer until the last
+    of them is written or :meth:`close` is called. The file can then be read,
+    also by other processes, during the whole extraction. Writing another
+    field reopens the file, which fails while other processes read it.
+
+    Attributes
+    ----------
+    CHUNK_ROWS : int
+        Number of rows of the chunks of the datasets.
+    COMPRESSION : str
+        Compression filter of the datasets.
+    COMPRESSION_OPTS : int
+        Level of the compression filter.
+
+    """
+
+    CHUNK_ROWS = 16384
+    COMPRESSION = "gzip"
+    COMPRESSION_OPTS = 4
+    EXTENSION = ".h5"
+
+    def __init__(self, problem, **kwargs):
+        super().__init__(problem, **kwargs)
+        self._writer_file = None
+        self._pending = set()
+
+    def close(self):
+        """Close the file of the writer, if open."""
+        if self._writer_file is not None:
+            self._writer_file.close()
+            self._writer_file = None
+        self._pending = set()
+
+    def _open(self, mode="r"):
+        import h5py
+
+        if mode == "r":
+            return h5py.File(self.db_uri, "r", libver="latest", swmr=True)
+        return h5py.File(self.db_uri, mode, libver="latest")
+
+    @property
+    def table_names(self):
+        """
+        Get the names of all fields in the database.
+
+        Returns
+        -------
+        list
+            A list of field names.
+        """
+        if not self.db_uri or not os.path.exists(self.db_uri):
+            return []
+        with self._open() as f:
+            return list(f.keys())
+
+    @contextmanager
+    def _field(self, table_name):
+        import h5py
+
+        with self._open() as f:
+            field = f[table_name]
+            steps = []
+            for name, group in field.items():
+                if isinstance(group, h5py.Group):
+                    datasets = [group["key"], group["part"], group["values"]]
+                    for dataset in datasets:
+                        # see the rows flushed by the writer since the file was opened
+                        dataset.refresh()
+                    steps.append(_StepArrays(name, *datasets))
+            yield _FieldArrays([str(c) for c in field.attrs["columns"]], [_decode(p) for p in field["parts"][()]], steps)
+
+    def _requested_fields(self, table_name, components):
+        fields = {table_name: components}
+        for step in self.problem.steps_order:
+            for output in step.field_outputs:
+                schema = getattr(output, "sqltable_schema", None)
+                if schema:
+                    fields.setdefault(schema["table_name"], self._components(schema))
+        return fields
+
+    def _open_writer(self, fields, parts, steps):
+        import h5py
+
+        compression = {"compression": self.COMPRESSION, "compression_opts": self.COMPRESSION_OPTS, "shuffle": True}
+        Path(self.db_uri).parent.mkdir(parents=True, exist_ok=True)
+        f = self._open("a")
+        try:
+            # the datasets cannot be created in SWMR mode: all the fields are created at once
+            for table_name, components in fields.items():
+                if table_name in f:
+                    del f[table_name]
+                field = f.create_group(table_name)
+                field.attrs["columns"] = components
+                field.create_dataset("parts", data=np.array(parts, dtype=object), dtype=h5py.string_dtype())
+                n = len(components)
+                for step in steps:
+                    group = field.create_group(step)
+                    group.create_dataset("key", shape=(0,), maxshape=(None,), dtype=np.int64, chunks=(self.CHUNK_ROWS,), **compression)
+                    group.create_dataset("part", shape=(0,), maxshape=(None,), dtype=np.int32, chunks=(self.CHUNK_ROWS,), **compression)
+                    group.create_dataset("values", shape=(0, n), maxshape=(None, n), dtype=np.float64, chunks=(self.CHUNK_ROWS, n), **compression)
+            f.swmr_mode = True
+        except Exception:
+            f.close()
+            raise
+        self._writer_file = f
+        self._pending = set(fields)
+
+    @contextmanager
+    def _writer(self, table_name, components, parts, steps):
+        if table_name not in self._pending:
+            self.close()
+            self._open_writer(self._requested_fields(table_name, components), parts, steps)
+        field = self._writer_file[table_name]
+        datasets = {step: (field[step]["key"], field[step]["part"], field[step]["values"]) for step in steps}
+
+        def append(step, keys, codes, values):
+            for dataset, data in zip(datasets[step], (keys, codes, values)):
+                n = dataset.shape[0]
+                dataset.resize(n + len(data), axis=0)
+                dataset[n:] = data
+                dataset.flush()
+
+        try:
+            yield append
+        finally:
+            self._pending.discard(table_name)
+            if not self._pending:
+                self.close()
+
+
+class MemmapResultsDatabase(_ColumnarResultsDatabase):
+    """Raw binary store of the results, opened with :class:`numpy.memmap`,
+    with the query interface of :class:`SQLiteResultsDatabase`.
+
+    Each field of each step is stored in the folder
+    ``<problem>-results.memmap/<field>`` as flat little-endian binary files
+    next to a small JSON header ``<step>.json``:
+
+    * ``<step>.values``: the components, ``float64`` of shape (number of
+      results, number of components), row by row;
+    * ``<step>.key``: the key of the member of each result, ``int64``;
+    * ``<step>.part``: the index of the part of each result in the ``parts``
+      of the header, ``int32``.
+
+    Only the pages of the files that are read by a query are loaded, so
+    fields larger than the memory can be queried. When the results of each
+    part are contiguous, as written by the backends, the header stores the
+    range of rows of each part and the queries on some parts only read those
+    rows.
+
+    The header is replaced atomically after each batch of results is
+    written, so the results can be read while they are being written.
+
+    """
+
+    EXTENSION = ".memmap"
+    DTYPES = {"key": "<i8", "part": "<i4", "values": "<f8"}
+    HEADER = "{}.json"
+
+    @property
+    def table_names(self):
+        """
+        Get the names of all fields in the database.
+
+        Returns
+        -------
+        list
+            A list of field names.
+        """
+        if not self.db_uri or not os.path.isdir(self.db_uri):
+            return []
+        return sorted(entry.name for entry in os.scandir(self.db_uri) if entry.is_dir())
+
+    def _path(self, table_name, *names):
+        return os.path.join(self.db_uri, table_name, *names)
+
+    def _read_header(self, table_name, step_file):
+        with open(self._path(table_name, step_file)) as f:
+            return json.load(f)
+
+    def _write_header(self, table_name, step, header):
+        path = self._path(table_name, self.HEADER.format(step))
+        with open(path + ".tmp", "w") as f:
+            json.dump(header, f)
+        os.replace(path + ".tmp", path)
+
+    def _map(self, table_name, step, name, shape):
+        if not shape[0]:
+            return np.empty(shape, dtype=self.DTYPES[name])
+        return np.memmap(self._path(table_name, "{}.{}".format(step, name)), dtype=self.DTYPES[name], mode="r", shape=shape)
+
+    @contextmanager
+    def _field(self, table_name):
+        if not os.path.isdir(self._path(table_name)):
+            raise KeyError("Field {!r} not in {}".format(table_name, self.db_uri))
+        headers = [self._read_header(table_name, name) for name in os.listdir(self._path(table_name)) if name.endswith(".json")]
+        headers.sort(key=lambda header: header["index"])
+        steps = []
+        for header in headers:
+            rows = header["rows"]
+            steps.append(
+                _StepArrays(
+                    header["step"],
+                    self._map(table_name, header["step"], "key", (rows,)),
+                    self._map(table_name, header["step"], "part", (rows,)),
+                    self._map(table_name, header["step"], "values", (rows, len(header["columns"]))),
+                    header.get("part_ranges"),
+                )
+            )
+        components = headers[0]["columns"] if headers else []
+        parts = headers[0]["parts"] if headers else []
+        yield _FieldArrays(components, parts, steps)
+
+    @contextmanager
+    def _writer(self, table_name, components, parts, steps):
+        folder = self._path(table_name)
+        if os.path.isdir(folder):
+            shutil.rmtree(folder)
+        os.makedirs(folder)
+        headers = {}
+        files = {}
+        runs = {}
+        for index, step in enumerate(steps):
+            headers[step] = {"step": step, "index": index, "rows": 0, "columns": components, "parts": parts, "part_ranges": None}
+            files[step] = {name: open(self._path(table_name, "{}.{}".format(step, name)), "wb") for name in self.DTYPES}
+            runs[step] = []
+            self._write_header(table_name, step, headers[step])
+
+        def append(step, keys, codes, values):
+            arrays = {"key": keys, "part": codes, "values": values}
+            for name, f in files[step].items():
+                f.write(np.ascontiguousarray(arrays[name], dtype=self.DTYPES[name]).tobytes())
+                f.flush()
+            # runs of consecutive rows of the same part
+            start = headers[step]["rows"]
+            changes = np.flatnonzero(np.diff(codes)) + 1
+            for begin, end in zip(np.concatenate([[0], changes]).tolist(), np.concatenate([changes, [len(codes)]]).tolist()):
+                code = int(codes[begin])
+                if runs[step] and runs[step][-1][0] == code and runs[step][-1][2] == start + begin:
+                    runs[step][-1][2] = start + end
                 else:
-                    data[k] = v
-        return data
-
-    def extract_field(self, field_name):
-        """Extract a specific field group from the HDF5 database."""
-        with h5py.File(self.db_path, "r") as hdf5_file:
-            if field_name in hdf5_file:
-                return {key: hdf5_file[field_name][key][:] for key in hdf5_file[field_name].keys()}
-            else:
-                raise KeyError(f"Field '{field_name}' not found in HDF5 database.")
+                    runs[step].append([code, start + begin, start + end])
+            headers[step]["rows"] = start + len(keys)
+            self._write_header(table_name, step, headers[step])
 
-    def get_max_value(self, field_name):
-        """Get the maximum value of a specific field."""
-        with h5py.File(self.db_path, "r") as hdf5_file:
-            if field_name in hdf5_file:
-                return max([np.max(hdf5_file[field_name][key][:]) for key in hdf5_file[field_name].keys()])
-            else:
-                raise KeyError(f"Field '{field_name}' not found in HDF5 database.")
-
-    def get_results_at_element(self, element_id):
-        """Retrieve results for a specific element."""
-        with h5py.File(self.db_path, "r") as hdf5_file:
-            element_key = f"elements/element_{element_id}"
-            if element_key in hdf5_file:
-                return {key: hdf5_file[element_key][key][:] for key in hdf5_file[element_key].keys()}
-            else:
-                raise KeyError(f"Element '{element_id}' not found in HDF5 database.")
-
-    def get_results_at_node(self, node_id):
-        """Retrieve results for a specific node."""
-        with h5py.File(self.db_path, "r") as hdf5_file:
-            node_key = f"nodes/node_{node_id}"
-            if node_key in hdf5_file:
-                return {key: hdf5_file[node_key][key][:] for key in hdf5_file[node_key].keys()}
-            else:
-                raise KeyError(f"Node '{node_id}' not found in HDF5 database.")
+        try:
+            yield append
+        finally:
+            for step in steps:
+                for f in files[step].values():
+                    f.close()
+                codes = [code for code, _, _ in runs[step]]
+                if len(codes) == len(set(codes)):
+                    headers[step]["part_ranges"] = {str(code): [start, stop] for code, start, stop in runs[step]}
+                self._write_header(table_name, step, headers[step])
+
+
+class _FieldArrays:
+    """Components, part names and :class:`_StepArrays` of a field."""
+
+    def __init__(self, components, parts, steps):
+        self.components = components
+        self.parts = parts
+        self.steps = steps
+
+
+class _StepArrays:
+    """Arrays of the results of a step, as datasets, memory maps or arrays."""
+
+    def __init__(self, name, keys, codes, values, part_ranges=None):
+        self.name = name
+        self.keys = keys
+        self.codes = codes
+        self.values = values
+        self.part_ranges = part_ranges
+
+    def ranges(self, part_filter=None):
+        """Ranges of rows to read to get the results of some parts."""
+        n = min(len(self.keys), len(self.codes), len(self.values))
+        if part_filter is None or self.part_ranges is None:
+            return [(0, n)]
+        return sorted(tuple(self.part_ranges[str(code)]) for code in part_filter if str(code) in self.part_ranges)
+
+
+class _ColumnsBlock:
+    """Rows of a step of a field of a :class:`_ColumnarResultsDatabase`."""
+
+    def __init__(self, step, keys, codes, values, components, parts, part_keys):
+        self.step = step
+        self.keys = keys
+        self.codes = codes
+        self.values = values
+        self.components = components
+        self.parts = parts
+        self.part_keys = part_keys
+
+    def __len__(self):
+        return len(self.keys)
+
+    def take(self, mask):
+        return _ColumnsBlock(self.step, self.keys[mask], self.codes[mask], self.values[mask], self.components, self.parts, self.part_keys)
+
+    def column(self, expression):
+        if expression == "key":
+            return self.keys
+        if expression == "step":
+            return np.full(len(self), self.step, dtype=object)
+        if expression == "part":
+            return np.array(self.parts + [None], dtype=object)[self.codes]
+        if expression == _ColumnarResultsDatabase.PART_KEY:
+            return np.array([self.part_keys.get(name, -1) for name in self.parts] + [-1], dtype=np.int64)[self.codes]
+        if expression in self.components:
+            return self.values[:, self.components.index(expression)]
+        if expression.strip().upper() == "NULL":
+            return np.full(len(self), np.nan)
+        # arithmetic expressions of the components, e.g. the sql_expressions of the fields
+        namespace = {name: self.values[:, i] for i, name in enumerate(self.components)}
+        return np.broadcast_to(np.asarray(_evaluate(_parse_expression(expression), namespace, expression), dtype=float), (len(self),))
+
+
+_FUNCTIONS = {"sqrt": np.sqrt, "abs": np.abs}
+_BINARY_OPERATORS = {ast.Add: np.add, ast.Sub: np.subtract, ast.Mult: np.multiply, ast.Div: np.true_divide, ast.Pow: np.power}
+_UNARY_OPERATORS = {ast.USub: np.negative, ast.UAdd: np.positive}
+
+
+@lru_cache(maxsize=256)
+def _parse_expression(expression):
+    # only numbers, names, + - * / **, unary signs and calls to the _FUNCTIONS are accepted
+    try:
+        tree = ast.parse(expression.strip(), mode="eval")
+    except SyntaxError as e:
+        raise ValueError("Invalid expression {!r}: {}".format(expression, e.msg)) from None
+    for node in ast.walk(tree):
+        if isinstance(node, ast.BinOp):
+            valid = type(node.op) in _BINARY_OPERATORS
+        elif isinstance(node, ast.UnaryOp):
+            valid = type(node.op) in _UNARY_OPERATORS
+        elif isinstance(node, ast.Call):
+            valid = isinstance(node.func, ast.Name) and node.func.id in _FUNCTIONS and len(node.args) == 1 and not node.keywords
+        elif isinstance(node, ast.Constant):
+            valid = isinstance(node.value, (int, float)) and not isinstance(node.value, bool)
+        else:
+            valid = isinstance(node, (ast.Expression, ast.Name, ast.Load, ast.operator, ast.unaryop))
+        if not valid:
+            raise ValueError("Invalid expression {!r}: only numbers, components, + - * / **, unary signs and {} are allowed".format(expression, ", ".join(_FUNCTIONS)))
+    return tree.body
+
+
+def _evaluate(node, namespace, expression):
+    if isinstance(node, ast.Constant):
+        return node.value
+    if isinstance(node, ast.Name):
+        if node.id not in namespace:
+            raise ValueError("Unknown column {!r} in {!r}. Choose from {}.".format(node.id, expression, list(namespace)))
+        return namespace[node.id]
+    if isinstance(node, ast.BinOp):
+        return _BINARY_OPERATORS[type(node.op)](_evaluate(node.left, namespace, expression), _evaluate(node.right, namespace, expression))
+    if isinstance(node, ast.UnaryOp):
+        return _UNARY_OPERATORS[type(node.op)](_evaluate(node.operand, namespace, expression))
+    return _FUNCTIONS[node.func.id](_evaluate(node.args[0], namespace, expression))
+
+
+def _decode(value):
+    return value.decode() if isinstance(value, bytes) else str(value)
+
+
+def _concatenate(arrays, dtype):
+    return np.concatenate(arrays) if arrays else np.empty(0, dtype=dtype)
+
+
+def _group(columns, n):
+    # the combinations of the values of the columns, and the index of the combination of each row
+    if not columns:
+        return [], np.zeros(n, dtype=np.int64)
+    inverses = [np.unique(column, return_inverse=True) for column in columns]
+    # the combinations are encoded as a single integer
+    shape = [len(unique) for unique, _ in inverses]
+    combined, codes = np.unique(np.ravel_multi_index([inverse.reshape(-1) for _, inverse in inverses], shape), return_inverse=True)
+    indices = np.unravel_index(combined, shape)
+    return [unique[i] for (unique, _), i in zip(inverses, indices)], codes.reshape(-1)
+
+
+def _combine(codes, n, count, total, maximum, minimum):
+    # count, sum, maximum and minimum of each group, from the ones of its rows or partial groups
+    result = np.empty((4, n))
+    result[0] = np.bincount(codes, weights=count, minlength=n)
+    result[1] = np.bincount(codes, weights=total, minlength=n)
+    result[2] = -np.inf
+    result[3] = np.inf
+    if len(codes):
+        order = np.argsort(codes, kind="stable")
+        sorted_codes = codes[order]
+        starts = np.flatnonzero(np.concatenate([[True], sorted_codes[1:] != sorted_codes[:-1]]))
+        result[2, sorted_codes[starts]] = np.maximum.reduceat(maximum[order], starts)
+        result[3, sorted_codes[starts]] = np.minimum.reduceat(minimum[order], starts)
+    return result
 
 
 class SQLiteResultsDatabase(ResultsDatabase):
-    """sqlite3 wrapper class to access the SQLite database."""
+    """sqlite3 wrapper class to access the SQLite database.
+
+    Queries go through a long-lived read-only connection per thread, tuned with
+    :attr:`PRAGMAS`, so that the statements prepared by :mod:`sqlite3` are
+    reused across queries. Writes go through :attr:`connection`. The
+    connections are opened on first use and follow the path of the database
+    of the problem. Use :meth:`close`, or the database as a context manager,
+    to release them.
+
+    Attributes
+    ----------
+    PRAGMAS : dict
+        Pragmas of the read connections: memory mapped I/O, page cache size
+        (negative values are in KiB) and temporary tables in memory.
+    CACHED_STATEMENTS : int
+        Number of prepared statements kept by each connection.
+    CHUNK_SIZE : int
+        Default number of rows of the chunks of the streaming queries (see
+        :meth:`iter_query`).
+    AGGREGATES : dict
+        SQL functions of the aggregations of :meth:`aggregate`.
+
+    """
+
+    PRAGMAS = {"mmap_size": 268435456, "cache_size": -65536, "temp_store": "MEMORY"}
+    CACHED_STATEMENTS = 256
+    CHUNK_SIZE = 65536
+    AGGREGATES = {"max": "MAX", "min": "MIN", "sum": "SUM", "mean": "AVG", "count": "COUNT"}
 
     def __init__(self, problem, **kwargs):
         """
@@ -141,12 +1013,46 @@ class SQLiteResultsDatabase(ResultsDatabase):
             The problem instance containing the database path.
         """
         super().__init__(problem=problem, **kwargs)
+        self._db_path = None
+        self._init_connections()
 
-        self.db_uri = problem.path_db
-        self.connection = self.db_connection()
-        self.cursor = self.connection.cursor()
+    @classmethod
+    def from_path(cls, path):
+        """Open a results database without its problem (e.g. for maintenance).
+
+        Parameters
+        ----------
+        path : str | :class:`pathlib.Path`
+            Path to the SQLite database.
+
+        Returns
+        -------
+        :class:`SQLiteResultsDatabase`
+        """
+        database = cls(None)
+        database._db_path = str(path)
+        return database
+
+    def _init_connections(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = []
+
+    def __getstate__(self):
+        state = super().__getstate__().copy()
+        for name in ("_local", "_lock", "_connections"):
+            state.pop(name, None)
+        return state
+
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        self._init_connections()
+
+    @property
+    def db_uri(self):
+        return self._db_path or self.problem.path_db
 
-    def db_connection(self, remove=False):
+    def db_connection(self, remove=False, readonly=False):
         """
         Create and return a connection to the SQLite database.
 
@@ -154,6 +1060,8 @@ class SQLiteResultsDatabase(ResultsDatabase):
         ----------
         remove : bool, optional
             If True, remove the existing database before creating a new connection.
+        readonly : bool, optional
+            If True, open the database in read-only mode and apply :attr:`PRAGMAS`.
 
         Returns
         -------
@@ -161,8 +1069,58 @@ class SQLiteResultsDatabase(ResultsDatabase):
             The database connection.
         """
         if remove:
-            self._check_and_delete_existing_db()
-        return sqlite3.connect(self.db_uri)
+            self.close()
+            if self.db_uri and Path(self.db_uri).exists():
+                Path(self.db_uri).unlink()
+        if readonly:
+            connection = sqlite3.connect(Path(self.db_uri).absolute().as_uri() + "?mode=ro", uri=True, check_same_thread=False, cached_statements=self.CACHED_STATEMENTS)
+            for name, value in self.PRAGMAS.items():
+                connection.execute("PRAGMA {} = {}".format(name, value))
+            _add_math_functions(connection)
+        else:
+            connection = sqlite3.connect(self.db_uri, check_same_thread=False, cached_statements=self.CACHED_STATEMENTS)
+        with self._lock:
+            self._connections.append(connection)
+        return connection
+
+    def _thread_connection(self, name, readonly):
+        # one connection per thread, reopened if the path of the database changed
+        cached = getattr(self._local, name, None)
+        if cached is None or cached[0] != self.db_uri:
+            cached = (self.db_uri, self.db_connection(readonly=readonly))
+            setattr(self._local, name, cached)
+        return cached[1]
+
+    @property
+    def connection(self):
+        """Read-write connection of the current thread."""
+        return self._thread_connection("write", readonly=False)
+
+    @property
+    def read_connection(self):
+        """Read-only connection of the current thread."""
+        return self._thread_connection("read", readonly=True)
+
+    @property
+    def cursor(self):
+        """Cursor of the read-write connection of the current thread."""
+        cached = getattr(self._local, "cursor", None)
+        connection = self.connection
+        if cached is None or cached[0] is not connection:
+            cached = (connection, connection.cursor())
+            self._local.cursor = cached
+        return cached[1]
+
+    def close(self):
+        """Close all the connections to the database, of all threads.
+
+        The connections are opened again on the next query.
+        """
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            connection.close()
+        self._local = threading.local()
 
     def execute_query(self, query, params=None):
         """
@@ -171,7 +1129,8 @@ class SQLiteResultsDatabase(ResultsDatabase):
         Parameters
         ----------
         query : str
-            The SQL query to execute.
+            The SQL query to execute. It is run on the read-only connection of
+            the current thread.
         params : tuple, optional
             The parameters to bind to the query.
 
@@ -180,12 +1139,37 @@ class SQLiteResultsDatabase(ResultsDatabase):
         list
             The result set.
         """
-        self.connection = self.db_connection()
-        self.cursor = self.connection.cursor()
-        self.cursor.execute(query, params or ())
-        result_set = self.cursor.fetchall()
-        self.connection.close()
-        return result_set
+        return self.read_connection.execute(query, params or ()).fetchall()
+
+    def iter_query(self, query, params=None, size=None):
+        """
+        Execute a query and yield the result set in chunks, so that large
+        tables are never loaded in memory at once.
+
+        Parameters
+        ----------
+        query : str
+            The SQL query to execute. It is run on the read-only connection of
+            the current thread.
+        params : tuple, optional
+            The parameters to bind to the query.
+        size : int, optional
+            The number of rows of each chunk, by default :attr:`CHUNK_SIZE`.
+
+        Yields
+        ------
+        list
+            The rows of each chunk. Only the last chunk can be shorter.
+        """
+        cursor = self.read_connection.execute(query, params or ())
+        try:
+            while True:
+                rows = cursor.fetchmany(size or self.CHUNK_SIZE)
+                if not rows:
+                    break
+                yield rows
+        finally:
+            cursor.close()
 
     # =========================================================================
     #                       Query methods
@@ -200,8 +1184,7 @@ class SQLiteResultsDatabase(ResultsDatabase):
         list
             A list of table names.
         """
-        self.cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
-        return [row[0] for row in self.cursor.fetchall()]
+        return [row[0] for row in self.execute_query("SELECT name FROM sqlite_master WHERE type='table';")]
 
     @property
     def fields(self):
@@ -229,8 +1212,7 @@ class SQLiteResultsDatabase(ResultsDatabase):
         list
             A list of column names.
         """
-        self.cursor.execute(f"PRAGMA table_info({table_name});")
-        return [row[1] for row in self.cursor.fetchall()]
+        return [row[1] for row in self.execute_query(f"PRAGMA table_info({table_name});")]
 
     def get_table(self, table_name):
         """
@@ -249,6 +1231,127 @@ class SQLiteResultsDatabase(ResultsDatabase):
         query = f"SELECT * FROM {table_name}"
         return self.execute_query(query)
 
+    def iter_table(self, table_name, size=None):
+        """
+        Iterate over a table in chunks, as structured arrays.
+
+        Parameters
+        ----------
+        table_name : str
+            The name of the table.
+        size : int, optional
+            The number of rows of each chunk, by default :attr:`CHUNK_SIZE`.
+
+        Yields
+        ------
+        :class:`numpy.ndarray`
+            Structured array with a field per column: ``INTEGER`` columns are
+            ``int64``, ``REAL`` columns ``float64`` and the others objects.
+        """
+        types = {"INTEGER": np.int64, "REAL": np.float64}
+        info = self.execute_query(f"PRAGMA table_info({table_name});")
+        dtype = [(row[1], types.get(row[2].split()[0].upper() if row[2] else "", object)) for row in info]
+        for rows in self.iter_query(f"SELECT * FROM {table_name}", size=size):
+            yield np.array(rows, dtype=dtype)
+
+    def iter_rows(self, table_name, columns_names, filters=None, size=None, dtype=float):
+        """
+        Iterate over the rows of a table that match the filtering criteria,
+        in chunks, as arrays.
+
+        Parameters
+        ----------
+        table_name : str
+            The name of the table.
+        columns_names : list
+            Name of each column to retrieve, or SQL expressions. They must be
+            convertible to `dtype`.
+        filters : dict, optional
+            Filtering criteria as {"column_name":[admissible values]}.
+        size : int, optional
+            The number of rows of each chunk, by default :attr:`CHUNK_SIZE`.
+        dtype : data-type, optional
+            The type of the arrays, by default ``float``. ``NULL`` values are
+            ``nan`` for floating point types.
+
+        Yields
+        ------
+        :class:`numpy.ndarray`
+            Array of shape (size, len(columns_names)) for each chunk. Only the
+            last chunk can be shorter.
+        """
+        query = f"SELECT {', '.join(columns_names)} FROM {table_name}"
+        filters = filters or {}
+        if filters:
+            query += " WHERE " + " AND ".join([f"{k} IN ({','.join(['?' for _ in v])})" for k, v in filters.items()])
+        params = [item for sublist in filters.values() for item in sublist]
+        for rows in self.iter_query(query, params, size=size):
+            yield np.array(rows, dtype=dtype)
+
+    def aggregate(self, table_name, expression, functions=("max", "min", "sum", "mean"), filters=None, group_by=None, groups=None):
+        """
+        Aggregate a column, or an expression of the columns, of a table in the
+        database, so that only the aggregated values are returned.
+
+        Parameters
+        ----------
+        table_name : str
+            The name of the table, aliased as ``t`` in the query.
+        expression : str
+            The column or SQL expression to aggregate (e.g.
+            ``"sqrt(x*x + y*y + z*z)"``).
+        functions : list[str], optional
+            The aggregations, among the keys of :attr:`AGGREGATES`.
+        filters : dict, optional
+            Filtering criteria as {"column_name":[admissible values]}.
+        group_by : list[str], optional
+            Columns or expressions to group by. Their values are the first
+            columns of the rows.
+        groups : list[list[tuple]], optional
+            Groups of members as lists of (part name, key) pairs. The rows are
+            grouped by the index of the group, which is the first column of the
+            rows, followed by the `group_by` values. A member can belong to
+            several groups.
+
+        Returns
+        -------
+        list of tuples
+            One row per group with the group values and the aggregations.
+        """
+        unknown = [f for f in functions if f not in self.AGGREGATES]
+        if unknown:
+            raise ValueError("Unknown aggregations {}. Choose from {}.".format(unknown, list(self.AGGREGATES)))
+        group_by = list(group_by or [])
+        filters = filters or {}
+        select = group_by + ["{}({})".format(self.AGGREGATES[f], expression) for f in functions]
+        where = " AND ".join([f"t.{k} IN ({','.join(['?' for _ in v])})" for k, v in filters.items()])
+        params = [item for sublist in filters.values() for item in sublist]
+
+        join = ""
+        groups_table = None
+        if groups is not None:
+            # the groups can be large: they are joined from a temporary table instead of bound to the query
+            groups_table = "fea2_groups_{}".format(uuid.uuid4().hex)
+            connection = self.read_connection
+            connection.execute(f"CREATE TEMP TABLE {groups_table} (grp INTEGER, part TEXT, key INTEGER)")
+            connection.executemany(f"INSERT INTO temp.{groups_table} VALUES (?, ?, ?)", [(i, part, key) for i, members in enumerate(groups) for part, key in members])
+            connection.commit()
+            join = f" JOIN temp.{groups_table} g ON g.part = t.part AND g.key = t.key"
+            select.insert(0, "g.grp")
+            group_by.insert(0, "g.grp")
+
+        query = f"SELECT {', '.join(select)} FROM {table_name} t{join}"
+        if where:
+            query += f" WHERE {where}"
+        if group_by:
+            query += f" GROUP BY {', '.join(group_by)}"
+        try:
+            return self.execute_query(query, params)
+        finally:
+            if groups_table:
+                self.read_connection.execute(f"DROP TABLE temp.{groups_table}")
+                self.read_connection.commit()
+
     def get_column_values(self, table_name, column_name):
         """
         Get all the values in a given column from a table.
@@ -320,50 +1423,26 @@ class SQLiteResultsDatabase(ResultsDatabase):
     #                       FEA2 Methods
     # =========================================================================
 
-    def to_result(self, results_set, results_func, field_name):
-        """
-        Convert a set of results in the database to the appropriate
-        result object.
-
-        Parameters
-        ----------
-        results_set : list of tuples
-            The set of results retrieved from the database.
-        results_class : class
-            The class to instantiate for each result.
-        results_func : str
-            The function to call on the part to get the member.
-
-        Returns
-        -------
-        dict
-            Dictionary grouping the results per Step.
-        """
-        results = {}
-        for r in results_set:
-            step = self.problem.find_step_by_name(r.pop("step"))
-            results.setdefault(step, [])
-            m = getattr(self.model, results_func)(r.pop("key"))[0]
-            if not m:
-                raise ValueError(f"Member not in {self.model}")
-            results[step].append(m.results_cls[field_name](m, **r))
-        return results
-
     def create_table_for_output_class(self, output_cls, results):
         """
         Reads the table schema from `output_cls.get_table_schema()`
         and creates the table in the given database.
 
+        The results are loaded in a single transaction, in WAL journal mode.
+        The index on (step, part, key) is dropped before the load and built
+        again afterwards, which is faster than updating it row by row.
+
         Parameters
         ----------
         output_cls : _Output subclass
             A class like NodeOutput that implements `get_table_schema()`.
-        connection : sqlite3.Connection
-            SQLite3 connection object.
-        results : list of tuples
-            Data to be inserted into the table.
+        results : iterable of tuples
+            Data to be inserted into the table. It can be a generator.
         """
-        cursor = self.connection.cursor()
+        connection = self.connection
+        connection.execute("PRAGMA journal_mode = WAL")
+        connection.execute("PRAGMA synchronous = NORMAL")
+        cursor = connection.cursor()
 
         schema = output_cls.sqltable_schema
         table_name = schema["table_name"]
@@ -372,13 +1451,102 @@ class SQLiteResultsDatabase(ResultsDatabase):
         # Build CREATE TABLE statement:
         columns_sql_str = ", ".join([f"{col_name} {col_def}" for col_name, col_def in columns_info])
         create_sql = f"CREATE TABLE IF NOT EXISTS {table_name} ({columns_sql_str})"
-        cursor.execute(create_sql)
-        self.connection.commit()
 
         # Insert data into the table:
         insert_columns = [col_name for col_name, col_def in columns_info if "PRIMARY KEY" not in col_def.upper()]
         col_names_str = ", ".join(insert_columns)
         placeholders_str = ", ".join(["?"] * len(insert_columns))
         sql = f"INSERT INTO {table_name} ({col_names_str}) VALUES ({placeholders_str})"
-        cursor.executemany(sql, results)
-        self.connection.commit()
+        with connection:
+            cursor.execute(create_sql)
+            cursor.execute(f"DROP INDEX IF EXISTS {self._index_name(table_name)}")
+            cursor.executemany(sql, results)
+            self._create_index(cursor, table_name)
+        # move the loaded pages to the database file, so that it can be copied alone
+        connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    # =========================================================================
+    #                       Indexes and query plans
+    # =========================================================================
+
+    INDEX_COLUMNS = ("step", "part", "key")
+
+    @staticmethod
+    def _index_name(table_name):
+        return f"{table_name}_step_part_key"
+
+    def _create_index(self, cursor, table_name):
+        columns = [row[1] for row in cursor.execute(f"PRAGMA table_info({table_name})")]
+        if all(c in columns for c in self.INDEX_COLUMNS):
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS {self._index_name(table_name)} ON {table_name} ({', '.join(self.INDEX_COLUMNS)})")
+            return True
+        return False
+
+    def create_indexes(self):
+        """Create the (step, part, key) index of the result tables that lack it.
+
+        Useful for databases written before the indexes were introduced.
+
+        Returns
+        -------
+        list[str]
+            The names of the indexed tables.
+        """
+        indexed = []
+        connection = self.connection
+        with connection:
+            for table_name in self.table_names:
+                if self._create_index(connection.cursor(), table_name):
+                    indexed.append(table_name)
+        return indexed
+
+    def analyze(self):
+        """Gather the statistics used by the query planner (``ANALYZE``)."""
+        connection = self.connection
+        connection.execute("ANALYZE")
+        connection.commit()
+
+    def query_plan(self, query, params=None):
+        """Query plan of a query.
+
+        Parameters
+        ----------
+        query : str
+            The SQL query.
+        params : tuple, optional
+            The parameters to bind to the query.
+
+        Returns
+        -------
+        list[str]
+            The steps of the plan, as reported by ``EXPLAIN QUERY PLAN``.
+        """
+        # explaining a query reads no table, so the schema of a long-lived
+        # connection would not be refreshed after a change (e.g. a new index)
+        self.execute_query("SELECT COUNT(*) FROM sqlite_master")
+        return [row[-1] for row in self.execute_query(f"EXPLAIN QUERY PLAN {query}", params)]
+
+    def member_query_plan(self, table_name):
+        """Query plan of the retrieval of the results of one member, as done
+        by :class:`compas_fea2.results.FieldResults`.
+
+        Parameters
+        ----------
+        table_name : str
+            The name of the table.
+
+        Returns
+        -------
+        list[str]
+        """
+        filters = {column: [None] for column in self.INDEX_COLUMNS}
+        filter_conditions = " AND ".join(f"{k} IN ({','.join(['?' for _ in v])})" for k, v in filters.items())
+        return self.query_plan(f"SELECT * FROM {table_name} WHERE {filter_conditions}", [None] * len(filters))
+
+
+def _add_math_functions(connection):
+    # SQLite is not always compiled with the math functions used by the computed columns of the fields
+    try:
+        connection.execute("SELECT sqrt(1.0)")
+    except sqlite3.OperationalError:
+        connection.create_function("sqrt", 1, lambda x: math.sqrt(x) if x is not None and x >= 0 else None, deterministic=True)
@@ -0,0 +1,329 @@
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from .database import SQLiteResultsDatabase
+
+
+class ResultsFederation:
+    """Results of several problems of the same model in a single database.
+
+    The result tables of the databases of the problems are merged, through
+    ``ATTACH``, into one store with an additional ``problem`` column (the
+    index of the problem in :attr:`problems`) and indexed on (part, key,
+    problem) and (problem, step). Envelopes, differences and rankings across
+    problems are then single queries (see :meth:`field`).
+
+    Parameters
+    ----------
+    problems : list[:class:`compas_fea2.problem.Problem`]
+        The analysed problems, all of the same model.
+    path : str | :class:`pathlib.Path`, optional
+        The merged database. By default, a file in a temporary folder.
+
+    Notes
+    -----
+    The merged database is a copy: call :meth:`merge` again after analysing
+    the problems again.
+
+    Examples
+    --------
+    >>> federation = ResultsFederation(model.problems)  # doctest: +SKIP
+    >>> u = federation.field("displacement_field")  # doctest: +SKIP
+    >>> u.rank("magnitude")  # doctest: +SKIP
+    >>> keys, parts, values, governing = u.envelope("magnitude")  # doctest: +SKIP
+
+    """
+
+    INDEXES = {"part_key_problem": ("part", "key", "problem"), "problem_step": ("problem", "step")}
+
+    def __init__(self, problems, path=None):
+        self.problems = list(problems)
+        if not self.problems:
+            raise ValueError("At least one problem is required")
+        if path is None:
+            path = os.path.join(tempfile.mkdtemp(prefix="fea2-federation-"), "federation.db")
+        self.path = Path(path)
+        self.rdb = SQLiteResultsDatabase.from_path(self.path)
+        self.merge()
+
+    def __repr__(self):
+        return "{}({} problems, {!r})".format(self.__class__.__name__, len(self.problems), str(self.path))
+
+    @property
+    def model(self):
+        return self.problems[0].model
+
+    def close(self):
+        self.rdb.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    # =========================================================================
+    #                           Merge
+    # =========================================================================
+
+    def merge(self):
+        """(Re)build the merged database from the databases of the problems.
+
+        Returns
+        -------
+        list[str]
+            The names of the merged tables.
+        """
+        self.rdb.close()
+        if self.path.exists():
+            self.path.unlink()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        connection = self.rdb.db_connection()
+        connection.execute("PRAGMA journal_mode = WAL")
+        connection.execute("PRAGMA synchronous = NORMAL")
+        tables = {}
+        try:
+            # the databases are attached one at a time, so the number of problems is not limited by SQLITE_MAX_ATTACHED
+            for index, problem in enumerate(self.problems):
+                if not problem.path_db or not os.path.exists(problem.path_db):
+                    raise FileNotFoundError("The results database of {!r} does not exist: analyse the problem first".format(problem.name))
+                connection.execute("ATTACH DATABASE ? AS source", (str(problem.path_db),))
+                try:
+                    with connection:
+                        for (table,) in connection.execute("SELECT name FROM source.sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%'").fetchall():
+                            columns = [row[1] for row in connection.execute(f"PRAGMA source.table_info({table})") if row[1] != "id"]
+                            if table not in tables:
+                                connection.execute(f"CREATE TABLE {table} (problem INTEGER, {', '.join(columns)})")
+                                tables[table] = columns
+                            columns = [c for c in columns if c in tables[table]]
+                            connection.execute(f"INSERT INTO {table} (problem, {', '.join(columns)}) SELECT ?, {', '.join(columns)} FROM source.{table}", (index,))
+                finally:
+                    connection.execute("DETACH DATABASE source")
+            with connection:
+                for table, columns in tables.items():
+                    for name, index_columns in self.INDEXES.items():
+                        if all(c in columns or c == "problem" for c in index_columns):
+                            connection.execute(f"CREATE INDEX {table}_{name} ON {table} ({', '.join(index_columns)})")
+            connection.execute("ANALYZE")
+            connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        finally:
+            self.rdb.close()
+        return list(tables)
+
+    # =========================================================================
+    #                           Fields
+    # =========================================================================
+
+    def field(self, name):
+        """Field results of all the problems.
+
+        Parameters
+        ----------
+        name : str
+            The name of the field property of the steps (e.g.
+            ``"displacement_field"`` or ``"stress_field"``).
+
+        Returns
+        -------
+        :class:`FederatedFieldResults`
+        """
+        step = next(iter(self.problems[0].steps_order or self.problems[0].steps), None)
+        if step is None:
+            raise ValueError("{!r} has no steps".format(self.problems[0]))
+        return FederatedFieldResults(self, getattr(step, name))
+
+    def problem_index(self, problem):
+        """Index of a problem, given as object, name or index."""
+        if isinstance(problem, int):
+            return problem
+        for index, p in enumerate(self.problems):
+            if p is problem or p.name == problem:
+                return index
+        raise ValueError("{!r} is not in the federation".format(problem))
+
+
+class FederatedFieldResults:
+    """A field of the results of several problems, with a ``problem``
+    dimension.
+
+    The components and :attr:`compas_fea2.results.FieldResults.sql_expressions`
+    are the ones of the field of the first problem. Problems can be given as
+    objects, names or indices; the methods return indices in
+    :attr:`ResultsFederation.problems`.
+
+    Parameters
+    ----------
+    federation : :class:`ResultsFederation`
+        The federation.
+    field : :class:`compas_fea2.results.FieldResults`
+        The field of a step of the first problem.
+
+    """
+
+    def __init__(self, federation, field):
+        self.federation = federation
+        self.field = field
+
+    @property
+    def rdb(self):
+        return self.federation.rdb
+
+    @property
+    def field_name(self):
+        return self.field.field_name
+
+    @property
+    def components_names(self):
+        return self.field.components_names
+
+    def _filters(self, problems=None, steps=None, members=None):
+        filters = {}
+        if problems is not None:
+            filters["problem"] = [self.federation.problem_index(p) for p in problems]
+        if steps is not None:
+            filters["step"] = [step if isinstance(step, str) else step.name for step in steps]
+        if members is not None:
+            self.field._members_filters(members, filters)
+        return filters
+
+    def _part_column(self, table=None):
+        return self.rdb.part_key_column(self.federation.model.parts, table=table)
+
+    def to_numpy(self, columns=None, problems=None, steps=None, members=None):
+        """Results of the problems as arrays.
+
+        Parameters
+        ----------
+        columns : list[str], optional
+            The components, or names of :attr:`sql_expressions`, by default
+            all the components.
+        problems, steps, members : list, optional
+            Only retrieve the results of these problems, steps and members.
+
+        Returns
+        -------
+        tuple(:class:`numpy.ndarray`, :class:`numpy.ndarray`, :class:`numpy.ndarray`, :class:`numpy.ndarray`)
+            The problem indices (n,), keys (n,), part keys (n,) and values
+            (n, len(columns)).
+        """
+        columns = [self.field._sql_expression(c) for c in (columns or self.components_names)]
+        chunks = list(self.rdb.iter_rows(self.field_name, ["problem", "key", self._part_column()] + columns, self._filters(problems, steps, members)))
+        data = np.concatenate(chunks) if chunks else np.empty((0, len(columns) + 3))
+        return data[:, 0].astype(np.int32), data[:, 1].astype(np.int64), data[:, 2].astype(np.int32), data[:, 3:]
+
+    def aggregate(self, component, functions=("max", "min", "sum", "mean"), problems=None, steps=None, members=None):
+        """Aggregations of a component for each problem.
+
+        Parameters
+        ----------
+        component : str
+            The component, or the name of one of the :attr:`sql_expressions`.
+        functions : list[str], optional
+            See :meth:`compas_fea2.results.FieldResults.aggregate`.
+        problems, steps, members : list, optional
+            Only aggregate the results of these problems, steps and members.
+
+        Returns
+        -------
+        dict[int, dict]
+            The aggregations by problem index.
+        """
+        functions = list(functions)
+        filters = self._filters(problems, steps, members)
+        rows = self.rdb.aggregate(self.field_name, self.field._sql_expression(component), functions, filters, group_by=["problem"])
+        return {row[0]: dict(zip(functions, row[1:])) for row in rows}
+
+    def rank(self, component, function="max", descending=True, problems=None, steps=None, members=None):
+        """Problems sorted by an aggregation of a component.
+
+        Parameters
+        ----------
+        component : str
+            The component, or the name of one of the :attr:`sql_expressions`.
+        function : str, optional
+            The aggregation, by default ``"max"``.
+        descending : bool, optional
+            Sort from the largest value, by default ``True``.
+        problems, steps, members : list, optional
+            Only rank the results of these problems, steps and members.
+
+        Returns
+        -------
+        list[tuple(int, float)]
+            The problem indices and their values. The problems without results
+            (value ``None``) come last.
+        """
+        values = self.aggregate(component, [function], problems=problems, steps=steps, members=members)
+        ranking = [(problem, value[function]) for problem, value in values.items()]
+        ranked = sorted((item for item in ranking if item[1] is not None), key=lambda item: item[1], reverse=descending)
+        return ranked + [item for item in ranking if item[1] is None]
+
+    def envelope(self, component, function="max", problems=None, steps=None):
+        """Extreme value of a component at each member over the problems.
+
+        Parameters
+        ----------
+        component : str
+            The component, or the name of one of the :attr:`sql_expressions`.
+        function : str, optional
+            ``"max"`` (default) or ``"min"``.
+        problems, steps : list, optional
+            Only consider these problems and steps.
+
+        Returns
+        -------
+        tuple(:class:`numpy.ndarray`, :class:`numpy.ndarray`, :class:`numpy.ndarray`, :class:`numpy.ndarray`)
+            The keys (n,), part keys (n,), the envelope (n,) and the index of
+            the governing problem (n,) of each member.
+        """
+        if function not in ("max", "min"):
+            raise ValueError("The envelope is either 'max' or 'min'")
+        expression = self.field._sql_expression(component)
+        filters = self._filters(problems, steps)
+        where = " AND ".join(f"{k} IN ({','.join(['?' for _ in v])})" for k, v in filters.items())
+        params = [item for sublist in filters.values() for item in sublist]
+        # with a single max() or min(), SQLite takes the bare columns (here the problem) from the extreme row
+        query = f"SELECT key, {self._part_column()}, {function.upper()}({expression}), problem FROM {self.field_name}"
+        if where:
+            query += f" WHERE {where}"
+        query += " GROUP BY part, key"
+        rows = self.rdb.execute_query(query, params)
+        data = np.array(rows, dtype=float) if rows else np.empty((0, 4))
+        return data[:, 0].astype(np.int64), data[:, 1].astype(np.int32), data[:, 2], data[:, 3].astype(np.int32)
+
+    def difference(self, component, a, b, steps=None):
+        """Difference of a component between two problems at each member.
+
+        Parameters
+        ----------
+        component : str
+            The component, or the name of one of the :attr:`sql_expressions`.
+        a, b : :class:`compas_fea2.problem.Problem` | str | int
+            The problems.
+        steps : list, optional
+            Only consider these steps. Each member should have a single result
+            per problem.
+
+        Returns
+        -------
+        tuple(:class:`numpy.ndarray`, :class:`numpy.ndarray`, :class:`numpy.ndarray`)
+            The keys (n,), part keys (n,) and the values of `a` minus the
+            values of `b` (n,), for the members with results in both problems.
+        """
+        expression = self.field._sql_expression(component)
+        steps_filter = ""
+        steps_params = []
+        if steps is not None:
+            names = self._filters(steps=steps)["step"]
+            steps_filter = " AND step IN ({})".format(",".join("?" for _ in names))
+            steps_params = names
+        side = f"SELECT part, key, {expression} AS value FROM {self.field_name} WHERE problem = ?{steps_filter}"
+        query = f"WITH a AS ({side}), b AS ({side}) SELECT a.key, {self._part_column(table='a')}, a.value - b.value FROM a JOIN b ON a.part = b.part AND a.key = b.key"
+        params = [self.federation.problem_index(a)] + steps_params + [self.federation.problem_index(b)] + steps_params
+        rows = self.rdb.execute_query(query, params)
+        data = np.array(rows, dtype=float) if rows else np.empty((0, 3))
+        return data[:, 0].astype(np.int64), data[:, 1].astype(np.int32), data[:, 2]
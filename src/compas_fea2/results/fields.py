@@ -106,6 +106,11 @@ class FieldResults(FEAData):
 
     @property
     def results(self) -> list:
+        """The :class:`compas_fea2.results.Result` objects of the step.
+
+        Creating one object per row is slow for large fields: use
+        :meth:`to_numpy` when only the values are needed.
+        """
         return self._get_results_from_db(columns=self.components_names)[self.step]
 
     @property
@@ -118,11 +123,179 @@ class FieldResults(FEAData):
 
         Yields
         ------
-        :class:`compas.geometry.Point`
+        :class:`compas_fea2.model.Node` | :class:`compas_fea2.model._Element`
             The location where the field is defined.
         """
-        for r in self.results:
-            yield r.location
+        keys, _, _ = self.to_numpy(columns=[])
+        yield from self._members(keys)
+
+    @property
+    def _members_attr(self):
+        return "nodes" if self.results_func == "find_node_by_key" else "elements"
+
+    def _members(self, keys):
+        """Nodes or elements of the model with the given keys."""
+        lookup = {}
+        for part in self.model.parts:
+            for member in getattr(part, self._members_attr):
+                lookup.setdefault(member.key, member)
+        return [lookup.get(key) for key in keys.tolist()]
+
+    def _members_filters(self, members, filters):
+        if not isinstance(members, Iterable):
+            members = [members]
+        filters["key"] = set([member.key for member in members])
+        filters["part"] = set([member.part.name for member in members])
+
+    def to_numpy(self, columns=None, members=None, filters=None, structured=False):
+        """Get the results of the step as arrays, without creating
+        :class:`compas_fea2.results.Result` objects.
+
+        Parameters
+        ----------
+        columns : list[str], optional
+            The components to retrieve, by default :attr:`components_names`.
+        members : list, optional
+            Only retrieve the results of these nodes or elements.
+        filters : dict, optional
+            Other filtering criteria as {"column_name": [admissible values]}.
+        structured : bool, optional
+            If ``True``, return a structured array, by default ``False``.
+
+        Returns
+        -------
+        tuple(:class:`numpy.ndarray`, :class:`numpy.ndarray`, :class:`numpy.ndarray`) | :class:`numpy.ndarray`
+            The keys (n,) and part keys (n,) of the members and the values of
+            the components (n, len(columns)), in the order of the database.
+            Parts not in the model have key -1 and missing values are ``nan``.
+            If `structured` is ``True``, a single array with the fields
+            ``"key"``, ``"part"`` and one field per component.
+
+        Notes
+        -----
+        The values are read-only, as they are shared through the
+        :attr:`compas_fea2.problem.Problem.results_cache`: copy them before
+        modifying them in place.
+        """
+        columns, part_column, filters = self._array_query(columns, members, filters)
+
+        def query():
+            rows = self.rdb.get_rows(self.field_name, ["key", part_column] + columns, filters)
+            data = np.array(rows, dtype=float) if rows else np.empty((0, len(columns) + 2))
+            # the array is shared by the users of the cache
+            data.setflags(write=False)
+            return data
+
+        data = self._cached(("array", tuple(columns), part_column), filters, query, lambda data: data.nbytes)
+
+        keys = data[:, 0].astype(np.int64)
+        part_keys = data[:, 1].astype(np.int32)
+        if not structured:
+            return keys, part_keys, data[:, 2:]
+        array = np.empty(len(data), dtype=[("key", np.int64), ("part", np.int32)] + [(c, np.float64) for c in columns])
+        array["key"] = keys
+        array["part"] = part_keys
+        for i, c in enumerate(columns):
+            array[c] = data[:, i + 2]
+        return array
+
+    def _array_query(self, columns, members, filters):
+        columns = list(self.components_names if columns is None else columns)
+        filters = dict(filters or {})
+        filters["step"] = [self.step.name]
+        if members is not None:
+            self._members_filters(members, filters)
+
+        # part names are turned into part keys by the database, so that all the columns are numbers
+        return columns, self.rdb.part_key_column(self.model.parts), filters
+
+    def iter_chunks(self, columns=None, members=None, filters=None, size=None):
+        """Iterate over the results of the step in chunks of arrays, so that
+        large fields are processed in constant memory.
+
+        Parameters
+        ----------
+        columns : list[str], optional
+            The components to retrieve, by default :attr:`components_names`.
+        members : list, optional
+            Only retrieve the results of these nodes or elements.
+        filters : dict, optional
+            Other filtering criteria as {"column_name": [admissible values]}.
+        size : int, optional
+            The number of results of each chunk, by default
+            :attr:`compas_fea2.results.database.SQLiteResultsDatabase.CHUNK_SIZE`.
+
+        Yields
+        ------
+        tuple(:class:`numpy.ndarray`, :class:`numpy.ndarray`, :class:`numpy.ndarray`)
+            The keys, part keys and values of each chunk, as in :meth:`to_numpy`.
+
+        Notes
+        -----
+        The chunks are read directly from the database, without going through
+        the :attr:`compas_fea2.problem.Problem.results_cache`.
+        """
+        columns, part_column, filters = self._array_query(columns, members, filters)
+        for data in self.rdb.iter_rows(self.field_name, ["key", part_column] + columns, filters, size=size):
+            yield data[:, 0].astype(np.int64), data[:, 1].astype(np.int32), data[:, 2:]
+
+    def map_chunks(self, function, columns=None, members=None, filters=None, size=None):
+        """Apply a function to each chunk of the results of the step.
+
+        Parameters
+        ----------
+        function : callable
+            Function called with the keys, part keys and values of each chunk
+            (see :meth:`iter_chunks`).
+        columns, members, filters, size
+            See :meth:`iter_chunks`.
+
+        Yields
+        ------
+        object
+            The output of the function for each chunk.
+
+        Examples
+        --------
+        Export the displacements to a CSV file:
+
+        >>> with open("u.csv", "w") as f:  # doctest: +SKIP
+        ...     for _ in field.map_chunks(lambda keys, parts, values: np.savetxt(f, np.column_stack([keys, values]), delimiter=",")):
+        ...         pass
+        """
+        for keys, parts, values in self.iter_chunks(columns=columns, members=members, filters=filters, size=size):
+            yield function(keys, parts, values)
+
+    def reduce(self, function, initial, columns=None, members=None, filters=None, size=None):
+        """Accumulate the chunks of the results of the step.
+
+        Parameters
+        ----------
+        function : callable
+            Function ``function(accumulator, keys, parts, values)`` returning
+            the new accumulator for each chunk (see :meth:`iter_chunks`).
+        initial : object
+            The initial value of the accumulator.
+        columns, members, filters, size
+            See :meth:`iter_chunks`.
+
+        Returns
+        -------
+        object
+            The final value of the accumulator.
+
+        Examples
+        --------
+        Maximum displacement magnitude and histogram of the x component:
+
+        >>> field.reduce(lambda m, keys, parts, values: max(m, np.linalg.norm(values, axis=1).max()), 0.0, columns=["x", "y", "z"])  # doctest: +SKIP
+        >>> bins = np.linspace(-1.0, 1.0, 21)  # doctest: +SKIP
+        >>> field.reduce(lambda h, keys, parts, values: h + np.histogram(values[:, 0], bins)[0], np.zeros(20, int), columns=["x"])  # doctest: +SKIP
+        """
+        accumulator = initial
+        for keys, parts, values in self.iter_chunks(columns=columns, members=members, filters=filters, size=size):
+            accumulator = function(accumulator, keys, parts, values)
+        return accumulator
 
     def _get_results_from_db(self, members=None, columns=None, filters=None, func=None, **kwargs):
         """Get the results for the given members and steps.
@@ -150,17 +323,29 @@ class FieldResults(FEAData):
         filters["step"] = [self.step.name]
 
         if members:
-            if not isinstance(members, Iterable):
-                members = [members]
-            filters["key"] = set([member.key for member in members])
-            filters["part"] = set([member.part.name for member in members])
+            self._members_filters(members, filters)
 
         all_columns = ["step", "part", "key"] + columns
 
-        results_set = self.rdb.get_rows(self.field_name, all_columns, filters, func)
-        results_set = [{k: v for k, v in zip(all_columns, row)} for row in results_set]
+        def query():
+            results_set = self.rdb.get_rows(self.field_name, all_columns, filters, func)
+            return self.rdb.to_result(results_set, results_func=self.results_func, field_name=self.field_name, columns=all_columns, **kwargs)
+
+        if kwargs:
+            return query()
+        results = self._cached(("results", tuple(columns), tuple(func or ())), filters, query, self._results_size)
+        return {step: list(step_results) for step, step_results in results.items()}
 
-        return self.rdb.to_result(results_set, results_func=self.results_func, field_name=self.field_name, **kwargs)
+    def _cached(self, key, filters, compute, nbytes):
+        """Get the output of a query through the results cache of the problem."""
+        cache = self.problem.results_cache
+        if cache is None:
+            return compute()
+        key = (self.step.name, self.field_name) + key + (frozenset((k, frozenset(v)) for k, v in filters.items()),)
+        return cache.get_or_compute(getattr(self.rdb, "db_uri", None) or self.problem.path_db, key, compute, nbytes)
+
+    def _results_size(self, results):
+        return sum(len(step_results) for step_results in results.values()) * self.problem.results_cache.RESULT_SIZE
 
     def get_result_at(self, location):
         """Get the result for a given location.
@@ -183,14 +368,15 @@ class FieldResults(FEAData):
         Parameters
         ----------
         component : str
-            The component to retrieve the maximum result for.
+            The component to retrieve the maximum result for, or the name of
+            one of the :attr:`sql_expressions`.
 
         Returns
         -------
         :class:`compas_fea2.results.Result`
             The appropriate Result object.
         """
-        func = ["DESC", component]
+        func = ["DESC", self._sql_expression(component)]
         return self._get_results_from_db(columns=self.components_names, func=func)[self.step][0]
 
     def get_min_result(self, component):
@@ -199,16 +385,135 @@ class FieldResults(FEAData):
         Parameters
         ----------
         component : str
-            The component to retrieve the minimum result for.
+            The component to retrieve the minimum result for, or the name of
+            one of the :attr:`sql_expressions`.
 
         Returns
         -------
         :class:`compas_fea2.results.Result`
             The appropriate Result object.
         """
-        func = ["ASC", component]
+        func = ["ASC", self._sql_expression(component)]
         return self._get_results_from_db(columns=self.components_names, func=func)[self.step][0]
 
+    @property
+    def sql_expressions(self) -> dict:
+        """SQL expressions of the quantities computed by the database from the
+        components (e.g. magnitudes), by name. They can be used in place of the
+        components in :meth:`aggregate`, :meth:`envelope`,
+        :meth:`get_max_result` and :meth:`get_min_result`."""
+        return {}
+
+    def _sql_expression(self, component):
+        if component in self.components_names:
+            return component
+        expressions = self.sql_expressions
+        if component in expressions:
+            return "({})".format(expressions[component])
+        raise ValueError(f"Component '{component}' is not valid. Choose from {self.components_names + list(expressions)}.")
+
+    def _steps_filter(self, steps):
+        return [step if isinstance(step, str) else step.name for step in steps]
+
+    def aggregate(self, component, functions=("max", "min", "sum", "mean"), by=None, members=None, filters=None, steps=None):
+        """Aggregate a component in the database, so that only the aggregated
+        values are returned.
+
+        Parameters
+        ----------
+        component : str
+            The component, or the name of one of the :attr:`sql_expressions`.
+        functions : list[str], optional
+            The aggregations, among ``"max"``, ``"min"``, ``"sum"``, ``"mean"``
+            and ``"count"``.
+        by : str | dict | list, optional
+            The grouping of the results:
+
+            * ``None`` (default): all the results together;
+            * ``"part"``: by part;
+            * ``"step"``: by step, over all the steps of the problem unless
+              `steps` is given;
+            * a dict {label: group}, or a list of groups, where each group is
+              a :class:`compas_fea2.model.NodesGroup`,
+              :class:`compas_fea2.model.ElementsGroup` or a list of members.
+              A member can belong to several groups.
+
+        members : list, optional
+            Only aggregate the results of these nodes or elements.
+        filters : dict, optional
+            Other filtering criteria as {"column_name": [admissible values]}.
+        steps : list, optional
+            The steps, or their names, by default the step of the field.
+
+        Returns
+        -------
+        dict
+            The aggregations by name, or, if `by` is given, a dictionary with
+            the aggregations of each part, step or group. The groups of a list
+            are labelled by the group object, or by their index in the list if
+            they are lists of members. Groups without results are not included.
+
+        Examples
+        --------
+        >>> step.displacement_field.aggregate("magnitude", ["max", "mean"], by="part")  # doctest: +SKIP
+        """
+        expression = self._sql_expression(component)
+        functions = list(functions)
+        if steps is None:
+            steps = self.problem.steps_order if by == "step" else [self.step]
+        filters = dict(filters or {})
+        filters["step"] = self._steps_filter(steps)
+        if members is not None:
+            self._members_filters(members, filters)
+
+        if by is None:
+            rows = self.rdb.aggregate(self.field_name, expression, functions, filters)
+            return dict(zip(functions, rows[0]))
+
+        if by in ("part", "step"):
+            rows = self.rdb.aggregate(self.field_name, expression, functions, filters, group_by=[by])
+            if by == "part":
+                lookup = {part.name: part for part in self.model.parts}
+            else:
+                lookup = {step.name: step for step in self.problem.steps}
+            return {lookup.get(row[0], row[0]): dict(zip(functions, row[1:])) for row in rows}
+
+        if isinstance(by, dict):
+            labels, groups = list(by.keys()), list(by.values())
+        elif isinstance(by, (list, tuple)):
+            # the lists of members are not hashable: they are labelled by index
+            groups = list(by)
+            labels = [i if isinstance(group, (list, tuple, set)) else group for i, group in enumerate(groups)]
+        else:
+            raise ValueError("Invalid grouping {!r}, use 'part', 'step', a dict or a list of groups".format(by))
+        groups = [[(member.part.name, member.key) for member in getattr(group, self._members_attr, group)] for group in groups]
+        rows = self.rdb.aggregate(self.field_name, expression, functions, filters, groups=groups)
+        return {labels[row[0]]: dict(zip(functions, row[1:])) for row in rows}
+
+    def envelope(self, component, function="max", steps=None):
+        """Extreme value of a component at each member over several steps.
+
+        Parameters
+        ----------
+        component : str
+            The component, or the name of one of the :attr:`sql_expressions`.
+        function : str, optional
+            ``"max"`` (default) or ``"min"``, or any other aggregation of
+            :meth:`aggregate`.
+        steps : list, optional
+            The steps, or their names, by default all the steps of the problem.
+
+        Returns
+        -------
+        tuple(:class:`numpy.ndarray`, :class:`numpy.ndarray`, :class:`numpy.ndarray`)
+            The keys (n,) and part keys (n,) of the members and the envelope (n,).
+        """
+        _, part_column, filters = self._array_query([], None, None)
+        filters["step"] = self._steps_filter(steps or self.problem.steps_order)
+        rows = self.rdb.aggregate(self.field_name, self._sql_expression(component), [function], filters, group_by=["key", part_column])
+        data = np.array(rows, dtype=float) if rows else np.empty((0, 3))
+        return data[:, 0].astype(np.int64), data[:, 1].astype(np.int32), data[:, 2]
+
     def get_limits_component(self, component):
         """Get the result objects with the min and max value of a given component in a step.
 
@@ -222,12 +527,12 @@ class FieldResults(FEAData):
         list
             A list containing the result objects with the minimum and maximum value of the given component in the step.
         """
-        return [self.get_min_result(component, self.step), self.get_max_result(component, self.step)]
+        return [self.get_min_result(component), self.get_max_result(component)]
 
     def component_scalar(self, component):
         """Return the value of selected component."""
-        for result in self.results:
-            yield getattr(result, component, None)
+        _, _, values = self.to_numpy(columns=[component])
+        yield from values[:, 0].tolist()
 
     def filter_by_component(self, component, threshold=None):
         """Filter results by a specific component, optionally using a threshold.
@@ -247,10 +552,14 @@ class FieldResults(FEAData):
         if component not in self.components_names:
             raise ValueError(f"Component '{component}' is not valid. Choose from {self.components_names}.")
 
-        for result in self.results:
-            component_value = getattr(result, component, None)
-            if component_value is not None and (threshold is None or component_value >= threshold):
-                yield result
+        keys, _, values = self.to_numpy(columns=[component])
+        mask = ~np.isnan(values[:, 0])
+        if threshold is not None:
+            mask &= values[:, 0] >= threshold
+        if not mask.any():
+            return
+        # only the selected results are created
+        yield from self._get_results_from_db(members=[m for m in self._members(keys[mask]) if m], columns=self.components_names)[self.step]
 
 
 # ------------------------------------------------------------------------------
@@ -294,6 +603,14 @@ class NodeFieldResults(FieldResults):
     def results_func(self):
         return self._results_func
 
+    @property
+    def sql_expressions(self):
+        translations, rotations = self.components_names[:3], self.components_names[3:]
+        return {
+            "magnitude": "sqrt({})".format(" + ".join("{0}*{0}".format(c) for c in translations)),
+            "rotation_magnitude": "sqrt({})".format(" + ".join("{0}*{0}".format(c) for c in rotations)),
+        }
+
     @property
     def vectors(self):
         """Return the vectors where the field is defined.
@@ -303,8 +620,9 @@ class NodeFieldResults(FieldResults):
         :class:`compas.geometry.Vector`
             The vector where the field is defined.
         """
-        for r in self.results:
-            yield r.vector
+        _, _, values = self.to_numpy(columns=self.components_names[:3])
+        for row in values.tolist():
+            yield Vector(*row)
 
     @property
     def vectors_rotation(self):
@@ -315,8 +633,9 @@ class NodeFieldResults(FieldResults):
         :class:`compas.geometry.Vector`
             The vector where the field is defined.
         """
-        for r in self.results:
-            yield r.vector_rotation
+        _, _, values = self.to_numpy(columns=self.components_names[3:])
+        for row in values.tolist():
+            yield Vector(*row)
 
     def compute_resultant(self, sub_set=None):
         """Compute the translation resultant, moment resultant, and location of the field.
@@ -334,36 +653,32 @@ class NodeFieldResults(FieldResults):
             and location as a :class:`compas.geometry.Point`.
         """
         from compas.geometry import Point
-        from compas.geometry import centroid_points_weighted
-        from compas.geometry import cross_vectors
-        from compas.geometry import sum_vectors
 
-        results_subset = list(filter(lambda x: x.location in sub_set, self.results)) if sub_set else self.results
-        vectors = [r.vector for r in results_subset]
-        locations = [r.location.xyz for r in results_subset]
-        resultant_location = Point(*centroid_points_weighted(locations, [v.length for v in vectors]))
-        resultant_vector = sum_vectors(vectors)
-        moment_vector = sum_vectors(cross_vectors(Vector(*loc) - resultant_location, vec) for loc, vec in zip(locations, vectors))
+        keys, _, vectors = self.to_numpy(columns=self.components_names[:3], members=sub_set or None)
+        locations = np.array([node.xyz for node in self._members(keys)], dtype=float).reshape(-1, 3)
+        weights = np.linalg.norm(vectors, axis=1)
+        resultant_location = weights @ locations / weights.sum()
+        resultant_vector = vectors.sum(axis=0)
+        moment_vector = np.cross(locations - resultant_location, vectors).sum(axis=0)
 
-        return Vector(*resultant_vector), Vector(*moment_vector), resultant_location
+        return Vector(*resultant_vector.tolist()), Vector(*moment_vector.tolist()), Point(*resultant_location.tolist())
+
+    def _components_vectors(self, columns, components):
+        _, _, values = self.to_numpy(columns=columns)
+        values = values.copy()
+        for i, c in enumerate(["x", "y", "z"]):
+            if c not in components:
+                values[:, i] = 0
+        for row in values.tolist():
+            yield Vector(*row)
 
     def components_vectors(self, components):
         """Return a vector representing the given components."""
-        for vector in self.vectors:
-            v_copy = vector.copy()
-            for c in ["x", "y", "z"]:
-                if c not in components:
-                    setattr(v_copy, c, 0)
-            yield v_copy
+        yield from self._components_vectors(self.components_names[:3], components)
 
     def components_vectors_rotation(self, components):
         """Return a vector representing the given components."""
-        for vector in self.results.vectors_rotation:
-            v_copy = vector.copy()
-            for c in ["x", "y", "z"]:
-                if c not in components:
-                    setattr(v_copy, c, 0)
-            yield v_copy
+        yield from self._components_vectors(self.components_names[3:], components)
 
 
 class DisplacementFieldResults(NodeFieldResults):
@@ -645,32 +960,44 @@ class StressFieldResults(ElementFieldResults):
     def invariants_names(self):
         return ["von_mises_stress", "principal_stress_min", "principal_stress_mid", "principal_stress_max"]
 
+    @property
+    def sql_expressions(self):
+        # computed from the stored components: for shells, at the plane of the stored results
+        return {
+            "von_mises_stress": "sqrt(0.5 * ((s11 - s22) * (s11 - s22) + (s22 - s33) * (s22 - s33) + (s33 - s11) * (s33 - s11) + 6 * (s12 * s12 + s23 * s23 + s13 * s13)))",
+        }
+
     def get_component_value(self, component, **kwargs):
         """Return the value of the selected component."""
         if component not in self.components_names:
-            for result in self.results:
-                yield getattr(result, component, None)
-        else:
-            raise (ValueError(f"Component '{component}' is not valid. Choose from {self.components_names}."))
+            raise ValueError(f"Component '{component}' is not valid. Choose from {self.components_names}.")
+        yield from self.component_scalar(component)
 
-    def get_invariant_value(self, invariant, **kwargs):
+    def get_invariant_value(self, invariant, plane="mid", **kwargs):
         """Return the value of the selected invariant."""
         if invariant not in self.invariants_names:
-            for result in self.results:
-                yield getattr(result, invariant, None)
+            raise ValueError(f"Invariant '{invariant}' is not valid. Choose from {self.invariants_names}.")
+        if invariant == "von_mises_stress":
+            values = self.von_mises_stress(plane)
         else:
-            raise (ValueError(f"Invariant '{invariant}' is not valid. Choose from {self.invariants_names}."))
-
-    def global_stresses(self, plane="mid"):
-        """Compute stress tensors in the global coordinate system."""
+            principal = np.linalg.eigvalsh(self.global_stresses(plane))
+            values = principal[:, ["principal_stress_min", "principal_stress_mid", "principal_stress_max"].index(invariant)]
+        yield from values.tolist()
+
+    def _global_stresses(self, plane="mid"):
+        """Elements and stress tensors in the global coordinate system, 2D
+        elements first."""
+        keys, _, values = self.to_numpy(columns=self.components_names)
+        elements = self._members(keys)
+        ndim = np.array([element.ndim if element else 0 for element in elements])
         new_frame = Frame.worldXY()
+        groups_elements = []
         transformed_tensors = []
 
-        grouped_results = self.grouped_results
-
-        # Process 2D elements
-        if 2 in grouped_results:
-            results_2d = grouped_results[2]
+        # Process 2D elements: the stresses of the plane depend on the type of shell result
+        mask_2d = ndim == 2
+        if mask_2d.any():
+            results_2d = self._get_results_from_db(members=[e for e, m in zip(elements, mask_2d) if m], columns=self.components_names)[self.step]
             local_stresses_2d = np.array([r.plane_results(plane).local_stress for r in results_2d])
 
             # Zero out out-of-plane components
@@ -689,55 +1016,59 @@ class StressFieldResults(ElementFieldResults):
                     rotation_matrices_2d,
                 )
             )
+            groups_elements.extend(r.element for r in results_2d)
 
-        # Process 3D elements
-        if 3 in grouped_results:
-            results_3d = grouped_results[3]
-            local_stresses_3d = np.array([r.local_stress for r in results_3d])
+        # Process 3D elements: the tensors are assembled from the components
+        mask_3d = ndim == 3
+        if mask_3d.any():
+            s11, s22, s33, s12, s23, s13 = values[mask_3d].T
+            local_stresses_3d = np.stack([np.stack([s11, s12, s13], axis=-1), np.stack([s12, s22, s23], axis=-1), np.stack([s13, s23, s33], axis=-1)], axis=1)
             transformed_tensors.append(local_stresses_3d)
+            groups_elements.extend(e for e, m in zip(elements, mask_3d) if m)
 
         if not transformed_tensors:
-            return np.empty((0, 3, 3))
+            return [], np.empty((0, 3, 3))
 
-        return np.concatenate(transformed_tensors, axis=0)
-
-    def average_stress_at_nodes(self, component="von_mises_stress"):
-        """
-        Compute the nodal average of von Mises stress using efficient NumPy operations.
+        return groups_elements, np.concatenate(transformed_tensors, axis=0)
 
-        Returns
-        -------
-        np.ndarray
-            (N_nodes,) array containing the averaged von Mises stress per node.
-        """
-        # Compute von Mises stress at element level
-        element_von_mises = self.von_mises_stress()  # Shape: (N_elements,)
+    def global_stresses(self, plane="mid"):
+        """Compute stress tensors in the global coordinate system."""
+        return self._global_stresses(plane)[1]
 
+    def _average_at_nodes(self, elements, values):
         # Extract all node indices in a single operation
-        node_indices = np.array([n.key for e in self.results for n in e.element.nodes])  # Shape (N_total_entries,)
+        node_indices = np.array([n.key for e in elements for n in e.nodes])  # Shape (N_total_entries,)
 
-        # Repeat von Mises stress for each node in the corresponding element
-        node_counts = [len(e.element.nodes) for e in self.results]
-        repeated_von_mises = np.repeat(element_von_mises, repeats=node_counts, axis=0)  # Shape (N_total_entries,)
+        # Repeat the values for each node in the corresponding element
+        repeated_values = np.repeat(values, repeats=[len(e.nodes) for e in elements], axis=0)  # Shape (N_total_entries, ...)
 
         # Get the number of unique nodes
         max_node_index = node_indices.max() + 1
 
         # Initialize accumulators for sum and count
-        nodal_stress_sum = np.zeros(max_node_index)  # Summed von Mises stresses
-        nodal_counts = np.zeros(max_node_index)  # Count occurrences per node
+        nodal_sum = np.zeros((max_node_index,) + values.shape[1:])
+        nodal_counts = np.zeros((max_node_index,) + (1,) * (values.ndim - 1))
 
-        # Accumulate stresses and counts at each node
-        np.add.at(nodal_stress_sum, node_indices, repeated_von_mises)
+        # Accumulate values and counts at each node
+        np.add.at(nodal_sum, node_indices, repeated_values)
         np.add.at(nodal_counts, node_indices, 1)
 
         # Prevent division by zero
         nodal_counts[nodal_counts == 0] = 1
 
-        # Compute final nodal von Mises stress average
-        nodal_avg_von_mises = nodal_stress_sum / nodal_counts
+        return nodal_sum / nodal_counts
 
-        return nodal_avg_von_mises  # Shape: (N_nodes,)
+    def average_stress_at_nodes(self, component="von_mises_stress"):
+        """
+        Compute the nodal average of von Mises stress using efficient NumPy operations.
+
+        Returns
+        -------
+        np.ndarray
+            (N_nodes,) array containing the averaged von Mises stress per node.
+        """
+        elements, stress_tensors = self._global_stresses()
+        return self._average_at_nodes(elements, self._von_mises(stress_tensors))  # Shape: (N_nodes,)
 
     def average_stress_tensor_at_nodes(self):
         """
@@ -748,33 +1079,17 @@ class StressFieldResults(ElementFieldResults):
         np.ndarray
             (N_nodes, 3, 3) array containing the averaged stress tensor per node.
         """
-        # Compute global stress tensor at the element level
-        element_stresses = self.global_stresses()  # Shape: (N_elements, 3, 3)
+        elements, stress_tensors = self._global_stresses()
+        return self._average_at_nodes(elements, stress_tensors)  # Shape: (N_nodes, 3, 3)
 
-        # Extract all node indices in a single operation
-        node_indices = np.array([n.key for e in self.results for n in e.element.nodes])  # Shape (N_total_entries,)
-
-        # Repeat stress tensors for each node in the corresponding element
-        repeated_stresses = np.repeat(element_stresses, repeats=[len(e.element.nodes) for e in self.results], axis=0)  # Shape (N_total_entries, 3, 3)
-
-        # Get the number of unique nodes
-        max_node_index = node_indices.max() + 1
-
-        # Initialize accumulators for sum and count
-        nodal_stress_sum = np.zeros((max_node_index, 3, 3))  # Summed stress tensors
-        nodal_counts = np.zeros((max_node_index, 1, 1))  # Count occurrences per node
-
-        # Accumulate stresses and counts at each node
-        np.add.at(nodal_stress_sum, node_indices, repeated_stresses)
-        np.add.at(nodal_counts, node_indices, 1)
-
-        # Prevent division by zero
-        nodal_counts[nodal_counts == 0] = 1
-
-        # Compute final nodal stress tensor average
-        nodal_avg_stress = nodal_stress_sum / nodal_counts
+    @staticmethod
+    def _von_mises(stress_tensors):
+        # Extract stress components
+        S11, S22, S33 = stress_tensors[:, 0, 0], stress_tensors[:, 1, 1], stress_tensors[:, 2, 2]
+        S12, S23, S13 = stress_tensors[:, 0, 1], stress_tensors[:, 1, 2], stress_tensors[:, 0, 2]
 
-        return nodal_avg_stress  # Shape: (N_nodes, 3, 3)
+        # Compute von Mises stress
+        return np.sqrt(0.5 * ((S11 - S22) ** 2 + (S22 - S33) ** 2 + (S33 - S11) ** 2 + 6 * (S12**2 + S23**2 + S13**2)))
 
     def von_mises_stress(self, plane="mid"):
         """
@@ -785,16 +1100,7 @@ class StressFieldResults(ElementFieldResults):
         np.ndarray
             Von Mises stress values per element.
         """
-        stress_tensors = self.global_stresses(plane)  # Shape: (N_elements, 3, 3)
-
-        # Extract stress components
-        S11, S22, S33 = stress_tensors[:, 0, 0], stress_tensors[:, 1, 1], stress_tensors[:, 2, 2]
-        S12, S23, S13 = stress_tensors[:, 0, 1], stress_tensors[:, 1, 2], stress_tensors[:, 0, 2]
-
-        # Compute von Mises stress
-        sigma_vm = np.sqrt(0.5 * ((S11 - S22) ** 2 + (S22 - S33) ** 2 + (S33 - S11) ** 2 + 6 * (S12**2 + S23**2 + S13**2)))
-
-        return sigma_vm
+        return self._von_mises(self.global_stresses(plane))
 
     def principal_components(self, plane="mid"):
         """
@@ -1,6 +1,3 @@
-import matplotlib.pyplot as plt
-
-
 class StressHistoryResult:
     def __init__(self, **kwargs):
         super(StressHistoryResult, self).__init__(**kwargs)
@@ -17,6 +14,8 @@ class StressHistoryResult:
         Plots the stress path for the specified stress components.
         :param stress_components: A tuple of the stress components to plot (default is ('S11', 'S22')).
         """
+        import matplotlib.pyplot as plt
+
         # Extract the stress components from the history
         stress_x = [stress[stress_components[0]] for stress in self.stress_history]
         stress_y = [stress[stress_components[1]] for stress in self.stress_history]
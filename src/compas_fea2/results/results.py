@@ -2,7 +2,6 @@ import base64
 import os
 from io import BytesIO
 
-import matplotlib.pyplot as plt
 import numpy as np
 from compas.geometry import Frame
 from compas.geometry import Transformation
@@ -928,6 +927,8 @@ class StressResult(ElementResult):
         """
         Draws the three Mohr's circles for a 3D stress state.
         """
+        import matplotlib.pyplot as plt
+
         x, y, center, radius, sigma_x, sigma_y, tau_xy = self.compute_mohr_circle_2d()
         # Plotting
         fig = plt.figure(figsize=(8, 8))
@@ -967,6 +968,7 @@ class StressResult(ElementResult):
         """
         Draws the three Mohr's circles for a 3D stress state.
         """
+        import matplotlib.pyplot as plt
 
         circles = self.compute_mohrs_circles_3d()
 
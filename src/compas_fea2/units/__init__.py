@@ -1,4 +1,8 @@
 import os
+from functools import lru_cache
+
+import numpy as np
+from pint import Quantity
 from pint import UnitRegistry
 
 HERE = os.path.dirname(__file__)
@@ -6,5 +10,99 @@ HERE = os.path.dirname(__file__)
 # U.define('@alias pascal = Pa')
 
 
-def units(system="SI"):
+@lru_cache(maxsize=None)
+def _registry(system):
+    return UnitRegistry(os.path.join(HERE, "fea2_en.txt"), system=system)
+
+
+def units(system="SI", cache=True):
+    """Unit registry of compas_fea2 for a unit system.
+
+    Parameters
+    ----------
+    system : str, optional
+        Name of the unit system, by default ``"SI"``.
+    cache : bool, optional
+        If ``True`` (default), return the registry shared by the whole process
+        for `system`, so that the definitions are parsed only once and
+        quantities created in different places can be combined.
+        If ``False``, build a new independent registry.
+
+    Returns
+    -------
+    :class:`pint.UnitRegistry`
+
+    """
+    if cache:
+        return _registry(system)
     return UnitRegistry(os.path.join(HERE, "fea2_en.txt"), system=system)
+
+
+def to_base_magnitude(value):
+    """Convert quantities to their magnitude in the base units.
+
+    Scalar quantities and quantities wrapping a NumPy array are converted by
+    pint directly. Sequences and object arrays of scalar quantities (for
+    example a list of coordinates) are grouped by unit, and each group is
+    converted with a single vectorized call instead of one call per value.
+
+    Parameters
+    ----------
+    value : :class:`pint.Quantity` | list | tuple | :class:`numpy.ndarray`
+        The value to convert. Items that are not quantities are kept as they
+        are.
+
+    Returns
+    -------
+    float | list | tuple | :class:`numpy.ndarray`
+        The magnitudes, in a container of the same type as `value`.
+
+    """
+    if isinstance(value, Quantity):
+        return value.to_base_units().magnitude
+    if not isinstance(value, (list, tuple, np.ndarray)):
+        return value
+
+    if isinstance(value, np.ndarray):
+        flat = value.astype(object).ravel()
+    else:
+        flat = []
+        template = _flatten(value, flat)
+
+    groups = {}
+    last_units, indices = None, None
+    for i, item in enumerate(flat):
+        if isinstance(item, Quantity):
+            # comparing unit containers is slow, reuse the group of the previous item when possible
+            if item._units is not last_units:
+                last_units = item._units
+                indices = groups.setdefault((item._REGISTRY, last_units), [])
+            indices.append(i)
+    for (registry, unit), indices in groups.items():
+        magnitudes = np.array([flat[i].magnitude for i in indices])
+        converted = registry.Quantity(magnitudes, unit).to_base_units().magnitude
+        for i, magnitude in zip(indices, np.ravel(converted).tolist()):
+            flat[i] = magnitude
+
+    if isinstance(value, np.ndarray):
+        array = flat.reshape(value.shape)
+        try:
+            return array.astype(float)
+        except (TypeError, ValueError):
+            return array
+    return _unflatten(template, iter(flat))
+
+
+def _flatten(value, flat):
+    if isinstance(value, (list, tuple)):
+        return type(value), [_flatten(item, flat) for item in value]
+    flat.append(value)
+    return None
+
+
+def _unflatten(template, items):
+    if template is None:
+        return next(items)
+    kind, children = template
+    values = [_unflatten(child, items) for child in children]
+    return tuple(values) if kind is tuple else values
@@ -0,0 +1,279 @@
+import hashlib
+import re
+import struct
+from enum import Enum
+
+import numpy as np
+
+# Attributes that identify an object but do not change the analysis.
+_IGNORED_ATTRIBUTES = {
+    "_registration",
+    "uid",
+    "_guid",
+    "_name",
+    "_part_key",
+    "_graph",
+    "_path",
+    "_path_db",
+    "_rdb",
+    "_results_cache",
+    "_results",
+    "_fingerprint",
+}
+
+# Names generated by FEAData when none is given, e.g. "P_140234". They depend on
+# id() and are not hashed, the names given by the user are.
+_DEFAULT_NAME = re.compile(r"^[A-Z]*_\d+$")
+
+
+def invalidate_fingerprint(obj):
+    """Discard the fingerprints memoised on an object and on the objects it is
+    registered to (e.g. the part of a node).
+
+    Called by the setters that change the data hashed by :class:`Fingerprinter`.
+    """
+    while obj is not None:
+        obj.__dict__.pop("_fingerprint", None)
+        obj = obj._registration
+
+
+class Fingerprinter:
+    """Compute stable content hashes of models, parts, problems and steps.
+
+    The hashes only depend on the data that affects the analysis: geometry,
+    connectivity, sections, materials, boundary conditions, loads, step settings,
+    requested outputs and the names given to the objects, which appear in the
+    input files. Generated names, uids, ``id()`` values and the iteration order
+    of sets do not change the result.
+
+    Parts and steps are hashed separately and their digests are then combined,
+    so the same object is never hashed twice within one :class:`Fingerprinter`.
+    The digest of the nodes and elements of each part is also memoised on the
+    part, until they change (see :func:`invalidate_fingerprint`), so the mesh
+    is only hashed again after it is modified.
+
+    Parameters
+    ----------
+    algorithm : str, optional
+        Name of the :mod:`hashlib` algorithm, by default ``"sha256"``.
+
+    """
+
+    def __init__(self, algorithm="sha256"):
+        self.algorithm = algorithm
+        self._digests = {}
+        self._objects = []
+        self._in_progress = set()
+
+    def new(self, tag):
+        hasher = hashlib.new(self.algorithm)
+        hasher.update(tag.encode())
+        return hasher
+
+    # =========================================================================
+    #                           Model objects
+    # =========================================================================
+
+    def model(self, model):
+        """Digest of a :class:`compas_fea2.model.Model`."""
+        if id(model) in self._digests:
+            return self._digests[id(model)]
+        hasher = self.new("Model")
+        hasher.update(self._name(model))
+        for digest in sorted(self.part(part) for part in model.parts):
+            hasher.update(digest)
+        for attr in ("_materials", "_sections", "_bcs", "_ics", "_constraints", "_connectors", "_interfaces", "_constants"):
+            hasher.update(self.value(getattr(model, attr, None)))
+        return self._store(model, hasher)
+
+    def part(self, part):
+        """Digest of a :class:`compas_fea2.model._Part`.
+
+        Nodes are hashed as arrays sorted by their key in the part, elements
+        are grouped by type and number of nodes and hashed as connectivity
+        arrays.
+        """
+        if id(part) in self._digests:
+            return self._digests[id(part)]
+        hasher = self.new(type(part).__name__)
+        hasher.update(self._name(part))
+        mesh, sections = self._mesh(part)
+        hasher.update(mesh)
+        # the sections are hashed again: they can change without the elements
+        for section in sections:
+            hasher.update(self.value(section))
+        hasher.update(self.value(part._materials))
+        hasher.update(self.value(part._releases))
+        hasher.update(self.value(part.reference_point.xyz if part.reference_point else None))
+        return self._store(part, hasher)
+
+    def _mesh(self, part):
+        # digest of the nodes and elements, memoised on the part, and the
+        # sections in the order of their indices in the digest
+        token = (self.algorithm, len(part._nodes), len(part._elements))
+        memo = part.__dict__.get("_fingerprint")
+        if memo is not None and memo[0] == token:
+            return memo[1], memo[2]
+        hasher = self.new("Mesh")
+
+        nodes = sorted(part._nodes, key=lambda n: n._part_key)
+        self._update_array(hasher, np.array([n.xyz for n in nodes], dtype=float).reshape(-1, 3))
+        self._update_array(hasher, np.array([[np.nan if m is None else m for m in n.mass] for n in nodes], dtype=float, ndmin=2))
+        self._update_array(hasher, np.array([np.nan if n.temperature is None else n.temperature for n in nodes], dtype=float))
+
+        groups = {}
+        section_index = {}
+        sections = []
+        for element in sorted(part._elements, key=lambda e: e._part_key):
+            groups.setdefault((type(element).__name__, len(element.nodes)), []).append(element)
+            if id(element.section) not in section_index:
+                section_index[id(element.section)] = len(sections)
+                sections.append(element.section)
+        for (name, size), elements in sorted(groups.items()):
+            hasher.update("{}:{}".format(name, size).encode())
+            self._update_array(hasher, np.array([[n._part_key for n in e.nodes] for e in elements], dtype=np.int64))
+            self._update_array(hasher, np.array([section_index[id(e.section)] for e in elements], dtype=np.int64))
+            self._update_array(hasher, np.array([self._frame(e.frame) for e in elements], dtype=float))
+            hasher.update("\n".join("{}|{}".format(e.implementation, e.rigid) for e in elements).encode())
+        part.__dict__["_fingerprint"] = (token, hasher.digest(), sections)
+        return hasher.digest(), sections
+
+    # =========================================================================
+    #                           Problem objects
+    # =========================================================================
+
+    def problem(self, problem):
+        """Digest of a :class:`compas_fea2.problem.Problem` and of its model."""
+        if id(problem) in self._digests:
+            return self._digests[id(problem)]
+        hasher = self.new(type(problem).__name__)
+        hasher.update(self._name(problem))
+        if problem.model:
+            hasher.update(self.model(problem.model))
+        for step in problem.steps_order:
+            hasher.update(self.step(step))
+        return self._store(problem, hasher)
+
+    def step(self, step):
+        """Digest of a :class:`compas_fea2.problem._Step`."""
+        return self.value(step)
+
+    # =========================================================================
+    #                           Generic values
+    # =========================================================================
+
+    def value(self, obj):
+        """Digest of a generic value.
+
+        Nodes and elements are identified by the digest of their part and by
+        their key in the part. Other compas_fea2 objects are hashed through
+        their attributes, compas objects through their ``__data__``.
+        """
+        from compas_fea2.base import FEAData
+        from compas_fea2.model.elements import _Element
+        from compas_fea2.model.nodes import Node
+        from compas_fea2.model.parts import _Part
+
+        if obj is None or isinstance(obj, (bool, int, float, str, bytes, np.number)):
+            return self._scalar(obj)
+
+        if isinstance(obj, np.ndarray):
+            hasher = self.new("ndarray")
+            self._update_array(hasher, obj)
+            return hasher.digest()
+
+        if isinstance(obj, (list, tuple)):
+            hasher = self.new(type(obj).__name__)
+            for item in obj:
+                hasher.update(self.value(item))
+            return hasher.digest()
+
+        if isinstance(obj, (set, frozenset)):
+            hasher = self.new("set")
+            for digest in sorted(self.value(item) for item in obj):
+                hasher.update(digest)
+            return hasher.digest()
+
+        if isinstance(obj, dict):
+            hasher = self.new("dict")
+            for item in sorted(self.value(k) + self.value(v) for k, v in obj.items()):
+                hasher.update(item)
+            return hasher.digest()
+
+        if isinstance(obj, Enum):
+            return self._scalar("{}.{}".format(type(obj).__name__, obj.name))
+
+        if isinstance(obj, type):
+            return self._scalar("{}.{}".format(obj.__module__, obj.__qualname__))
+
+        if isinstance(obj, (Node, _Element)):
+            hasher = self.new(type(obj).__name__)
+            hasher.update(self.part(obj.part) if obj.part else self._scalar(None))
+            hasher.update(self._scalar(obj._part_key))
+            return hasher.digest()
+
+        if isinstance(obj, _Part):
+            return self.part(obj)
+
+        if id(obj) in self._digests:
+            return self._digests[id(obj)]
+        if id(obj) in self._in_progress:
+            return self._scalar("<cycle>")
+
+        if isinstance(obj, FEAData):
+            self._in_progress.add(id(obj))
+            hasher = self.new(type(obj).__name__)
+            hasher.update(self._name(obj))
+            for name, attr in sorted(vars(obj).items()):
+                if name not in _IGNORED_ATTRIBUTES:
+                    hasher.update(name.encode())
+                    hasher.update(self.value(attr))
+            self._in_progress.discard(id(obj))
+            return self._store(obj, hasher)
+
+        if hasattr(obj, "__data__"):
+            hasher = self.new(type(obj).__name__)
+            hasher.update(self.value(obj.__data__))
+            return self._store(obj, hasher)
+
+        if hasattr(obj, "magnitude"):
+            return self.value(obj.to_base_units().magnitude)
+
+        return self._scalar(type(obj).__qualname__)
+
+    # =========================================================================
+    #                           Helpers
+    # =========================================================================
+
+    def _store(self, obj, hasher):
+        digest = hasher.digest()
+        self._digests[id(obj)] = digest
+        # keep the object alive so that its id is not reused while hashing
+        self._objects.append(obj)
+        return digest
+
+    def _name(self, obj):
+        name = obj.__dict__.get("_name")
+        return self._scalar(None if name is None or _DEFAULT_NAME.match(name) else name)
+
+    def _scalar(self, value):
+        hasher = self.new(type(value).__name__)
+        if isinstance(value, (float, np.floating)):
+            hasher.update(struct.pack("<d", float(value)))
+        elif isinstance(value, bytes):
+            hasher.update(value)
+        else:
+            hasher.update(str(value).encode())
+        return hasher.digest()
+
+    @staticmethod
+    def _update_array(hasher, array):
+        array = np.ascontiguousarray(array)
+        hasher.update(str((array.dtype.str, array.shape)).encode())
+        hasher.update(array.tobytes())
+
+    @staticmethod
+    def _frame(frame):
+        if frame is None:
+            return [np.nan] * 9
+        return list(frame.point) + list(frame.xaxis) + list(frame.yaxis)
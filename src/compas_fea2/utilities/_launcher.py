@@ -0,0 +1,327 @@
+import asyncio
+import contextvars
+import os
+import signal
+import subprocess
+import sys
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextlib import nullcontext
+
+from compas_fea2 import VERBOSE
+
+# Environment variables setting the number of threads of a solver. Backends can
+# append the ones specific to their solver.
+THREAD_VARIABLES = ["OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS", "NUMEXPR_NUM_THREADS", "VECLIB_MAXIMUM_THREADS"]
+
+
+class ProcessResources:
+    """Threads and CPUs assigned to the solver processes of an analysis.
+
+    Parameters
+    ----------
+    threads : int, optional
+        Number of threads of each process, by default 1.
+    cpus : list[int], optional
+        CPUs the processes are pinned to, by default ``None`` (no pinning).
+        Pinning is only supported on Linux.
+
+    """
+
+    def __init__(self, threads=1, cpus=None):
+        self.threads = threads
+        self.cpus = cpus
+
+    def __repr__(self):
+        return "{}(threads={}, cpus={})".format(self.__class__.__name__, self.threads, self.cpus)
+
+    def environment(self):
+        """Environment variables limiting the number of threads of a process.
+
+        Returns
+        -------
+        dict[str, str]
+
+        """
+        return {name: str(self.threads) for name in THREAD_VARIABLES}
+
+    @contextmanager
+    def pinned(self):
+        """Pin the calling thread to the CPUs, if any and if supported by the
+        platform, while the processes are started in the context.
+
+        The processes started in the context, and any process they start (e.g.
+        through a shell), inherit the affinity. The affinity of the thread is
+        restored when leaving the context, so only the start of the processes
+        should happen in it.
+
+        """
+        previous = None
+        if self.cpus and hasattr(os, "sched_setaffinity"):
+            try:
+                previous = os.sched_getaffinity(0)
+                os.sched_setaffinity(0, self.cpus)
+            except OSError:
+                previous = None
+        try:
+            yield
+        finally:
+            if previous is not None:
+                os.sched_setaffinity(0, previous)
+
+
+_resources = contextvars.ContextVar("compas_fea2_process_resources", default=None)
+
+
+def current_resources():
+    """The :class:`ProcessResources` of the current analysis, if any."""
+    return _resources.get()
+
+
+@contextmanager
+def process_resources(resources):
+    """Assign resources to the processes launched in the context.
+
+    Parameters
+    ----------
+    resources : :class:`ProcessResources`
+        The resources.
+
+    """
+    token = _resources.set(resources)
+    try:
+        yield resources
+    finally:
+        _resources.reset(token)
+
+
+def available_cpus():
+    """CPUs available to the current process.
+
+    Returns
+    -------
+    list[int]
+
+    """
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+class ProcessResult:
+    """Exit information of a process run by :func:`launch_process_async`.
+
+    Attributes
+    ----------
+    args : list[str] | str
+        The command.
+    pid : int
+        Process id.
+    returncode : int
+        Exit code of the process. Negative values are the number of the signal
+        that terminated it (POSIX only).
+    timeout : str
+        ``"wall"`` or ``"idle"`` if the process was killed because of a timeout,
+        otherwise ``None``.
+    cancelled : bool
+        ``True`` if the process was killed because the task was cancelled.
+    start, end : float
+        Start and end time, as returned by :func:`time.time`.
+    tail : :class:`collections.deque`
+        Last lines of output of the process.
+
+    """
+
+    def __init__(self, args, pid, tail_size=20):
+        self.args = args
+        self.pid = pid
+        self.returncode = None
+        self.timeout = None
+        self.cancelled = False
+        self.start = time.time()
+        self.end = None
+        self.tail = deque(maxlen=tail_size)
+
+    def __repr__(self):
+        return "{}(pid={}, returncode={}, timeout={}, cancelled={})".format(self.__class__.__name__, self.pid, self.returncode, self.timeout, self.cancelled)
+
+    @property
+    def duration(self):
+        return (self.end or time.time()) - self.start
+
+    @property
+    def ok(self):
+        """``True`` if the process completed with exit code 0."""
+        return self.returncode == 0 and not self.timeout and not self.cancelled
+
+    def check(self):
+        """Raise an error if the process did not complete successfully.
+
+        Raises
+        ------
+        subprocess.TimeoutExpired
+            If the process was killed because of a timeout.
+        subprocess.CalledProcessError
+            If the process exited with a non-zero return code.
+
+        """
+        if self.timeout:
+            raise subprocess.TimeoutExpired(self.args, self.duration, output="\n".join(self.tail))
+        if self.returncode:
+            raise subprocess.CalledProcessError(self.returncode, self.args, output="\n".join(self.tail))
+        return self
+
+
+def kill_process_tree(pid):
+    """Kill a process and all its children.
+
+    The process must have been started in a new session (POSIX) or process
+    group (Windows), as done by :func:`launch_process_async`.
+
+    Parameters
+    ----------
+    pid : int
+        Id of the parent process.
+
+    """
+    try:
+        if sys.platform == "win32":
+            subprocess.run(["taskkill", "/F", "/T", "/PID", str(pid)], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        else:
+            os.killpg(os.getpgid(pid), signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+async def launch_process_async(cmd_args, cwd=None, env=None, parsers=None, timeout=None, idle_timeout=None, verbose=False, tail_size=20):
+    """Run a process and stream its output to parsers without blocking the event loop.
+
+    Several solvers can run concurrently from the same event loop, e.g. with
+    :func:`asyncio.gather`. If the task is cancelled, or a timeout expires,
+    the process and all its children are killed.
+
+    Parameters
+    ----------
+    cmd_args : list[str] | str
+        The command. A string is run through the shell.
+    cwd : str, optional
+        Path where to start the process, by default the current folder.
+    env : dict, optional
+        Environment variables added to the ones of the current process.
+        The thread variables of the current :class:`ProcessResources` (see
+        :func:`process_resources`) are also added.
+    parsers : list[callable], optional
+        Functions called with each line of output (without the line ending)
+        and the name of the stream (``"stdout"`` or ``"stderr"``). The current
+        :class:`compas_fea2.job.SolverMonitor`, if any, is added to them.
+    timeout : float, optional
+        Maximum duration of the process in seconds.
+    idle_timeout : float, optional
+        Maximum time in seconds without any output from the process.
+    verbose : bool, optional
+        Print the output of the process, by default ``False``.
+    tail_size : int, optional
+        Number of lines of output kept in the result, by default 20.
+
+    Returns
+    -------
+    :class:`ProcessResult`
+        The exit information. Use :meth:`ProcessResult.check` to raise an error
+        if the process failed.
+
+    """
+    from compas_fea2.job.monitor import current_monitor
+
+    monitor = current_monitor()
+    if monitor:
+        parsers = list(parsers or []) + [monitor]
+    resources = current_resources()
+    full_env = os.environ.copy()
+    if resources:
+        full_env.update(resources.environment())
+    full_env.update(env or {})
+    options = {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP} if sys.platform == "win32" else {"start_new_session": True}
+    kwargs = dict(stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE, cwd=cwd, env=full_env, **options)
+    # the process is spawned before the first suspension of the coroutine, so
+    # no other task of the loop runs while the thread is pinned
+    with resources.pinned() if resources else nullcontext():
+        if isinstance(cmd_args, str):
+            process = await asyncio.create_subprocess_shell(cmd_args, **kwargs)
+        else:
+            process = await asyncio.create_subprocess_exec(*cmd_args, **kwargs)
+
+    result = ProcessResult(cmd_args, process.pid, tail_size=tail_size)
+    last_output = [time.monotonic()]
+    verbose = verbose or VERBOSE
+
+    async def read(stream, name):
+        while True:
+            line = await stream.readline()
+            if not line:
+                break
+            last_output[0] = time.monotonic()
+            line = line.decode(errors="replace").rstrip("\r\n")
+            result.tail.append(line)
+            if verbose:
+                print(line)
+            for parser in parsers or ():
+                parser(line, name)
+
+    async def watch():
+        readers = asyncio.gather(read(process.stdout, "stdout"), read(process.stderr, "stderr"))
+        try:
+            while True:
+                if idle_timeout is None:
+                    await asyncio.shield(readers)
+                    break
+                remaining = idle_timeout - (time.monotonic() - last_output[0])
+                if remaining <= 0:
+                    result.timeout = "idle"
+                    raise asyncio.TimeoutError
+                try:
+                    await asyncio.wait_for(asyncio.shield(readers), remaining)
+                    break
+                except asyncio.TimeoutError:
+                    continue
+            await process.wait()
+        except BaseException:
+            readers.cancel()
+            # mark the error of the readers as retrieved
+            readers.add_done_callback(lambda f: f.cancelled() or f.exception())
+            raise
+
+    try:
+        await asyncio.wait_for(watch(), timeout)
+    except asyncio.TimeoutError:
+        result.timeout = result.timeout or "wall"
+        kill_process_tree(process.pid)
+    except asyncio.CancelledError:
+        result.cancelled = True
+        kill_process_tree(process.pid)
+        await process.wait()
+        raise
+    finally:
+        if result.timeout:
+            await process.wait()
+        result.returncode = process.returncode
+        result.end = time.time()
+    return result
+
+
+def run_process(cmd_args, **kwargs):
+    """Run a process with :func:`launch_process_async` from synchronous code.
+
+    Parameters
+    ----------
+    cmd_args : list[str] | str
+        The command.
+    kwargs
+        Other arguments of :func:`launch_process_async`.
+
+    Returns
+    -------
+    :class:`ProcessResult`
+
+    """
+    return asyncio.run(launch_process_async(cmd_args, **kwargs))
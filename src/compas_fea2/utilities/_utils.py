@@ -4,6 +4,7 @@ import subprocess
 import sys
 import threading
 import time
+from contextlib import nullcontext
 from functools import wraps
 from time import perf_counter
 from typing import Generator
@@ -13,13 +14,19 @@ from compas_fea2 import VERBOSE
 
 
 def with_spinner(message="Running"):
-    """Decorator to add a spinner animation to a function."""
+    """Decorator to add a spinner animation to a function.
+
+    The progress of the :class:`compas_fea2.job.SolverMonitor` of the current
+    analysis, if any, is shown next to the spinner.
+    """
 
     def decorator(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
+            from compas_fea2.job.monitor import current_monitor
+
             stop_event = threading.Event()
-            spinner_thread = threading.Thread(target=spinner_animation, args=(message, stop_event))
+            spinner_thread = threading.Thread(target=spinner_animation, args=(message, stop_event, current_monitor()))
             spinner_thread.start()
             try:
                 result = func(*args, **kwargs)
@@ -33,16 +40,21 @@ def with_spinner(message="Running"):
     return decorator
 
 
-def spinner_animation(message, stop_event):
+def spinner_animation(message, stop_event, monitor=None):
     """Spinner animation for indicating progress."""
     spinner = "|/-\\"
     idx = 0
+    width = 0
     while not stop_event.is_set():
-        sys.stdout.write(f"\r{message} {spinner[idx % len(spinner)]}")
+        text = f"{message} {spinner[idx % len(spinner)]}"
+        if monitor:
+            text = f"{text} {monitor.status()}"
+        width = max(width, len(text))
+        sys.stdout.write(f"\r{text.ljust(width)}")
         sys.stdout.flush()
         time.sleep(0.2)  # Adjust for speed
         idx += 1
-    sys.stdout.write("\rDone!               \n")  # Clear the line when done
+    sys.stdout.write("\r{}\n".format("Done!".ljust(max(width, 20))))  # Clear the line when done
 
 
 def timer(_func=None, *, message=None):
@@ -91,13 +103,37 @@ def launch_process(cmd_args: list[str], cwd: Optional[str] = None, verbose: bool
         If the command executable is not found.
     subprocess.CalledProcessError
         If the subprocess exits with a non-zero return code.
+
+    See Also
+    --------
+    :func:`compas_fea2.utilities._launcher.launch_process_async`
+        Asynchronous version with timeouts and cancellation.
+
+    Notes
+    -----
+    The number of threads and the CPUs of the current
+    :class:`compas_fea2.utilities._launcher.ProcessResources`, if any, are
+    applied to the subprocess. The output is also fed to the current
+    :class:`compas_fea2.job.SolverMonitor`, if any.
     """
+    from compas_fea2.job.monitor import current_monitor
+    from compas_fea2.utilities._launcher import current_resources
+
     try:
         env = os.environ.copy()
-        with subprocess.Popen(cmd_args, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, cwd=cwd, shell=True, env=env, **kwargs) as process:
+        resources = current_resources()
+        if resources:
+            env.update(resources.environment())
+        with resources.pinned() if resources else nullcontext():
+            process = subprocess.Popen(cmd_args, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, cwd=cwd, shell=True, env=env, **kwargs)
+        with process:
             assert process.stdout is not None
+            monitor = current_monitor()
             for line in process.stdout:
-                yield line.decode(errors="replace").strip()
+                line = line.decode(errors="replace").strip()
+                if monitor:
+                    monitor(line)
+                yield line
 
             process.wait()
             if process.returncode != 0:
@@ -221,26 +257,86 @@ def problem_method(f):
     -------
     [var]
         List results of the method per each problem in the model.
+
+    Notes
+    -----
+    If the keyword argument `workers` is passed and is not ``1``, or if
+    `cores` is passed, the problems are run concurrently by a
+    :class:`compas_fea2.job.Scheduler` with that number of workers and total
+    number of cores. The other problems are completed even if one fails, and
+    a :class:`RuntimeError` with the status report is raised at the end.
+
+    If ``executor="spool"`` is passed, the problems are run by the workers of
+    the spool directory given as `spool` (see
+    :class:`compas_fea2.job.SpoolDirectory`), and the method waits for them.
     """
 
     @wraps(f)
-    def wrapper(*args, **kwargs):
+    def wrapper(*args, workers=None, cores=None, executor=None, spool=None, **kwargs):
         func_name = f.__qualname__.split(".")[-1]
         self_obj = args[0]
-        res = [vars for problem in self_obj.problems if (vars := getattr(problem, func_name)(*args[1::], **kwargs))]
+        if executor not in (None, "threads", "spool"):
+            raise ValueError("Unknown executor {!r}, use 'threads' or 'spool'".format(executor))
+        if executor == "spool":
+            from compas_fea2.job.spool import SpoolDirectory
+
+            if not spool:
+                raise ValueError("The spool directory must be provided with the spool executor")
+            SpoolDirectory(spool).run(self_obj.problems, func_name, *args[1::], **kwargs)
+            return []
+        if (workers is not None and workers != 1) or cores is not None:
+            from compas_fea2.job.scheduler import Scheduler
+
+            with Scheduler(workers=workers, cores=cores) as scheduler:
+                jobs = scheduler.run(self_obj.problems, func_name, *args[1::], **kwargs)
+            if scheduler.failed:
+                raise RuntimeError(scheduler.report()) from scheduler.failed[0].error
+            results = [job.result for job in jobs]
+        else:
+            results = [getattr(problem, func_name)(*args[1::], **kwargs) for problem in self_obj.problems]
+        res = [vars for vars in results if vars]
         res = list(itertools.chain.from_iterable(res))
         return res
 
     return wrapper
 
 
+def _has_quantities(value):
+    """Check if a value is a pint Quantity or a sequence or array containing one."""
+    # there are no quantities until pint is imported, and pint and numpy are
+    # only imported here once they are loaded
+    if "pint" not in sys.modules:
+        return False
+    import numpy as np
+    from pint import Quantity
+
+    def check(value):
+        if isinstance(value, Quantity):
+            return True
+        if isinstance(value, (list, tuple)):
+            return any(check(item) for item in value)
+        if isinstance(value, np.ndarray) and value.dtype == object:
+            return any(isinstance(item, Quantity) for item in value.flat)
+        return False
+
+    return check(value)
+
+
 def to_dimensionless(func):
-    """Decorator to convert pint Quantity objects to dimensionless in the base units."""
+    """Decorator to convert pint Quantity objects to dimensionless in the base units.
+
+    Sequences and arrays of quantities are converted in bulk with
+    :func:`compas_fea2.units.to_base_magnitude`, which keeps the items that
+    are not quantities as they are.
+    """
 
     def wrapper(*args, **kwargs):
-        new_args = [a.to_base_units().magnitude if hasattr(a, "to_base_units") else a for a in args]
-        new_kwargs = {k: v.to_base_units().magnitude if hasattr(v, "to_base_units") else v for k, v in kwargs.items()}
-        return func(*new_args, **new_kwargs)
+        if any(_has_quantities(a) for a in args) or any(_has_quantities(v) for v in kwargs.values()):
+            from compas_fea2.units import to_base_magnitude
+
+            args = [to_base_magnitude(a) if _has_quantities(a) else a for a in args]
+            kwargs = {k: to_base_magnitude(v) if _has_quantities(v) else v for k, v in kwargs.items()}
+        return func(*args, **kwargs)
 
     wrapper.original = func  # Preserve the original function
     return wrapper
@@ -0,0 +1,74 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from compas_fea2.model import Model, Node
+from compas_fea2.model.parts import Part
+from compas_fea2.problem import Problem, StaticStep
+from compas_fea2.job import ResultsCache
+
+
+class CountingProblem(Problem):
+    runs = 0
+
+    def analyse_and_extract(self, path=None, erase_data=False, *args, **kwargs):
+        CountingProblem.runs += 1
+        self._check_analysis_path(path, erase_data)
+        connection = sqlite3.connect(self.path_db)
+        connection.execute("CREATE TABLE u (id INTEGER PRIMARY KEY AUTOINCREMENT, key INTEGER, step TEXT, part TEXT, x REAL)")
+        connection.execute("INSERT INTO u (key, step, part, x) VALUES (0, ?, ?, 1.0)", (self.steps_order[0].name, list(self.model.parts)[0].name))
+        connection.commit()
+        connection.close()
+
+
+class TestResultsCache(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.cache = ResultsCache(os.path.join(self.folder, "cache"))
+        CountingProblem.runs = 0
+
+    def build(self):
+        model = Model()
+        part = Part()
+        part.add_node(Node([0, 0, 0]))
+        model.add_part(part)
+        problem = model.add_problem(CountingProblem())
+        problem.add_step(StaticStep())
+        problem.cache = self.cache
+        return model, problem
+
+    def test_hit_skips_analysis(self):
+        _, problem = self.build()
+        problem.analyse_and_extract(os.path.join(self.folder, "a"), erase_data=True)
+        model, problem = self.build()
+        problem.analyse_and_extract(os.path.join(self.folder, "b"), erase_data=True)
+        self.assertEqual(CountingProblem.runs, 1)
+        self.assertEqual(self.cache.hits, 1)
+        row = sqlite3.connect(problem.path_db).execute("SELECT step, part FROM u").fetchone()
+        self.assertEqual(row, (problem.steps_order[0].name, list(model.parts)[0].name))
+
+    def test_options_in_key(self):
+        _, problem = self.build()
+        problem.analyse_and_extract(os.path.join(self.folder, "a"), erase_data=True, restart=False)
+        _, problem = self.build()
+        problem.analyse_and_extract(os.path.join(self.folder, "b"), erase_data=True, restart=True)
+        _, problem = self.build()
+        problem.analyse_and_extract(os.path.join(self.folder, "c"), erase_data=True, restart=True)
+        self.assertEqual(CountingProblem.runs, 2)
+        self.assertEqual(self.cache.hits, 1)
+        _, problem = self.build()
+        problem.analyse_and_extract(os.path.join(self.folder, "d"), erase_data=True, callback=print)
+        self.assertEqual(CountingProblem.runs, 3)
+        self.assertEqual(len(self.cache.entries), 2)
+
+    def test_evict(self):
+        _, problem = self.build()
+        problem.analyse_and_extract(os.path.join(self.folder, "a"), erase_data=True)
+        self.assertEqual(len(self.cache.entries), 1)
+        self.cache.clear()
+        self.assertEqual(self.cache.entries, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
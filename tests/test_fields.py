@@ -0,0 +1,498 @@
+import os
+import pickle
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from compas_fea2.model import Model
+from compas_fea2.model import Node
+from compas_fea2.model import Steel
+from compas_fea2.model.elements import TetrahedronElement
+from compas_fea2.model.parts import Part
+from compas_fea2.model.sections import SolidSection
+from compas_fea2.problem import Problem
+from compas_fea2.problem import StaticStep
+from compas_fea2.results import DisplacementFieldResults
+from compas_fea2.results import ResultsFederation
+from compas_fea2.results import StressFieldResults
+from compas_fea2.results.cache import FieldResultsCache
+from compas_fea2.results.database import HDF5ResultsDatabase
+from compas_fea2.results.database import MemmapResultsDatabase
+
+
+class FieldsTestCase(unittest.TestCase):
+    """A model with two tetrahedra and the results of one static step."""
+
+    def setUp(self):
+        self.model = Model(name="fields")
+        self.part = self.model.add_part(Part(name="block"))
+        self.nodes = self.part.add_nodes([Node(xyz) for xyz in ([0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1], [1, 1, 1])])
+        section = SolidSection(material=Steel.S355())
+        self.elements = [self.part.add_element(TetrahedronElement(nodes=[self.nodes[i] for i in indices], section=section)) for indices in ([0, 1, 2, 3], [1, 2, 3, 4])]
+        self.model.assign_keys()
+        self.problem = self.model.add_problem(Problem(name="static"))
+        self.step = self.problem.add_step(StaticStep(name="load"))
+        self.problem.path = tempfile.mkdtemp()
+
+        connection = sqlite3.connect(self.problem.path_db)
+        connection.execute("CREATE TABLE u (id INTEGER PRIMARY KEY, key INTEGER, step TEXT, part TEXT, x REAL, y REAL, z REAL, rx REAL, ry REAL, rz REAL)")
+        connection.executemany(
+            "INSERT INTO u (key, step, part, x, y, z, rx, ry, rz) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [(node.key, "load", "block", float(i), 0.0, 1.0, 0.0, 0.0, float(i)) for i, node in enumerate(self.nodes)],
+        )
+        connection.execute("CREATE TABLE s (id INTEGER PRIMARY KEY, key INTEGER, step TEXT, part TEXT, s11 REAL, s22 REAL, s33 REAL, s12 REAL, s23 REAL, s13 REAL)")
+        connection.executemany(
+            "INSERT INTO s (key, step, part, s11, s22, s33, s12, s23, s13) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [(self.elements[0].key, "load", "block", 1.0, 0.0, 0.0, 0.0, 0.0, 0.0), (self.elements[1].key, "load", "block", 2.0, 2.0, 2.0, 1.0, 0.0, 0.0)],
+        )
+        connection.commit()
+        connection.close()
+
+    def tearDown(self):
+        self.problem.rdb.close()
+
+
+class TestToNumpy(FieldsTestCase):
+    def test_plain(self):
+        keys, parts, values = self.step.displacement_field.to_numpy()
+        self.assertEqual(keys.tolist(), [node.key for node in self.nodes])
+        self.assertEqual(parts.tolist(), [self.part.key] * 5)
+        self.assertEqual(values.shape, (5, 6))
+        self.assertEqual(values[:, 0].tolist(), [0.0, 1.0, 2.0, 3.0, 4.0])
+
+    def test_structured_and_members(self):
+        array = self.step.displacement_field.to_numpy(columns=["x", "z"], members=self.nodes[1:3], structured=True)
+        self.assertEqual(array.dtype.names, ("key", "part", "x", "z"))
+        self.assertEqual(array["x"].tolist(), [1.0, 2.0])
+        keys, _, values = self.step.displacement_field.to_numpy(filters={"key": [-1]})
+        self.assertEqual((keys.shape, values.shape), ((0,), (0, 6)))
+
+    def test_aggregates(self):
+        field = self.step.displacement_field
+        self.assertEqual(list(field.component_scalar("x")), [0.0, 1.0, 2.0, 3.0, 4.0])
+        self.assertEqual(list(field.locations), self.nodes)
+        self.assertEqual([v.z for v in field.vectors], [1.0] * 5)
+        self.assertEqual([v.z for v in field.vectors_rotation], [0.0, 1.0, 2.0, 3.0, 4.0])
+        self.assertEqual([v.z for v in field.components_vectors(["x"])], [0.0] * 5)
+        self.assertEqual([r.node for r in field.filter_by_component("x", threshold=3)], self.nodes[3:])
+
+        resultant, moment, location = field.compute_resultant()
+        self.assertEqual(list(resultant), [10.0, 0.0, 5.0])
+        weights = np.linalg.norm([[i, 0, 1] for i in range(5)], axis=1)
+        np.testing.assert_allclose(list(location), weights @ np.array([n.xyz for n in self.nodes]) / weights.sum())
+
+    def test_stresses(self):
+        field = self.step.stress_field
+        tensors = field.global_stresses()
+        np.testing.assert_allclose(tensors[1], [[2.0, 1.0, 0.0], [1.0, 2.0, 0.0], [0.0, 0.0, 2.0]])
+        np.testing.assert_allclose(field.von_mises_stress(), [1.0, np.sqrt(3.0)])
+        self.assertEqual(list(field.get_invariant_value("principal_stress_max")), [1.0, 3.0])
+        averages = field.average_stress_at_nodes()
+        self.assertAlmostEqual(averages[self.nodes[0].key], 1.0)
+        self.assertAlmostEqual(averages[self.nodes[1].key], (1.0 + np.sqrt(3.0)) / 2)
+        with self.assertRaises(ValueError):
+            list(field.get_component_value("s99"))
+
+
+class TestToResult(FieldsTestCase):
+    def test_rows_and_dicts(self):
+        rdb = self.problem.rdb
+        columns = ["key", "step", "part", "x", "y", "z", "rx", "ry", "rz"]
+        rows = [(node.key, "load", "block", 1.0, 2.0, 3.0, 0.0, 0.0, 0.0) for node in self.nodes]
+        results = rdb.to_result(rows, "find_node_by_key", "u", columns=columns)
+        self.assertEqual(list(results), [self.step])
+        self.assertEqual([r.node for r in results[self.step]], self.nodes)
+        self.assertEqual(results[self.step][0].y, 2.0)
+
+        dicts = [dict(zip(columns, row)) for row in rows[:2]]
+        results = rdb.to_result(dicts, "find_node_by_key", "u")
+        self.assertEqual([r.node for r in results[self.step]], self.nodes[:2])
+
+    def test_missing_member(self):
+        with self.assertRaises(ValueError):
+            columns = ["key", "step", "part", "x", "y", "z", "rx", "ry", "rz"]
+            self.problem.rdb.to_result([(-1, "load", "block", 0.0, 0.0, 0.0, 0.0, 0.0, 0.0)], "find_node_by_key", "u", columns=columns)
+
+
+class TestChunks(FieldsTestCase):
+    def test_iter_chunks(self):
+        field = self.step.displacement_field
+        chunks = list(field.iter_chunks(columns=["x", "z"], size=2))
+        self.assertEqual([len(keys) for keys, _, _ in chunks], [2, 2, 1])
+        keys, parts, values = field.to_numpy(columns=["x", "z"])
+        np.testing.assert_array_equal(np.concatenate([c[0] for c in chunks]), keys)
+        np.testing.assert_array_equal(np.concatenate([c[2] for c in chunks]), values)
+        self.assertEqual(list(field.map_chunks(lambda keys, parts, values: int(parts.sum()), size=3)), [3 * self.part.key, 2 * self.part.key])
+        self.assertEqual(field.reduce(lambda m, keys, parts, values: max(m, values[:, 0].max()), -np.inf, columns=["x"], size=2), 4.0)
+        self.assertEqual(field.reduce(lambda n, keys, parts, values: n + len(keys), 0, members=self.nodes[:2]), 2)
+
+    def test_iter_table(self):
+        chunks = list(self.problem.rdb.iter_table("s", size=1))
+        self.assertEqual(len(chunks), 2)
+        self.assertEqual(chunks[0].dtype["key"], np.int64)
+        self.assertEqual(chunks[0].dtype["s11"], np.float64)
+        self.assertEqual(chunks[1]["part"][0], "block")
+        rows = list(self.problem.rdb.iter_rows("s", ["s11", "NULL"], {"key": [self.elements[1].key]}))
+        self.assertEqual(rows[0][0, 0], 2.0)
+        self.assertTrue(np.isnan(rows[0][0, 1]))
+
+
+class TestAggregations(FieldsTestCase):
+    def test_aggregate(self):
+        field = self.step.displacement_field
+        stats = field.aggregate("x")
+        self.assertEqual(stats, {"max": 4.0, "min": 0.0, "sum": 10.0, "mean": 2.0})
+        self.assertAlmostEqual(field.aggregate("magnitude", ["max"])["max"], np.sqrt(17.0))
+        self.assertEqual(field.aggregate("x", ["sum"], by="part"), {self.part: {"sum": 10.0}})
+        groups = {"a": self.nodes[:2], "b": self.nodes[1:], "c": []}
+        self.assertEqual(field.aggregate("x", ["sum", "count"], by=groups), {"a": {"sum": 1.0, "count": 2}, "b": {"sum": 10.0, "count": 4}})
+        self.assertEqual(field.aggregate("x", ["sum", "count"], by=[self.nodes[:2], self.nodes[1:]]), {0: {"sum": 1.0, "count": 2}, 1: {"sum": 10.0, "count": 4}})
+        self.assertEqual(field.aggregate("x", ["max"], members=self.nodes[:3]), {"max": 2.0})
+        self.assertEqual(field.get_max_result("magnitude").node, self.nodes[4])
+        self.assertAlmostEqual(self.step.stress_field.aggregate("von_mises_stress", ["max"])["max"], np.sqrt(3.0))
+        with self.assertRaises(ValueError):
+            field.aggregate("x", ["median"])
+        with self.assertRaises(ValueError):
+            field.aggregate("s11")
+
+    def test_steps(self):
+        other = self.problem.add_step(StaticStep(name="other"))
+        connection = sqlite3.connect(self.problem.path_db)
+        connection.executemany("INSERT INTO u (key, step, part, x) VALUES (?, 'other', 'block', ?)", [(node.key, 5.0 - i) for i, node in enumerate(self.nodes)])
+        connection.commit()
+        connection.close()
+        field = self.step.displacement_field
+        by_step = field.aggregate("x", ["max"], by="step")
+        self.assertEqual(by_step, {self.step: {"max": 4.0}, other: {"max": 5.0}})
+        keys, parts, values = field.envelope("x")
+        envelope = dict(zip(keys.tolist(), values.tolist()))
+        self.assertEqual([envelope[node.key] for node in self.nodes], [5.0, 4.0, 3.0, 3.0, 4.0])
+        self.assertEqual(parts.tolist(), [self.part.key] * 5)
+        keys, _, values = field.envelope("x", "min", steps=["other"])
+        envelope = dict(zip(keys.tolist(), values.tolist()))
+        self.assertEqual([envelope[node.key] for node in self.nodes], [5.0, 4.0, 3.0, 2.0, 1.0])
+
+
+class TestFederation(FieldsTestCase):
+    def setUp(self):
+        super().setUp()
+        self.other = self.model.add_problem(Problem(name="wind"))
+        self.other.add_step(StaticStep(name="gust"))
+        self.other.path = tempfile.mkdtemp()
+        connection = sqlite3.connect(self.other.path_db)
+        connection.execute("CREATE TABLE u (id INTEGER PRIMARY KEY, key INTEGER, step TEXT, part TEXT, x REAL, y REAL, z REAL, rx REAL, ry REAL, rz REAL)")
+        connection.executemany(
+            "INSERT INTO u (key, step, part, x, y, z, rx, ry, rz) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [(node.key, "gust", "block", 5.0 - i, 0.0, 0.0, 0.0, 0.0, 0.0) for i, node in enumerate(self.nodes)],
+        )
+        connection.commit()
+        connection.close()
+        self.federation = ResultsFederation([self.problem, self.other], path=os.path.join(tempfile.mkdtemp(), "federation.db"))
+
+    def tearDown(self):
+        self.federation.close()
+        super().tearDown()
+
+    def test_queries(self):
+        u = self.federation.field("displacement_field")
+        problems, keys, parts, values = u.to_numpy(columns=["x"])
+        self.assertEqual(sorted(problems.tolist()), [0] * 5 + [1] * 5)
+        self.assertEqual(values.shape, (10, 1))
+        self.assertEqual(u.aggregate("x", ["max", "sum"]), {0: {"max": 4.0, "sum": 10.0}, 1: {"max": 5.0, "sum": 15.0}})
+        self.assertEqual(u.rank("x", "sum"), [(1, 15.0), (0, 10.0)])
+        with mock.patch.object(u, "aggregate", return_value={0: {"max": None}, 1: {"max": 2.0}, 2: {"max": None}, 3: {"max": 1.0}}):
+            self.assertEqual(u.rank("x"), [(1, 2.0), (3, 1.0), (0, None), (2, None)])
+            self.assertEqual(u.rank("x", descending=False), [(3, 1.0), (1, 2.0), (0, None), (2, None)])
+        self.assertEqual(u.aggregate("x", ["max"], problems=["wind"], members=self.nodes[2:]), {1: {"max": 3.0}})
+
+        keys, parts, envelope, governing = u.envelope("x")
+        by_key = {k: (v, g) for k, v, g in zip(keys.tolist(), envelope.tolist(), governing.tolist())}
+        self.assertEqual([by_key[node.key] for node in self.nodes], [(5.0, 1), (4.0, 1), (3.0, 1), (3.0, 0), (4.0, 0)])
+        self.assertEqual(parts.tolist(), [self.part.key] * 5)
+
+        keys, _, difference = u.difference("x", self.other, self.problem)
+        by_key = dict(zip(keys.tolist(), difference.tolist()))
+        self.assertEqual([by_key[node.key] for node in self.nodes], [5.0, 3.0, 1.0, -1.0, -3.0])
+
+    def test_merge(self):
+        self.assertIn("s", self.federation.merge())
+        self.assertIn("u_part_key_problem", [row[1] for row in self.federation.rdb.execute_query("PRAGMA index_list(u)")])
+        with self.assertRaises(FileNotFoundError):
+            ResultsFederation([self.model.add_problem(Problem(name="missing"))])
+
+
+class TestHDF5(FieldsTestCase):
+    def setUp(self):
+        super().setUp()
+        self.sqlite = self.problem.rdb
+        self.hdf5 = HDF5ResultsDatabase(self.problem)
+        for field in (self.step.displacement_field, self.step.stress_field):
+            columns = [name for name, _ in field.sqltable_schema["columns"][1:]]
+            self.hdf5.create_table_for_output_class(field, iter(self.sqlite.get_rows(field.field_name, columns, {"step": ["load"]})))
+
+    def tearDown(self):
+        self.problem._rdb = self.sqlite
+        super().tearDown()
+
+    def test_layout(self):
+        import h5py
+
+        self.assertEqual(self.hdf5.db_uri, self.problem.path_db[: -len(".db")] + ".h5")
+        with h5py.File(self.hdf5.db_uri, "r") as f:
+            self.assertEqual(f["u/load/values"].shape, (5, 6))
+            self.assertEqual(f["u/load/values"].compression, "gzip")
+            self.assertEqual(f["s/load/key"].shape, (2,))
+        self.assertEqual(sorted(self.hdf5.table_names), ["s", "u"])
+        self.assertEqual(self.hdf5.column_names("u"), ["key", "step", "part", "x", "y", "z", "rx", "ry", "rz"])
+        self.assertEqual(sorted(self.hdf5.get_table("s")), sorted(self.sqlite.get_rows("s", self.hdf5.column_names("s"), {"step": ["load"]})))
+        self.assertEqual(len(list(self.hdf5.iter_table("u", size=2))), 3)
+
+    def test_same_queries(self):
+        field = self.step.displacement_field
+        stress = self.step.stress_field
+        expected = (
+            field.to_numpy(),
+            field.aggregate("magnitude"),
+            field.aggregate("x", ["sum", "count"], by={"a": self.nodes[:2], "b": self.nodes[1:]}),
+            field.aggregate("x", ["max"], by="part"),
+            field.envelope("x"),
+            field.get_max_result("magnitude").node,
+            stress.von_mises_stress(),
+            stress.aggregate("von_mises_stress", ["max"], by="step"),
+        )
+        self.problem.rdb = "hdf5"
+        self.assertIsInstance(self.problem.rdb, HDF5ResultsDatabase)
+        actual = (
+            field.to_numpy(),
+            field.aggregate("magnitude"),
+            field.aggregate("x", ["sum", "count"], by={"a": self.nodes[:2], "b": self.nodes[1:]}),
+            field.aggregate("x", ["max"], by="part"),
+            field.envelope("x"),
+            field.get_max_result("magnitude").node,
+            stress.von_mises_stress(),
+            stress.aggregate("von_mises_stress", ["max"], by="step"),
+        )
+        for e, a in zip(expected[0], actual[0]):
+            np.testing.assert_array_equal(e, a)
+        self.assertEqual(expected[1]["max"], actual[1]["max"])
+        self.assertAlmostEqual(expected[1]["mean"], actual[1]["mean"])
+        self.assertEqual(expected[2:4], actual[2:4])
+        for e, a in zip(expected[4], actual[4]):
+            np.testing.assert_array_equal(e, a)
+        self.assertEqual(expected[5], actual[5])
+        np.testing.assert_allclose(expected[6], actual[6])
+        self.assertEqual(expected[7].keys(), actual[7].keys())
+        self.assertEqual([r.node for r in field.results], self.nodes)
+        self.assertEqual(sum(len(keys) for keys, _, _ in field.iter_chunks(size=2)), 5)
+
+    def test_read_while_writing(self):
+        import h5py
+
+        with h5py.File(self.hdf5.db_uri, "a", libver="latest") as f:
+            f.swmr_mode = True
+            reader = HDF5ResultsDatabase.from_path(self.hdf5.db_uri)
+            self.assertEqual(len(reader.get_rows("u", ["key"], {})), 5)
+            for name in ("key", "part", "values"):
+                dataset = f["u/load/" + name]
+                dataset.resize(6, axis=0)
+                dataset.flush()
+            self.assertEqual(len(reader.get_rows("u", ["key"], {})), 6)
+
+    def test_expressions(self):
+        self.assertEqual(self.hdf5.aggregate("u", "-abs(x) ** 2 + 1", ["min"]), [(-15.0,)])
+        for expression in ("().__class__.__base__.__subclasses__()", "__import__('os')", "x.real", "x +", "sqrt(x, y)", "w * 2", "x if z else y"):
+            with self.assertRaises(ValueError):
+                self.hdf5.aggregate("u", expression, ["max"])
+        with self.assertRaises(ValueError):
+            self.hdf5.get_rows("u", ["key"], {"open('f')": [1]})
+
+    def test_read_while_writing_other_process(self):
+        self.step.add_outputs([DisplacementFieldResults, StressFieldResults])
+        hdf5 = HDF5ResultsDatabase(self.problem)
+
+        def write(field):
+            columns = [name for name, _ in field.sqltable_schema["columns"][1:]]
+            hdf5.create_table_for_output_class(field, iter(self.sqlite.get_rows(field.field_name, columns, {"step": ["load"]})))
+
+        write(self.step.displacement_field)
+        # the reader keeps the file open while the next field is written
+        code = "\n".join(
+            [
+                "import sys",
+                "import compas_fea2.model",
+                "from compas_fea2.results.database import HDF5ResultsDatabase",
+                "db = HDF5ResultsDatabase.from_path(sys.argv[1])",
+                "f = db._open()",
+                "for line in sys.stdin:",
+                "    print(len(db.get_rows(line.strip(), ['key'], {})), flush=True)",
+            ]
+        )
+        reader = subprocess.Popen([sys.executable, "-c", code, hdf5.db_uri], stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+        try:
+            reader.stdin.write("u\n")
+            reader.stdin.flush()
+            self.assertEqual(reader.stdout.readline().strip(), "5")
+            write(self.step.stress_field)
+            reader.stdin.write("s\n")
+            reader.stdin.flush()
+            self.assertEqual(reader.stdout.readline().strip(), "2")
+        finally:
+            reader.stdin.close()
+            reader.wait()
+        self.assertIsNone(hdf5._writer_file)
+
+    def test_invalid_rows(self):
+        field = self.step.displacement_field
+        with self.assertRaises(ValueError):
+            self.hdf5.create_table_for_output_class(field, [(0, "other", "block", 0, 0, 0, 0, 0, 0)])
+        with self.assertRaises(ValueError):
+            self.hdf5.create_table_for_output_class(field, [(0, "load", "other", 0, 0, 0, 0, 0, 0)])
+
+
+class TestMemmap(FieldsTestCase):
+    def setUp(self):
+        super().setUp()
+        self.sqlite = self.problem.rdb
+        self.memmap = MemmapResultsDatabase(self.problem)
+        for field in (self.step.displacement_field, self.step.stress_field):
+            columns = [name for name, _ in field.sqltable_schema["columns"][1:]]
+            self.memmap.create_table_for_output_class(field, iter(self.sqlite.get_rows(field.field_name, columns, {"step": ["load"]})))
+
+    def tearDown(self):
+        self.problem._rdb = self.sqlite
+        super().tearDown()
+
+    def test_layout(self):
+        self.assertEqual(self.memmap.db_uri, self.problem.path_db[: -len(".db")] + ".memmap")
+        self.assertEqual(sorted(os.listdir(os.path.join(self.memmap.db_uri, "u"))), ["load.json", "load.key", "load.part", "load.values"])
+        self.assertEqual(os.path.getsize(os.path.join(self.memmap.db_uri, "u", "load.values")), 5 * 6 * 8)
+        with self.memmap._field("u") as field:
+            self.assertIsInstance(field.steps[0].values, np.memmap)
+            self.assertEqual(field.steps[0].part_ranges, {"0": [0, 5]})
+        self.assertEqual(self.memmap.table_names, ["s", "u"])
+        self.assertEqual(self.memmap.column_names("u"), ["key", "step", "part", "x", "y", "z", "rx", "ry", "rz"])
+        self.assertEqual(sorted(self.memmap.get_table("s")), sorted(self.sqlite.get_rows("s", self.memmap.column_names("s"), {"step": ["load"]})))
+        self.assertEqual(len(list(self.memmap.iter_table("u", size=2))), 3)
+        self.assertEqual(self.memmap.get_rows("u", ["key"], {"part": ["other"]}), [])
+
+    def test_same_queries(self):
+        field = self.step.displacement_field
+
+        def queries():
+            aggregates = (field.aggregate("magnitude"), field.aggregate("x", ["max"], by="part"))
+            return (field.to_numpy(), *aggregates, field.envelope("x"), field.get_max_result("magnitude").node, self.step.stress_field.von_mises_stress())
+
+        expected = queries()
+        self.problem.rdb = "memmap"
+        self.assertIsInstance(self.problem.rdb, MemmapResultsDatabase)
+        actual = queries()
+        for e, a in zip(expected[0] + expected[3], actual[0] + actual[3]):
+            np.testing.assert_array_equal(e, a)
+        self.assertEqual(expected[1]["max"], actual[1]["max"])
+        self.assertEqual(expected[2], actual[2])
+        self.assertEqual(expected[4], actual[4])
+        np.testing.assert_allclose(expected[5], actual[5])
+        self.assertEqual([r.node for r in field.results], self.nodes)
+
+    def test_aggregate_in_blocks(self):
+        # the partial aggregations of the blocks of 2 rows are combined
+        self.memmap.CHUNK_SIZE = 2
+        groups = [[("block", node.key) for node in self.nodes[:2]], [("block", node.key) for node in self.nodes[1:]], []]
+        for expression, functions, kwargs in (
+            ("x", ["max", "min", "sum", "mean", "count"], {}),
+            ("rz", ["max", "sum", "count"], {"group_by": ["part", "step"]}),
+            ("x", ["sum", "count"], {"groups": groups}),
+            ("x", ["max", "count"], {"filters": {"key": [-1]}}),
+        ):
+            expected = self.sqlite.aggregate("u", expression, functions, **kwargs)
+            self.assertEqual(self.memmap.aggregate("u", expression, functions, **kwargs), expected)
+
+    def test_read_while_writing(self):
+        field = self.step.displacement_field
+        reader = MemmapResultsDatabase.from_path(self.memmap.db_uri)
+        with self.memmap._writer("u", ["x"], ["block"], ["load"]) as append:
+            self.assertEqual(reader.get_rows("u", ["key"], {}), [])
+            append("load", np.array([0, 1]), np.array([0, 0]), np.array([[1.0], [2.0]]))
+            self.assertEqual(reader.get_rows("u", ["key", "x"], {"part": ["block"]}), [(0, 1.0), (1, 2.0)])
+        self.assertEqual(reader.aggregate("u", "x", ["sum"]), [(3.0,)])
+        with self.assertRaises(ValueError):
+            self.memmap.create_table_for_output_class(field, [(0, "other", "block", 0, 0, 0, 0, 0, 0)])
+
+
+class TestFieldResultsCache(unittest.TestCase):
+    def test_lru_eviction(self):
+        cache = FieldResultsCache(max_bytes=100)
+        cache.put("a", 1, 40)
+        cache.put("b", 2, 40)
+        self.assertEqual(cache.get("a"), 1)
+        cache.put("c", 3, 40)
+        self.assertNotIn("b", cache)
+        self.assertEqual((cache.size, cache.evictions), (80, 1))
+        cache.put("d", 4, 200)
+        self.assertNotIn("d", cache)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_invalidation(self):
+        path = os.path.join(tempfile.mkdtemp(), "results.db")
+        cache = FieldResultsCache()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return len(calls)
+
+        self.assertEqual(cache.get_or_compute(path, "k", compute, lambda v: 8), 1)
+        with open(path, "w") as f:
+            f.write("results")
+        self.assertEqual(cache.get_or_compute(path, "k", compute, lambda v: 8), 2)
+        self.assertEqual(cache.get_or_compute(path, "k", compute, lambda v: 8), 2)
+        self.assertEqual(cache.info()["hits"], 1)
+
+    def test_pickle(self):
+        cache = FieldResultsCache(max_bytes=10)
+        cache.put("a", 1, 1)
+        copy = pickle.loads(pickle.dumps(cache))
+        self.assertEqual((copy.max_bytes, len(copy)), (10, 0))
+
+
+class TestFieldsCache(FieldsTestCase):
+    def test_queries_are_shared(self):
+        cache = self.problem.results_cache
+        field = self.step.displacement_field
+        field.compute_resultant()
+        misses = cache.misses
+        self.step.displacement_field.compute_resultant()
+        self.assertEqual(cache.misses, misses)
+        self.assertGreater(cache.hits, 0)
+        _, _, values = field.to_numpy()
+        self.assertFalse(values.flags.writeable)
+
+        results = field.results
+        results.pop()
+        self.assertEqual(len(field.results), 5)
+
+    def test_database_changes(self):
+        field = self.step.displacement_field
+        self.assertEqual(list(field.component_scalar("x"))[0], 0.0)
+        connection = sqlite3.connect(self.problem.path_db)
+        connection.execute("UPDATE u SET x = 10.0 WHERE key = ?", (self.nodes[0].key,))
+        connection.execute("INSERT INTO u (key, step, part, x) VALUES (?, 'load', 'block', 1.0)", (self.nodes[0].key,))
+        connection.commit()
+        connection.close()
+        self.assertEqual(list(field.component_scalar("x"))[0], 10.0)
+
+    def test_disabled(self):
+        self.problem.results_cache = None
+        self.assertEqual(len(self.step.displacement_field.results), 5)
+        self.problem.results_cache = 1024
+        self.assertEqual(self.problem.results_cache.max_bytes, 1024)
+
+
+if __name__ == "__main__":
+    unittest.main()
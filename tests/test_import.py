@@ -0,0 +1,34 @@
+import subprocess
+import sys
+import unittest
+
+HEAVY_MODULES = ["matplotlib", "networkx", "h5py", "pint", "compas_viewer", "pyvis"]
+
+# Budget for the time spent in the compas_fea2 modules themselves (dependencies excluded).
+IMPORT_TIME_BUDGET = 0.5
+
+
+def _run(*args):
+    return subprocess.run([sys.executable, *args], capture_output=True, text=True, check=True)
+
+
+class TestImport(unittest.TestCase):
+    def test_heavy_dependencies_are_lazy(self):
+        code = "import sys, compas_fea2.model, compas_fea2.problem, compas_fea2.results, compas_fea2.job; print(','.join(m for m in {!r} if m in sys.modules))"
+        loaded = _run("-c", code.format(HEAVY_MODULES)).stdout.strip()
+        self.assertEqual(loaded, "")
+
+    def test_import_time(self):
+        report = _run("-X", "importtime", "-c", "import compas_fea2.model").stderr
+        self_time = 0
+        for line in report.splitlines():
+            if not line.startswith("import time:") or "|" not in line:
+                continue
+            fields = line[len("import time:") :].split("|")
+            if fields[2].strip().startswith("compas_fea2") and fields[0].strip().isdigit():
+                self_time += int(fields[0]) * 1e-6
+        self.assertLess(self_time, IMPORT_TIME_BUDGET)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import gzip
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from compas_fea2.model import Model, Node
+from compas_fea2.model.parts import Part
+from compas_fea2.problem import Problem
+from compas_fea2.job import InputFile, format_table
+
+
+class BlocksInputFile(InputFile):
+    def iter_jobdata(self):
+        for i in range(3):
+            yield "block {}\n".format(i)
+
+
+class StringInputFile(InputFile):
+    def jobdata(self):
+        return "whole deck\n"
+
+
+class CachedInputFile(InputFile):
+    calls = 0
+
+    def iter_jobdata(self):
+        for part in sorted(self.model.parts, key=lambda p: p._key):
+            yield self.cached_block(lambda: self.format_part(part), "part", part)
+
+    def format_part(self, part):
+        CachedInputFile.calls += 1
+        return format_table(np.array([n.xyz for n in part.nodes_sorted]), "%.1f")
+
+
+def nodes_formatter(arrays):
+    return "{}\n{}".format(arrays["name"], format_table(arrays["nodes"], ["%d", "%.1f", "%.1f", "%.1f"]))
+
+
+class TestInputFile(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.model = Model()
+        self.problem = self.model.add_problem(Problem())
+
+    def test_stream_blocks(self):
+        input_file = BlocksInputFile(self.problem)
+        input_file._extension = "inp"
+        calls = []
+        path = input_file.write_to_file(self.folder, progress=lambda *args: calls.append(args))
+        with open(path) as f:
+            self.assertEqual(f.read(), "block 0\nblock 1\nblock 2\n")
+        self.assertEqual(calls, [(1, 8), (2, 16), (3, 24)])
+        self.assertEqual(input_file.jobdata(), "block 0\nblock 1\nblock 2\n")
+
+    def test_string_jobdata_compressed(self):
+        input_file = StringInputFile(self.problem)
+        input_file._extension = "inp"
+        path = input_file.write_to_file(self.folder, compress=True)
+        self.assertTrue(path.endswith(".inp.gz"))
+        with gzip.open(path, "rt") as f:
+            self.assertEqual(f.read(), "whole deck\n")
+        self.assertTrue(os.path.exists(path))
+
+    def test_format_table(self):
+        self.assertEqual(format_table(np.array([[1, 2.5], [3, 4.0]]), ["%d", "%.2f"]), "1, 2.50\n3, 4.00\n")
+        self.assertEqual(format_table(np.arange(3), "%d", chunk_size=2), "0\n1\n2\n")
+        self.assertEqual(format_table(np.empty((0, 2)), "%d"), "")
+
+    def test_format_parts(self):
+        model = self.model
+        for i in range(3):
+            part = Part(name="P{}".format(i))
+            part.add_node(Node([i, 0, 0]))
+            model.add_part(part)
+        input_file = InputFile(self.problem)
+        input_file.processes = 2
+        blocks = input_file.format_parts(nodes_formatter)
+        self.assertEqual(blocks, ["P{}\n0, {}.0, 0.0, 0.0\n".format(i, i) for i in range(3)])
+
+    def test_block_cache(self):
+        part = Part()
+        node = part.add_node(Node([1, 2, 3]))
+        self.model.add_part(part)
+        other = self.model.add_problem(Problem())
+        self.problem.block_cache = True
+        other.block_cache = True
+        CachedInputFile.calls = 0
+
+        for problem in (self.problem, other, self.problem):
+            input_file = CachedInputFile(problem)
+            input_file._extension = "inp"
+            folder = os.path.join(self.folder, problem.name)
+            os.makedirs(folder, exist_ok=True)
+            input_file.write_to_file(folder)
+        self.assertEqual(CachedInputFile.calls, 1)
+
+        node.xyz = [4, 5, 6]
+        input_file = CachedInputFile(self.problem)
+        input_file._extension = "inp"
+        with open(input_file.write_to_file(os.path.join(self.folder, self.problem.name))) as f:
+            self.assertEqual(f.read(), "4.0, 5.0, 6.0\n")
+        self.assertEqual(CachedInputFile.calls, 2)
+
+    def test_not_implemented(self):
+        with self.assertRaises(NotImplementedError):
+            InputFile(self.problem).jobdata()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import asyncio
+import os
+import subprocess
+import sys
+import unittest
+
+from compas_fea2.utilities._launcher import ProcessResources
+from compas_fea2.utilities._launcher import launch_process_async
+from compas_fea2.utilities._launcher import process_resources
+from compas_fea2.utilities._launcher import run_process
+from compas_fea2.utilities._utils import launch_process
+
+
+class TestLauncher(unittest.TestCase):
+    def test_parsers_and_exit_code(self):
+        lines = []
+        code = "import sys; print('out'); print('err', file=sys.stderr); sys.exit(3)"
+        result = run_process([sys.executable, "-c", code], parsers=[lambda line, stream: lines.append((line, stream))])
+        self.assertEqual(result.returncode, 3)
+        self.assertFalse(result.ok)
+        self.assertEqual(sorted(lines), [("err", "stderr"), ("out", "stdout")])
+        with self.assertRaises(subprocess.CalledProcessError):
+            result.check()
+
+    def test_timeouts(self):
+        code = "import time; print('start', flush=True); time.sleep(10)"
+        result = run_process([sys.executable, "-c", code], timeout=1)
+        self.assertEqual(result.timeout, "wall")
+        self.assertLess(result.duration, 5)
+        result = run_process([sys.executable, "-c", code], idle_timeout=0.5, timeout=5)
+        self.assertEqual(result.timeout, "idle")
+        self.assertEqual(list(result.tail), ["start"])
+        with self.assertRaises(subprocess.TimeoutExpired):
+            result.check()
+
+    def test_cancel(self):
+        async def main():
+            task = asyncio.ensure_future(launch_process_async([sys.executable, "-c", "import time; time.sleep(10)"]))
+            await asyncio.sleep(0.5)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(main())
+
+    @unittest.skipUnless(hasattr(os, "sched_setaffinity"), "CPU affinity is only supported on Linux")
+    def test_pinning_before_exec(self):
+        before = os.sched_getaffinity(0)
+        cpu = sorted(before)[-1]
+        lines = []
+        # the shell starts the solver: both must be pinned when they start
+        command = '"{}" -c "import os; print(sorted(os.sched_getaffinity(0)))"'.format(sys.executable)
+        with process_resources(ProcessResources(cpus=[cpu])):
+            run_process(command, parsers=[lambda line, stream: lines.append(line)]).check()
+            lines.extend(launch_process(command, cwd=None))
+        self.assertEqual(lines, [str([cpu])] * 2)
+        # only the started processes are pinned, not the launching thread
+        self.assertEqual(os.sched_getaffinity(0), before)
+
+
+if __name__ == "__main__":
+    unittest.main()
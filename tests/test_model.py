@@ -1,7 +1,13 @@
 import unittest
 from compas_fea2.model.model import Model
 from compas_fea2.model.parts import Part
+from unittest import mock
+
+from compas_fea2.model import ElasticIsotropic
+from compas_fea2.model import Node
 from compas_fea2.problem import Problem
+from compas_fea2.problem import StaticStep
+from compas_fea2.utilities._fingerprint import Fingerprinter
 
 
 class TestModel(unittest.TestCase):
@@ -24,6 +30,50 @@ class TestModel(unittest.TestCase):
         model.add_problem(problem)
         self.assertIn(problem, model.problems)
 
+    def test_fingerprint(self):
+        def build():
+            model = Model()
+            part = Part()
+            part.add_nodes([Node([0, 0, 0]), Node([1, 0, 0])])
+            model.add_part(part)
+            return model, part
+
+        model_a, _ = build()
+        model_b, part_b = build()
+        self.assertEqual(model_a.fingerprint(), model_b.fingerprint())
+        part_b.nodes_sorted[1].x = 2.0
+        self.assertNotEqual(model_a.fingerprint(), model_b.fingerprint())
+
+    def test_fingerprint_memo(self):
+        model = Model()
+        part = Part()
+        part.add_nodes([Node([0, 0, 0]), Node([1, 0, 0])])
+        model.add_part(part)
+        first = model.fingerprint()
+        with mock.patch.object(Fingerprinter, "_update_array", autospec=True, side_effect=Fingerprinter._update_array) as update:
+            self.assertEqual(model.fingerprint(), first)
+            self.assertEqual(update.call_count, 0)
+            part.nodes_sorted[0].z = 1.0
+            self.assertNotEqual(model.fingerprint(), first)
+            self.assertGreater(update.call_count, 0)
+        part.add_node(Node([2, 0, 0]))
+        self.assertNotEqual(model.fingerprint(), first)
+
+    def test_fingerprint_names(self):
+        model = Model()
+        part = Part()
+        material = ElasticIsotropic(E=210e9, v=0.3, density=7850)
+        part.add_material(material)
+        model.add_part(part)
+        first = model.fingerprint()
+        material.name = "steel"
+        self.assertNotEqual(model.fingerprint(), first)
+
+        step = StaticStep()
+        first = step.fingerprint()
+        step.name = "gravity"
+        self.assertNotEqual(step.fingerprint(), first)
+
 
 if __name__ == "__main__":
     unittest.main()
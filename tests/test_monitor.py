@@ -0,0 +1,103 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+from compas_fea2.model import Model
+from compas_fea2.problem import Problem
+from compas_fea2.job import LogParser
+from compas_fea2.job import SolverMonitor
+from compas_fea2.job import solver_monitor
+from compas_fea2.utilities._launcher import run_process
+from compas_fea2.utilities._utils import launch_process
+
+SOLVER = "\n".join(
+    [
+        "INCREMENT 1",
+        "iteration 1 residual = 1.0e-1",
+        "iteration 2 residual = 1.0e-4",
+        "INCREMENT 2",
+        "iteration 1 residual = 1.0e-5",
+        "memory 120.5 MB",
+        "wall time 0.3",
+    ]
+)
+
+PARSER = (
+    LogParser()
+    .add_pattern("increment", r"^INCREMENT (\d+)", convert=int)
+    .add_pattern("iteration", r"^iteration (?P<value>\d+)", convert=int)
+    .add_pattern("residual", r"residual = (\S+)")
+    .add_pattern("memory", r"^memory (?P<value>\S+) (?P<unit>\w+)")
+    .add_pattern("wall_time", r"^wall time (\S+)")
+)
+
+
+def command():
+    return '"{}" -c "print(open(r\'{}\').read())"'.format(sys.executable, SOLVER_FILE)
+
+
+class MonitoredProblem(Problem):
+    log_parser = PARSER
+
+    def analyse(self, path=None, erase_data=False, *args, **kwargs):
+        self._check_analysis_path(path, erase_data)
+        for _ in launch_process(command(), cwd=self.path):
+            pass
+
+
+SOLVER_FILE = os.path.join(tempfile.mkdtemp(), "solver.log")
+with open(SOLVER_FILE, "w") as f:
+    f.write(SOLVER)
+
+
+class TestLogParser(unittest.TestCase):
+    def test_parse(self):
+        (event,) = PARSER.parse("memory 120.5 MB")
+        self.assertEqual((event.kind, event.value, event.data), ("memory", 120.5, {"unit": "MB"}))
+        self.assertEqual([e.kind for e in PARSER.parse("iteration 2 residual = 1.0e-4")], ["iteration", "residual"])
+        self.assertEqual(PARSER.parse("nothing here"), [])
+
+    def test_handler(self):
+        parser = LogParser().add_handler(lambda line, stream: None if stream == "stdout" else [])
+        self.assertEqual(parser.parse("line", "stderr"), [])
+
+
+class TestSolverMonitor(unittest.TestCase):
+    def test_summary(self):
+        monitor = SolverMonitor(PARSER)
+        for line in SOLVER.splitlines():
+            monitor(line)
+        monitor.close()
+        summary = monitor.summary()
+        self.assertEqual(summary["increments"], 2)
+        self.assertEqual(summary["iterations"], 3)
+        self.assertEqual(summary["max_iterations"], 2)
+        self.assertEqual(summary["residual"], 1.0e-5)
+        self.assertEqual(summary["memory"], 120.5)
+        self.assertEqual(summary["wall_time"], 0.3)
+        self.assertEqual(monitor.status(), "increment 2, iteration 1, residual 1e-05")
+
+    def test_async_launcher(self):
+        events = []
+        with solver_monitor(SolverMonitor(PARSER, callbacks=[events.append])):
+            run_process(command()).check()
+        self.assertEqual(len([e for e in events if e.kind == "increment"]), 2)
+
+    def test_problem(self):
+        folder = tempfile.mkdtemp()
+        model = Model(name="monitored")
+        problem = model.add_problem(MonitoredProblem(name="static"))
+        events = []
+        with solver_monitor(SolverMonitor(callbacks=[events.append])):
+            problem.analyse(folder, erase_data=True)
+        self.assertEqual(problem.solver_summary["increments"], 2)
+        self.assertEqual(len(events), 10)
+        with open(os.path.join(problem.path, "static-events.jsonl")) as f:
+            lines = [json.loads(line) for line in f]
+        self.assertEqual([line["kind"] for line in lines][:2], ["increment", "iteration"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,4 @@
+import pickle
 import unittest
 from compas_fea2.model.parts import Part, RigidPart
 from compas_fea2.model import Node, BeamElement
@@ -23,6 +24,16 @@ class TestPart(unittest.TestCase):
         part.add_element(element)
         self.assertIn(element, part.elements)
 
+    def test_graph_is_lazy(self):
+        part = Part()
+        nodes = part.add_nodes([Node([0, 0, 0]), Node([1, 0, 0]), Node([2, 0, 0])])
+        section = RectangularSection(w=1, h=1, material=Steel.S355())
+        part.add_element(BeamElement(nodes=nodes[:2], section=section, frame=[0, 0, 1]))
+        self.assertIsNone(part._graph)
+        self.assertEqual(part.graph.number_of_edges(), 2)
+        part.add_element(BeamElement(nodes=nodes[1:], section=section, frame=[0, 0, 1]))
+        self.assertEqual((part.graph.number_of_nodes(), part.graph.number_of_edges()), (5, 4))
+
     def test_add_material(self):
         part = Part()
         material = Steel.S355()
@@ -36,6 +47,20 @@ class TestPart(unittest.TestCase):
         part.add_section(section)
         self.assertIn(section, part.sections)
 
+    def test_node_registration_is_weak(self):
+        part = Part()
+        node = part.add_node(Node([0, 0, 0]))
+        self.assertIs(node.part, part)
+        del part
+        self.assertIsNone(node.part)
+
+    def test_pickle_registration(self):
+        part = Part()
+        part.add_node(Node([0, 0, 0]))
+        copied = pickle.loads(pickle.dumps(part))
+        node = list(copied.nodes)[0]
+        self.assertIs(node.part, copied)
+
 
 class TestRigidPart(unittest.TestCase):
     def test_reference_point(self):
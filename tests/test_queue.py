@@ -0,0 +1,83 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+
+from click.testing import CliRunner
+
+from compas_fea2.model import Model
+from compas_fea2.problem import Problem
+from compas_fea2.job import JobQueue
+from compas_fea2.cli import main
+from compas_fea2.utilities._fingerprint import Fingerprinter
+
+
+class QueuedProblem(Problem):
+    def analyse_and_extract(self, path=None, erase_data=False, *args, **kwargs):
+        self._check_analysis_path(path, erase_data)
+        if self.name == "broken":
+            raise ValueError("solver error")
+        sqlite3.connect(self.path_db).close()
+
+
+class TestJobQueue(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.model = Model(name="queued")
+        for name in ("A", "B"):
+            self.model.add_problem(QueuedProblem(name=name))
+        self.queue = JobQueue(self.folder)
+        self.queue.add_model(self.model)
+
+    def test_resume(self):
+        # simulate a crash while A was running
+        a, b = self.queue.jobs()
+        dead_worker = "{}:999999999".format(self.queue.worker.rpartition(":")[0])
+        connection = sqlite3.connect(self.queue.db_path)
+        with connection:
+            connection.execute("UPDATE jobs SET state = 'running', worker = ? WHERE id = ?", (dead_worker, a["id"]))
+        connection.close()
+
+        result = CliRunner().invoke(main, ["run-queue", self.folder, "--workers", "2"])
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertEqual(self.queue.summary(), {"done": 2})
+        self.assertTrue(os.path.exists(os.path.join(self.folder, "queued", "A", "A-results.db")))
+
+        # done jobs are skipped
+        self.assertEqual(self.queue.add_model(self.model), [])
+        self.assertEqual(len(self.queue.run().jobs), 0)
+
+    def test_failure(self):
+        self.model.add_problem(QueuedProblem(name="broken"))
+        self.queue.add_model(self.model)
+        self.queue.run(workers=1)
+        self.assertEqual(self.queue.summary(), {"done": 2, "failed": 1})
+        self.assertIn("solver error", self.queue.jobs("failed")[0]["error"])
+
+    def test_fingerprints(self):
+        queue = JobQueue(tempfile.mkdtemp())
+        with mock.patch.object(Fingerprinter, "new", autospec=True, side_effect=Fingerprinter.new) as new:
+            queue.add_model(self.model)
+        # the model is hashed once for both problems
+        self.assertEqual([c.args[1] for c in new.call_args_list].count("Model"), 1)
+        self.assertEqual({job["problem"]: job["fingerprint"] for job in queue.jobs()}, {p.name: p.fingerprint() for p in self.model.problems})
+
+    def test_without_returning(self):
+        queue = JobQueue(tempfile.mkdtemp())
+        with mock.patch.object(sqlite3, "sqlite_version_info", (3, 31, 1)):
+            ids = queue.add_model(self.model)
+            self.assertEqual(ids, [job["id"] for job in queue.jobs()])
+            self.assertEqual(queue.add_model(self.model), [])
+            self.model.add_problem(QueuedProblem(name="C"))
+            self.assertEqual(queue.add_model(self.model), [queue.jobs()[-1]["id"]])
+
+    def test_claimed_by_another_worker(self):
+        with mock.patch.object(JobQueue, "claim", return_value=False):
+            scheduler = self.queue.run(workers=1)
+        self.assertEqual(scheduler.summary(), {"skipped": 2})
+        self.assertEqual(self.queue.summary(), {"pending": 2})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import os
+import pickle
+import sqlite3
+import tempfile
+import threading
+import unittest
+
+from click.testing import CliRunner
+
+from compas_fea2.cli import main
+from compas_fea2.model import Model
+from compas_fea2.problem import Problem
+from compas_fea2.results.database import SQLiteResultsDatabase
+
+
+class Output:
+    sqltable_schema = {
+        "table_name": "rf",
+        "columns": [("id", "INTEGER PRIMARY KEY AUTOINCREMENT"), ("key", "INTEGER"), ("step", "TEXT"), ("part", "TEXT"), ("x", "REAL")],
+    }
+
+
+class TestSQLiteResultsDatabase(unittest.TestCase):
+    def setUp(self):
+        self.model = Model(name="results")
+        self.problem = self.model.add_problem(Problem(name="static"))
+        self.problem.path = tempfile.mkdtemp()
+        connection = sqlite3.connect(self.problem.path_db)
+        connection.execute("CREATE TABLE u (step TEXT, part TEXT, key INTEGER, x REAL)")
+        connection.executemany("INSERT INTO u VALUES (?, ?, ?, ?)", [("s", "p", i, float(i)) for i in range(10)])
+        connection.commit()
+        connection.close()
+
+    def test_persistent_connection(self):
+        rdb = self.problem.rdb
+        self.assertIs(self.problem.rdb, rdb)
+        self.assertEqual(rdb.table_names, ["u"])
+        self.assertEqual(rdb.column_names("u"), ["step", "part", "key", "x"])
+        connection = rdb.read_connection
+        self.assertEqual(rdb.get_rows("u", ["x"], {"key": [3]}), [(3.0,)])
+        self.assertIs(rdb.read_connection, connection)
+        with self.assertRaises(sqlite3.OperationalError):
+            rdb.execute_query("DELETE FROM u")
+
+    def test_threads_and_close(self):
+        rdb = self.problem.rdb
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(len(rdb.get_table("u")))) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, [10] * 4)
+        self.assertEqual(len(rdb._connections), 4)
+        with rdb:
+            rdb.get_table("u")
+        self.assertEqual(rdb._connections, [])
+        # reopened on the next query
+        self.assertEqual(len(rdb.get_table("u")), 10)
+
+    def test_write_and_pickle(self):
+        rdb = self.problem.rdb
+        self.assertEqual(len(rdb.get_table("u")), 10)
+        rdb.connection.execute("INSERT INTO u VALUES ('s', 'p', 10, 10.0)")
+        rdb.connection.commit()
+        self.assertEqual(len(rdb.get_table("u")), 11)
+        copy = pickle.loads(pickle.dumps(self.model))
+        self.assertEqual(len(copy.problems.pop().rdb.get_table("u")), 11)
+
+    def test_path_change(self):
+        rdb = self.problem.rdb
+        rdb.get_table("u")
+        self.problem.path = tempfile.mkdtemp()
+        self.assertFalse(os.path.exists(self.problem.path_db))
+        with self.assertRaises(sqlite3.OperationalError):
+            rdb.get_table("u")
+
+
+class TestBulkLoading(unittest.TestCase):
+    def setUp(self):
+        self.path = os.path.join(tempfile.mkdtemp(), "static-results.db")
+
+    def test_load_and_index(self):
+        database = SQLiteResultsDatabase.from_path(self.path)
+        rows = ((i % 100, "step-{}".format(i // 100), "part", float(i)) for i in range(1000))
+        database.create_table_for_output_class(Output, rows)
+        self.assertEqual(database.connection.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+        self.assertEqual(database.get_rows("rf", ["x"], {"step": ["step-3"], "part": ["part"], "key": [5]}), [(305.0,)])
+        (plan,) = database.member_query_plan("rf")
+        self.assertIn("USING INDEX rf_step_part_key", plan)
+        # a second load keeps the index
+        database.create_table_for_output_class(Output, [(0, "step-10", "part", 1.0)])
+        self.assertEqual(len(database.get_table("rf")), 1001)
+        self.assertIn("USING INDEX", database.member_query_plan("rf")[0])
+        database.close()
+
+    def test_optimize_db(self):
+        connection = sqlite3.connect(self.path)
+        connection.execute("CREATE TABLE rf (id INTEGER PRIMARY KEY, key INTEGER, step TEXT, part TEXT, x REAL)")
+        connection.execute("CREATE TABLE fields (name TEXT)")
+        connection.commit()
+        connection.close()
+        result = CliRunner().invoke(main, ["optimize-db", self.path, "--query", "SELECT x FROM rf WHERE step = 'a' AND part = 'b' AND key = 1"])
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertEqual(result.output.count("USING INDEX rf_step_part_key"), 2)
+        connection = sqlite3.connect(self.path)
+        self.assertEqual(connection.execute("SELECT COUNT(*) FROM sqlite_master WHERE name = 'sqlite_stat1'").fetchone()[0], 1)
+        connection.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
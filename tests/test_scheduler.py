@@ -0,0 +1,91 @@
+import sys
+import threading
+import time
+import unittest
+
+from compas_fea2.model import Model
+from compas_fea2.problem import Problem
+from compas_fea2.job import Scheduler
+from compas_fea2.model import Node
+from compas_fea2.model.parts import Part
+from compas_fea2.utilities._launcher import run_process
+
+
+class SleepingProblem(Problem):
+    running = 0
+    max_running = 0
+    lock = threading.Lock()
+
+    def analyse(self, path=None, erase_data=False, fail=(), *args, **kwargs):
+        with SleepingProblem.lock:
+            SleepingProblem.running += 1
+            SleepingProblem.max_running = max(SleepingProblem.max_running, SleepingProblem.running)
+        time.sleep(0.05)
+        with SleepingProblem.lock:
+            SleepingProblem.running -= 1
+        if self.name in fail:
+            raise ValueError("solver error")
+        return [self.name]
+
+
+class ThreadsProblem(Problem):
+    def analyse(self, path=None, erase_data=False, *args, **kwargs):
+        code = "import os; print(os.environ['OMP_NUM_THREADS'])"
+        return list(run_process([sys.executable, "-c", code]).tail)
+
+
+class TestScheduler(unittest.TestCase):
+    def setUp(self):
+        SleepingProblem.max_running = 0
+        self.model = Model()
+        self.problems = [self.model.add_problem(SleepingProblem(name="P{}".format(i))) for i in range(4)]
+
+    def test_concurrent(self):
+        results = self.model.analyse(workers=4)
+        self.assertEqual(sorted(results), ["P0", "P1", "P2", "P3"])
+        self.assertGreater(SleepingProblem.max_running, 1)
+
+    def test_failure_isolation(self):
+        with Scheduler(workers=2) as scheduler:
+            jobs = scheduler.run(self.problems, "analyse", fail=("P1",))
+        self.assertEqual([job.status for job in jobs], ["done", "failed", "done", "done"])
+        self.assertIsInstance(jobs[1].error, ValueError)
+        self.assertIn("1 failed", scheduler.report())
+        with self.assertRaises(RuntimeError):
+            self.model.analyse(workers=2, fail=("P1",))
+
+    def test_cancel(self):
+        scheduler = Scheduler(workers=1)
+        jobs = [scheduler.submit(problem, "analyse") for problem in self.problems]
+        scheduler.cancel()
+        scheduler.wait()
+        scheduler.shutdown()
+        self.assertEqual(jobs[-1].status, "cancelled")
+        self.assertEqual(scheduler.summary().get("done", 0) + scheduler.summary()["cancelled"], 4)
+
+    def test_thread_budget(self):
+        problem = self.model.add_problem(ThreadsProblem())
+        with Scheduler(cores=6, threads=3) as scheduler:
+            self.assertEqual(scheduler.workers, 2)
+            (job,) = scheduler.run([problem], "analyse")
+        self.assertEqual(job.result, ["3"])
+        self.assertEqual(job.resources.threads, 3)
+        with self.assertRaises(ValueError):
+            Scheduler(cores=1, workers=2, threads=1, pin=True)
+
+    def test_admission_order(self):
+        part = Part()
+        part.add_nodes([Node([i, 0, 0]) for i in range(3)])
+        model = Model()
+        model.add_part(part)
+        small = self.model.add_problem(SleepingProblem(name="small"))
+        large = model.add_problem(SleepingProblem(name="large"))
+        self.assertEqual(Scheduler.estimate_dofs(large), 18)
+        with Scheduler(workers=1) as scheduler:
+            jobs = scheduler.run([small, large], "analyse")
+        self.assertEqual([job.problem.name for job in jobs], ["small", "large"])
+        self.assertLess(jobs[1].start, jobs[0].start)
+
+
+if __name__ == "__main__":
+    unittest.main()
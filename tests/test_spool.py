@@ -0,0 +1,106 @@
+import os
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+from compas_fea2.model import Model
+from compas_fea2.problem import Problem
+from compas_fea2.job import SpoolDirectory
+
+HERE = os.path.dirname(__file__)
+
+
+class SpoolProblem(Problem):
+    def analyse_and_extract(self, path=None, erase_data=False, *args, **kwargs):
+        self._check_analysis_path(path, erase_data)
+        if self.name == "broken":
+            raise ValueError("solver error")
+        connection = sqlite3.connect(self.path_db)
+        connection.execute("CREATE TABLE info (worker INTEGER)")
+        connection.execute("INSERT INTO info VALUES (?)", (os.getpid(),))
+        connection.commit()
+        connection.close()
+
+
+class RequeuedProblem(Problem):
+    runs = 0
+
+    def analyse_and_extract(self, path=None, erase_data=False, *args, **kwargs):
+        RequeuedProblem.runs += 1
+        if RequeuedProblem.runs == 1:
+            # another worker requeues the job while it is running
+            job_path = os.path.dirname(path)
+            job_id = os.path.basename(job_path).partition(".")[0]
+            os.rename(job_path, os.path.join(os.path.dirname(os.path.dirname(job_path)), "pending", job_id))
+
+
+class TestSpool(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.spool = os.path.join(self.folder, "spool")
+        self.model = Model(name="spooled")
+        self.problems = [self.model.add_problem(SpoolProblem(name="P{}".format(i))) for i in range(4)]
+
+    def start_workers(self, n):
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join([HERE, os.environ.get("PYTHONPATH", "")]))
+        code = "from compas_fea2.cli import main; main()"
+        return [subprocess.Popen([sys.executable, "-c", code, "worker", "--spool", self.spool, "--poll", "0.1", "--stale", "30"], env=env) for _ in range(n)]
+
+    def test_workers(self):
+        workers = self.start_workers(2)
+        try:
+            self.model.analyse_and_extract(os.path.join(self.folder, "results"), True, executor="spool", spool=self.spool, poll=0.1, timeout=60)
+        finally:
+            for worker in workers:
+                worker.kill()
+                worker.wait()
+        for problem in self.problems:
+            (pid,) = sqlite3.connect(problem.path_db).execute("SELECT worker FROM info").fetchone()
+            self.assertIn(pid, [worker.pid for worker in workers])
+        self.assertEqual(len(SpoolDirectory(self.spool).jobs("done")), 4)
+
+    def test_failure_and_stale(self):
+        self.model.add_problem(SpoolProblem(name="broken"))
+        spool = SpoolDirectory(self.spool)
+        thread = threading.Thread(target=spool.work, kwargs={"poll": 0.05, "max_jobs": 5})
+        thread.start()
+        with self.assertRaises(RuntimeError) as context:
+            spool.run(self.model.problems, path=os.path.join(self.folder, "results"), erase_data=True, poll=0.05, timeout=60)
+        thread.join()
+        self.assertIn("solver error", str(context.exception))
+        self.assertEqual(len(spool.jobs("done")), 4)
+
+        (job_id,) = spool.submit(self.problems[:1])
+        claim = spool.claim()
+        self.assertTrue(claim.startswith(job_id + "."))
+        self.assertEqual(spool.state(job_id), "running")
+        # the heartbeat is only stale after being seen unchanged for the timeout
+        self.assertEqual(spool.requeue_stale(0.1), [])
+        time.sleep(0.2)
+        spool._write_heartbeat(claim)
+        self.assertEqual(spool.requeue_stale(0.1), [])
+        time.sleep(0.2)
+        self.assertEqual(spool.requeue_stale(0.1), [job_id])
+        self.assertEqual(spool.state(job_id), "pending")
+
+        # a new claim of the requeued job does not reuse the folder of the stale worker
+        self.assertNotEqual(spool.claim(), claim)
+        self.assertFalse(spool.job_path(claim, "running").exists())
+
+    def test_requeued_while_running(self):
+        spool = SpoolDirectory(self.spool)
+        model = Model(name="requeued")
+        (job_id,) = spool.submit([model.add_problem(RequeuedProblem(name="R"))])
+        self.assertEqual(spool.work(once=True, poll=0.05), 1)
+        self.assertEqual(RequeuedProblem.runs, 2)
+        self.assertEqual(spool.state(job_id), "done")
+        with self.assertRaises(ValueError):
+            spool.work(once=True, stale_timeout=1, heartbeat=1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+import csv
+import os
+import pickle
+import sqlite3
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from compas_fea2.model import BeamElement
+from compas_fea2.model import Model
+from compas_fea2.model import Node
+from compas_fea2.model import RectangularSection
+from compas_fea2.model import Steel
+from compas_fea2.model.parts import Part
+from compas_fea2.problem import Problem
+from compas_fea2.job import Sweep
+
+
+class SweepProblem(Problem):
+    def analyse_and_extract(self, path=None, erase_data=False, *args, **kwargs):
+        self._check_analysis_path(path, erase_data)
+        if self.model.load < 0:
+            raise ValueError("negative load")
+        connection = sqlite3.connect(self.path_db)
+        connection.execute("CREATE TABLE results (u REAL)")
+        connection.execute("INSERT INTO results VALUES (?)", (self.model.load / self.model.stiffness,))
+        connection.commit()
+        connection.close()
+
+
+def displacement(problem):
+    connection = sqlite3.connect(problem.path_db)
+    try:
+        return connection.execute("SELECT u FROM results").fetchone()[0]
+    finally:
+        connection.close()
+
+
+def apply(model, problem, load, stiffness):
+    model.load = load
+    model.stiffness = stiffness
+
+
+class TestSweep(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.model = Model(name="swept")
+        self.model.load = 1.0
+        self.model.stiffness = 1.0
+        self.problem = self.model.add_problem(SweepProblem(name="static"))
+
+    def test_run(self):
+        parameters = {"load": [1.0, 2.0, -1.0, 4.0], "stiffness": [1.0, 2.0, 1.0, 8.0]}
+        sweep = Sweep(self.problem, parameters, apply, {"u": displacement})
+        streamed = []
+        csv_path = os.path.join(self.folder, "sweep.csv")
+        rows = sweep.run(self.folder, workers=2, csv_path=csv_path, callback=streamed.append)
+
+        self.assertEqual([row["variant"] for row in rows], [0, 1, 2, 3])
+        self.assertEqual(len(streamed), 4)
+        self.assertIn("negative load", rows[2]["error"])
+        self.assertEqual(sweep.columns, ["load", "stiffness", "u"])
+        table = sweep.to_numpy()
+        np.testing.assert_allclose(table[:, 2], [1.0, 1.0, np.nan, 0.5])
+        # the base model is not modified
+        self.assertEqual(self.model.load, 1.0)
+
+        with open(csv_path, newline="") as f:
+            written = list(csv.DictReader(f))
+        self.assertEqual(sorted(int(row["variant"]) for row in written), [0, 1, 2, 3])
+        self.assertTrue(os.path.isdir(os.path.join(self.folder, ".fea2_blocks")))
+
+    def test_relative_changes(self):
+        def scale(model, problem, factor):
+            model.load *= factor
+
+        sweep = Sweep(self.problem, {"factor": [2.0, 3.0, 4.0]}, scale, {"u": displacement})
+        rows = sweep.run(self.folder, workers=1)
+        # each variant starts from the base model
+        self.assertEqual([row["u"] for row in rows], [2.0, 3.0, 4.0])
+
+    def test_copy_cost(self):
+        running = []
+        peak = []
+
+        def track(model, problem, factor):
+            running.append(factor)
+            peak.append(len(running))
+            time.sleep(0.05)
+            running.remove(factor)
+
+        sweep = Sweep(self.problem, {"factor": [1.0, 2.0, 3.0, 4.0]}, track, {"u": displacement})
+        size = len(pickle.dumps(self.model))
+        with mock.patch.object(pickle, "loads", side_effect=pickle.loads) as loads:
+            sweep.run(self.folder, workers=4, max_memory=Sweep.COPY_FACTOR * size * 1.5)
+        # one copy per variant, and only one variant at a time fits in memory
+        self.assertEqual(loads.call_count, 4)
+        self.assertEqual(sweep.copy_size, size)
+        self.assertEqual(max(peak), 1)
+
+    def test_copy_mesh(self):
+        part = Part()
+        nodes = part.add_nodes([Node([i, 0, 0]) for i in range(2001)])
+        section = RectangularSection(w=1, h=1, material=Steel.S355())
+        for i in range(2000):
+            part.add_element(BeamElement(nodes=nodes[i : i + 2], section=section, frame=[0, 0, 1]))
+        self.model.add_part(part)
+        copy, _ = Sweep(self.problem, [], apply, {})._copy(pickle.dumps(self.model))
+        node = list(copy.parts)[0].nodes_sorted[1]
+        self.assertEqual(len(node.connected_elements), 2)
+        self.assertIs(next(iter(node.connected_elements)).part, node.part)
+
+    def test_rows(self):
+        sweep = Sweep(self.problem, [{"load": 1.0, "stiffness": 2.0}], apply, {"u": displacement})
+        self.assertEqual(sweep.parameters, [{"load": 1.0, "stiffness": 2.0}])
+        with self.assertRaises(ValueError):
+            Sweep(self.problem, {"load": [1.0, 2.0], "stiffness": [1.0]}, apply, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
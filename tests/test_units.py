@@ -0,0 +1,42 @@
+import unittest
+
+import numpy as np
+
+import compas_fea2.model  # noqa: F401
+from compas_fea2.model.nodes import Node
+from compas_fea2.units import to_base_magnitude
+from compas_fea2.units import units
+from compas_fea2.utilities._utils import _has_quantities
+
+
+class TestUnits(unittest.TestCase):
+    def test_registry_is_shared(self):
+        self.assertIs(units("SI"), units("SI"))
+        self.assertIsNot(units("SI"), units("SI_mm"))
+        self.assertIsNot(units("SI", cache=False), units("SI"))
+
+    def test_to_base_magnitude(self):
+        u = units("SI")
+        self.assertEqual(to_base_magnitude(2 * u.mm), 0.002)
+        self.assertEqual(to_base_magnitude([1 * u.m, (2 * u.mm, 3)]), [1.0, (0.002, 3)])
+        array = to_base_magnitude(np.array([[1 * u.km, 2 * u.cm]], dtype=object))
+        self.assertEqual(array.dtype, float)
+        self.assertTrue(np.allclose(array, [[1000.0, 0.02]]))
+
+    def test_node_with_quantities(self):
+        u = units("SI")
+        node = Node([1 * u.mm, 2 * u.mm, 3 * u.mm])
+        self.assertTrue(np.allclose(node.xyz, [0.001, 0.002, 0.003]))
+        node = Node([0, 2 * u.mm, 3 * u.mm])
+        self.assertTrue(np.allclose(node.xyz, [0.0, 0.002, 0.003]))
+
+    def test_has_quantities(self):
+        u = units("SI")
+        self.assertTrue(_has_quantities([0, (1, 2 * u.mm)]))
+        self.assertTrue(_has_quantities(np.array([1, 2 * u.mm], dtype=object)))
+        self.assertFalse(_has_quantities([0, (1, 2.0)]))
+        self.assertFalse(_has_quantities(np.zeros(3)))
+
+
+if __name__ == "__main__":
+    unittest.main()